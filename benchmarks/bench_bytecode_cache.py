@@ -0,0 +1,74 @@
+"""
+View Bytecode Cache Benchmark — Cold vs. Warm Load
+==================================================
+Generates a 5,000-line view full of mock data and measures how long the live
+preview's loader takes to import it:
+
+    - cold: empty `.designgui/cache/bytecode` (parse + compile + exec)
+    - warm: a fresh loader after a simulated daemon restart (unmarshal + exec)
+
+Usage:
+    python benchmarks/bench_bytecode_cache.py [--lines 5000] [--repeat 5]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from designgui.loader import BytecodeCache, ViewModuleCache  # noqa: E402
+
+
+def _generate_view(lines: int) -> str:
+    rows = [
+        f"    {{'id': {i}, 'name': 'User {i}', 'email': 'user{i}@example.com', 'score': {i * 7 % 100}, 'active': {i % 2 == 0}}},"
+        for i in range(lines - 6)
+    ]
+    return "\n".join([
+        "MOCK_ROWS = [",
+        *rows,
+        "]",
+        "",
+        "def render_view():",
+        "    return len(MOCK_ROWS)",
+    ]) + "\n"
+
+
+def _load_once(view: Path, cache_dir: Path) -> float:
+    loader = ViewModuleCache(bytecode_cache=BytecodeCache(cache_dir))
+    start = time.perf_counter()
+    loaded = loader.acquire(view, owner="bench")
+    elapsed = time.perf_counter() - start
+    assert loaded.error is None, loaded.traceback
+    loader.release("bench")
+    loader.invalidate(view)
+    return elapsed * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cold, warm = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        view = Path(tmp) / "big_dashboard.py"
+        view.write_text(_generate_view(args.lines), encoding="utf-8")
+        for i in range(args.repeat):
+            cache_dir = Path(tmp) / f"cache-{i}"
+            cold.append(_load_once(view, cache_dir))
+            warm.append(_load_once(view, cache_dir))
+
+    print(f"View size: {args.lines} lines  repeats: {args.repeat}")
+    print(f"{'load':<6} {'median (ms)':>12} {'min (ms)':>10}")
+    print(f"{'cold':<6} {statistics.median(cold):>12.1f} {min(cold):>10.1f}")
+    print(f"{'warm':<6} {statistics.median(warm):>12.1f} {min(warm):>10.1f}")
+    print(f"speed-up: {statistics.median(cold) / statistics.median(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Hot Reload Benchmark — Push vs. Polling
+=======================================
+Compares the legacy per-client `ui.timer(0.5)` polling loop against the push-based
+`ReloadHub` for a large number of simultaneously connected preview clients.
+
+Measured for each strategy:
+    - idle CPU: process CPU seconds burnt while nothing is being saved
+    - save-to-render latency: time from writing a view file to the last client's
+      reload callback firing (real watchdog observer, real file writes)
+
+Usage:
+    python benchmarks/bench_hot_reload.py [--clients 150] [--idle 5] [--saves 10]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from designgui.watcher import ReloadHub, start_observer  # noqa: E402
+
+POLL_INTERVAL = 0.5  # seconds — the interval used by the legacy ui.timer
+DEBOUNCE_MS = 20  # keep the coalescing window small so latency reflects the push path itself
+
+
+class PollingBaseline:
+    """Reproduces the legacy design: watchdog stamps a shared value, every client polls it."""
+    def __init__(self):
+        self.last_modified = 0.0
+
+    def publish(self):
+        self.last_modified = time.time()
+
+
+async def _run_polling(clients: int, idle: float, saves: int, views_dir: Path):
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+
+    shared = PollingBaseline()
+
+    class Handler(FileSystemEventHandler):
+        def on_modified(self, event):
+            if not event.is_directory and event.src_path.endswith('.py'):
+                shared.publish()
+
+    observer = Observer()
+    observer.schedule(Handler(), str(views_dir), recursive=False)
+    observer.start()
+
+    seen = [0.0] * clients
+    render_times = [0.0] * clients
+
+    async def client_loop(i: int):
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            if shared.last_modified > seen[i]:
+                seen[i] = shared.last_modified
+                render_times[i] = time.perf_counter()
+
+    tasks = [asyncio.create_task(client_loop(i)) for i in range(clients)]
+    try:
+        return await _measure(idle, saves, views_dir, render_times)
+    finally:
+        for t in tasks:
+            t.cancel()
+        observer.stop()
+        observer.join()
+
+
+async def _run_push(clients: int, idle: float, saves: int, views_dir: Path):
+    hub = ReloadHub(debounce_ms=DEBOUNCE_MS)
+    hub.bind_loop(asyncio.get_running_loop())
+    render_times = [0.0] * clients
+
+    def make_callback(i: int):
+        def on_reload(changed):
+            render_times[i] = time.perf_counter()
+        return on_reload
+
+    for i in range(clients):
+        hub.subscribe(make_callback(i))
+
+    observer = start_observer(hub, str(views_dir))
+    try:
+        return await _measure(idle, saves, views_dir, render_times)
+    finally:
+        observer.stop()
+        observer.join()
+
+
+async def _measure(idle: float, saves: int, views_dir: Path, render_times: list):
+    # Idle CPU: nobody saves anything, only the strategy's own bookkeeping runs
+    cpu_start = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = time.process_time() - cpu_start
+
+    latencies = []
+    target = views_dir / "dashboard.py"
+    for i in range(saves):
+        for j in range(len(render_times)):
+            render_times[j] = 0.0
+        saved_at = time.perf_counter()
+        target.write_text(f"def render_view():\n    return {i}\n", encoding="utf-8")
+        deadline = saved_at + 5
+        while min(render_times) < saved_at and time.perf_counter() < deadline:
+            await asyncio.sleep(0.001)
+        latencies.append((max(render_times) - saved_at) * 1000)
+        await asyncio.sleep(0.2)
+    return idle_cpu, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=150)
+    parser.add_argument("--idle", type=float, default=5.0, help="Idle measurement window in seconds")
+    parser.add_argument("--saves", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Clients: {args.clients}  idle window: {args.idle}s  saves: {args.saves}")
+    print(f"{'strategy':<10} {'idle CPU (s)':>13} {'p50 latency (ms)':>17} {'max latency (ms)':>17}")
+    for name, runner in (("polling", _run_polling), ("push", _run_push)):
+        with tempfile.TemporaryDirectory() as tmp:
+            idle_cpu, latencies = asyncio.run(runner(args.clients, args.idle, args.saves, Path(tmp)))
+        print(f"{name:<10} {idle_cpu:>13.3f} {statistics.median(latencies):>17.1f} {max(latencies):>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
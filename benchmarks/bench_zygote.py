@@ -0,0 +1,142 @@
+"""
+Zygote Benchmark — Time to First HTTP 200
+=========================================
+Boots servers repeatedly and measures the wall time from the launch request to the
+first HTTP 200, for both kinds of server the test suite and agents start:
+
+    - preview: `designgui start` on a scaffolded project
+    - export:  the `production_app/main.py` generated by `designgui export`
+
+each launched two ways:
+
+    - cold:   a fresh `python` interpreter (imports NiceGUI, FastAPI, uvicorn, ...)
+    - zygote: forked from a pre-warmed zygote that already imported them
+
+Usage:
+    python benchmarks/bench_zygote.py [--repeat 5] [--port 8790]
+"""
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from designgui import zygote  # noqa: E402
+
+VIEW = """\
+from designgui.ui_lib.primitives import Stack, Text
+
+def render_view():
+    with Stack(base_classes=['p-8']):
+        Text('Benchmark', base_classes=['text-2xl'])
+"""
+
+
+def _scaffold(project_dir: Path):
+    views_dir = project_dir / ".designgui" / "product" / "views"
+    views_dir.mkdir(parents=True)
+    (views_dir.parent / "__init__.py").touch()
+    (views_dir / "__init__.py").touch()
+    (views_dir / "dashboard.py").write_text(VIEW, encoding="utf-8")
+    config = {"paths": {"views": ".designgui/product/views"}}
+    (project_dir / ".designgui" / "config.json").write_text(json.dumps(config), encoding="utf-8")
+
+
+def _first_200(port: int, timeout: float = 30.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (OSError, urllib.error.URLError):
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def _boot(cwd: Path, argv, script, port: int, log: Path, use_zygote: bool) -> float:
+    """Launch one server, return milliseconds until it answered 200, then stop it."""
+    started = time.perf_counter()
+    if use_zygote:
+        pid = zygote.spawn(cwd, log, argv, script)
+        assert pid is not None, "zygote did not answer"
+        process = None
+    else:
+        cmd = [sys.executable, str(script)] if script else [sys.executable, "-m", "designgui.cli", *argv]
+        with open(log, "ab") as out:
+            process = subprocess.Popen(cmd, cwd=str(cwd), stdout=out, stderr=subprocess.STDOUT)
+        pid = process.pid
+    ok = _first_200(port)
+    elapsed = (time.perf_counter() - started) * 1000
+    os.kill(pid, signal.SIGTERM)
+    if process is not None:
+        process.wait()
+    else:
+        while _alive(pid):
+            time.sleep(0.01)
+    assert ok, f"server did not answer on port {port}; see {log}"
+    return elapsed
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8790, help="First port; every boot uses the next one.")
+    args = parser.parse_args()
+    if not zygote.supported():
+        sys.exit("The zygote needs fork(); nothing to compare on this platform.")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        project = tmp / "project"
+        _scaffold(project)
+        socket = tmp / "zygote.sock"
+        os.environ[zygote.SOCKET_ENV] = str(socket)
+        zygote.start(socket)
+        try:
+            port = args.port
+            for kind in ("preview", "export"):
+                for mode in ("cold", "zygote"):
+                    results[(kind, mode)] = []
+                    for _ in range(args.repeat):
+                        if kind == "preview":
+                            cwd, argv, script = project, ["start", "--port", str(port)], None
+                        else:
+                            subprocess.run([sys.executable, "-m", "designgui.cli", "export", "--port", str(port)],
+                                           cwd=str(project), check=True, capture_output=True)
+                            cwd, argv, script = project / "production_app", [], project / "production_app" / "main.py"
+                        results[(kind, mode)].append(_boot(cwd, argv, script, port, tmp / "server.log", mode == "zygote"))
+                        port += 1
+        finally:
+            zygote.stop(socket)
+
+    print(f"Time to first HTTP 200, repeats: {args.repeat}")
+    print(f"{'server':<8} {'launch':<7} {'median (ms)':>12} {'min (ms)':>10}")
+    for (kind, mode), samples in results.items():
+        print(f"{kind:<8} {mode:<7} {statistics.median(samples):>12.1f} {min(samples):>10.1f}")
+    for kind in ("preview", "export"):
+        speedup = statistics.median(results[(kind, "cold")]) / statistics.median(results[(kind, "zygote")])
+        print(f"{kind} speed-up: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
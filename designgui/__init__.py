@@ -1,10 +1,16 @@
 """
 Nice Design OS
 """
-import importlib.metadata
 
-try:
-    __version__ = importlib.metadata.version("designgui")
-except Exception:
-    __version__ = "unknown"
 
+def __getattr__(name):
+    # Resolved on first use: reading installed metadata costs more than the rest of this package's import
+    if name == "__version__":
+        import importlib.metadata
+        try:
+            version = importlib.metadata.version("designgui")
+        except Exception:
+            version = "unknown"
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
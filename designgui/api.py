@@ -0,0 +1,97 @@
+"""
+Agent Render API
+"""
+import itertools
+import linecache
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .headless import render_headless
+from .loader import BytecodeCache, _find_render_function
+
+_submission_ids = itertools.count(1)
+
+
+def valid_view_name(name: str) -> bool:
+    """A submitted view name must be a bare `<identifier>.py`, exactly like the files `export` can route."""
+    path = Path(name)
+    return path.name == name and path.suffix == ".py" and path.stem.isidentifier()
+
+
+def failure_report(stage: str, error: str, trace: Optional[str] = None, total_ms: Optional[float] = None) -> dict:
+    """Report shape for a view that failed before `execute_submission` could produce one (e.g. killed by the sandbox)."""
+    return {"ok": False, "stage": stage, "error": error, "traceback": trace or None,
+            "timings_ms": {"exec": None, "render": None, "total": total_ms},
+            "element_count": None, "has_render_view": False, "live": None}
+
+
+def execute_submission(source: str, name: str = "submitted.py", import_roots: Sequence[str] = (),
+                       bytecode_cache: Optional[BytecodeCache] = None, with_html: bool = False,
+                       filename: Optional[str] = None) -> dict:
+    """
+    Execute view source in memory and render it headlessly, without touching the views directory.
+    Returns a JSON-ready report: ok, stage of failure, error, traceback, timings (ms) and element count.
+    Pass `filename` when the source is a file on disk so tracebacks point at it. MemoryError is
+    re-raised, since the process that hit it should not be trusted with the next view.
+    """
+    # Move the roots to the front: a long-lived worker may have served another project's `product` package
+    for root in reversed(import_roots):
+        if root in sys.path:
+            sys.path.remove(root)
+        sys.path.insert(0, root)
+    report = failure_report(None, None)
+    if with_html:
+        report["html"] = None
+
+    module_name = f"designgui_submitted_{Path(name).stem}_{next(_submission_ids)}"
+    encoded = source.encode("utf-8")
+    pseudo_file = filename is None
+    if pseudo_file:
+        # A pseudo filename keeps tracebacks readable (linecache serves the submitted lines)
+        filename = f"<submitted {name}>"
+        linecache.cache[filename] = (len(source), None, source.splitlines(keepends=True), filename)
+    started = time.perf_counter()
+    module = type(sys)(module_name)
+    module.__file__ = filename
+    sys.modules[module_name] = module
+    try:
+        try:
+            code = bytecode_cache.compile(encoded, filename) if bytecode_cache else compile(encoded, filename, "exec")
+            exec(code, module.__dict__)
+        except MemoryError:
+            raise
+        except Exception as e:
+            report.update(stage="exec", error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+            return report
+        finally:
+            report["timings_ms"]["exec"] = round((time.perf_counter() - started) * 1000, 3)
+
+        render = _find_render_function(module, module_name)
+        report["has_render_view"] = hasattr(module, "render_view")
+        if render is None:
+            report.update(stage="missing_render", error="No render function found. Please define 'render_view()'.")
+            return report
+
+        render_started = time.perf_counter()
+        try:
+            result = render_headless(render, with_html=with_html)
+        except MemoryError:
+            raise
+        except Exception as e:
+            report.update(stage="render", error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+            return report
+        finally:
+            report["timings_ms"]["render"] = round((time.perf_counter() - render_started) * 1000, 3)
+
+        report.update(ok=True, element_count=result.element_count, live=result.live)
+        if with_html:
+            report["html"] = result.html
+        return report
+    finally:
+        report["timings_ms"]["total"] = round((time.perf_counter() - started) * 1000, 3)
+        sys.modules.pop(module_name, None)
+        if pseudo_file:
+            linecache.cache.pop(filename, None)
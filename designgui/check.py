@@ -0,0 +1,57 @@
+"""
+Batch View Validation
+"""
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .api import failure_report
+from .sandbox import SandboxPool
+
+
+def discover_views(views_dir: Path, names: Optional[Iterable[str]] = None) -> List[Path]:
+    """Top-level view files to check: all of them, or the given names (with or without `.py`)."""
+    views_dir = Path(views_dir)
+    if names:
+        return [views_dir / (name if name.endswith(".py") else f"{name}.py") for name in names]
+    return sorted(p for p in views_dir.glob("*.py") if p.name != "__init__.py")
+
+
+async def check_views(paths: Iterable[Path], views_dir: Path, pool: SandboxPool) -> dict:
+    """
+    Import and headlessly render every view in parallel across the pool's workers.
+    Each view gets the same limits as the sandboxed preview, so one hanging view costs at
+    most the pool timeout and the batch finishes in about the time of its slowest view.
+    """
+    views_dir = Path(views_dir)
+    import_roots = (str(views_dir.parent.parent), str(views_dir))
+    started = time.perf_counter()
+
+    async def check_one(path: Path) -> dict:
+        try:
+            source = path.read_bytes()
+        except OSError as e:
+            report = failure_report("read", f"{type(e).__name__}: {e}")
+        else:
+            report = (await pool.run(path, source, import_roots, views_dir.parent)).report
+        return {"view": path.name, **report}
+
+    reports = await asyncio.gather(*(check_one(Path(p)) for p in paths))
+    return {
+        "ok": all(r["ok"] for r in reports),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "views": list(reports),
+    }
+
+
+def run_check(paths: List[Path], views_dir: Path, workers: Optional[int] = None, **limits) -> dict:
+    """Blocking entry point for the CLI: spin up a pool sized to the batch, check, and tear it down."""
+    workers = workers or min(len(paths), os.cpu_count() or 1) or 1
+    pool = SandboxPool(workers=workers, **limits)
+    try:
+        pool.start()
+        return asyncio.run(check_views(paths, views_dir, pool))
+    finally:
+        pool.close()
@@ -1,10 +1,12 @@
 import json
 import typer
 import sys
-import shutil
-import importlib.metadata
-import subprocess
+import time
 from pathlib import Path
+from typing import List
+
+# Heavier modules (importlib.metadata, shutil, subprocess, NiceGUI via designgui.server) are imported
+# inside the commands that need them, so `--version`, `--help` and `init` start fast
 
 # Provide a global app description for the Typer help menu
 app = typer.Typer(
@@ -18,6 +20,7 @@ app = typer.Typer(
 
 def version_callback(value: bool):
     if value:
+        import importlib.metadata
         try:
             version = importlib.metadata.version("designgui")
         except Exception:
@@ -93,7 +96,10 @@ def get_locale_strings():
         "cli_remove_success": "DesignGUI has been safely removed from this project.",
         "cli_security_engine_warning": "⚠️  WARNING: DESIGNGUI EXECUTES PYTHON PAYLOADS DYNAMICALLY ⚠️\nThe Live Preview engine will automatically execute code dropped into the `.designgui/product/views/` directory. Do not place untrusted third-party scripts here.\n",
         "cli_security_daemon_warning": "⚠️  WARNING: DESIGNGUI EXECUTES PYTHON PAYLOADS DYNAMICALLY ⚠️\nThe Daemon engine will automatically execute code dropped into the `.designgui/product/views/` directory. Do not place untrusted third-party scripts here.\n",
-        "cli_daemon_success": "Daemon launched successfully in the background."
+        "cli_daemon_success": "Daemon launched successfully in the background.",
+        "cli_daemon_reused": "Daemon already running (pid {pid}, port {port}, up {uptime}).",
+        "cli_daemon_stopped": "Daemon stopped (pid {pid}).",
+        "cli_daemon_not_running": "No daemon is running for this project."
     }
 
 def smart_gitignore_append(cwd: Path):
@@ -116,6 +122,7 @@ def get_config():
         except Exception:
             pass
     # Default fallbacks
+    import importlib.metadata
     try:
         fallback_version = importlib.metadata.version('designgui')
     except Exception:
@@ -132,6 +139,16 @@ def get_config():
         }
     }
 
+def get_sandbox_limits(config: dict) -> dict:
+    """SandboxPool keyword arguments from the `sandbox` section of config.json."""
+    sandbox = config.get("sandbox", {})
+    return {
+        "workers": sandbox.get("workers", 2),
+        "timeout": sandbox.get("timeout_s", 5.0),
+        "cpu_seconds": sandbox.get("cpu_s", 5),
+        "memory_mb": sandbox.get("memory_mb", 512),
+    }
+
 @app.command()
 def init() -> None:
     """Initialize a new Nice Design OS project with guided setup and inject AI Agent rules."""
@@ -168,6 +185,10 @@ Enter your choice:"""
     config = {
         "environment": environment,
         "daemon_port": daemon_port,
+        "reload_debounce_ms": 150,
+        "render_mode": "reconcile",
+        "execution_mode": "inline",
+        "sandbox": {"workers": 2, "timeout_s": 5.0, "cpu_s": 5, "memory_mb": 512},
         "locale": "en-US",
         "font_family": "Inter, sans-serif",
         "paths": {
@@ -207,7 +228,7 @@ To build the interface:
 When building state logic:
 - **Phase 1 (Vision)**: Outline concept in `.designgui/product/specs/vision.md` and Pydantic schema in `.designgui/product/models.py`.
 - **Phase 2 (Shell)**: Build global layout wrapper in `.designgui/product/shell.py`.
-- **Phase 3 (Section)**: Generate mock data and a UI view in `.designgui/product/views/{name}.py` using the primitive components.
+- **Phase 3 (Section)**: Generate mock data and a UI view in `.designgui/product/views/{name}.py` using the primitive components. Put expensive data generation or fixture loading in a function decorated with `@memoize` (`from designgui.memo import memoize`) so it survives hot reloads.
 - **Phase 4 (Screen)**: Wire Python callbacks (`on_click=...`) and inject state.
 """
     (designgui_dir / "INSTRUCTIONS.md").write_text(universal_instruction_text)
@@ -270,7 +291,21 @@ def render_view():
 
 @app.command()
 def export(host: str = typer.Option("0.0.0.0", help="Host address for production app"), 
-           port: int = typer.Option(8080, help="Port for production app")) -> None:
+           port: int = typer.Option(8080, help="Port for production app"),
+           clean: bool = typer.Option(False, "--clean", help="Rebuild production_app/ from scratch instead of updating it"),
+           lazy: bool = typer.Option(False, "--lazy", help="Import each view on its first request instead of at startup"),
+           prewarm: bool = typer.Option(False, "--prewarm", help="With --lazy, import the remaining views in the background after startup"),
+           static: bool = typer.Option(False, "--static", help="Serve views without callbacks as pre-rendered HTML (data frozen at export time)"),
+           artifact: bool = typer.Option(False, "--artifact", help="Also bundle the app into a single production_app.pyz with precompiled bytecode"),
+           optimize: int = typer.Option(2, "--optimize", min=0, max=2, help="Bytecode optimization level of the --artifact (2 strips asserts and docstrings)"),
+           compression: str = typer.Option(None, help="Response compression: brotli, gzip or none (default: NiceGUI's gzip)"),
+           cache_max_age: int = typer.Option(None, help="Cache lifetime in seconds for NiceGUI's versioned static assets"),
+           reconnect_timeout: float = typer.Option(None, help="Seconds a page waits for its browser to reconnect"),
+           message_history: int = typer.Option(None, help="Messages kept per client for replay after a reconnect"),
+           ping_interval: float = typer.Option(None, help="Websocket heartbeat interval in seconds"),
+           ping_timeout: float = typer.Option(None, help="Seconds without a heartbeat reply before a websocket is dropped"),
+           workers: int = typer.Option(None, min=1, help="Serve from this many processes behind a sticky-session proxy"),
+           as_json: bool = typer.Option(False, "--json", help="Print only the changeset as JSON, for delta deploys")) -> None:
     """Export the prototype to a production-ready standalone application optimized for edge deployment (e.g. Raspberry Pi)."""
     cwd = Path.cwd()
     config = get_config()
@@ -284,54 +319,79 @@ def export(host: str = typer.Option("0.0.0.0", help="Host address for production
     
     if not product_dir.exists():
         err_msg = strings["cli_export_error"].format(dir=product_dir.name)
-        typer.echo(typer.style(err_msg, fg=typer.colors.RED))
+        typer.echo(typer.style(err_msg, fg=typer.colors.RED), err=as_json)
         raise typer.Exit(1)
         
-    typer.echo(strings["cli_export_start"])
-    
-    if prod_app_dir.exists():
-        shutil.rmtree(prod_app_dir)
-    shutil.copytree(product_dir, prod_app_dir / "product")
-    
-    # Dynamically build router for all views
-    imports = []
-    routes = []
+    from nicegui import __version__ as nicegui_version
+    from designgui.export import ARTIFACT_NAME, COMPRESSION_ENCODINGS, build_artifact, export_app, unsupported_tuning
+    tuning = get_export_settings(config, compression=compression, cache_max_age=cache_max_age,
+                                 reconnect_timeout=reconnect_timeout, message_history=message_history,
+                                 ping_interval=ping_interval, ping_timeout=ping_timeout, workers=workers)
+    if tuning["compression"] is not None and tuning["compression"] not in COMPRESSION_ENCODINGS:
+        message = strings["cli_export_compression_unknown"].format(compression=tuning["compression"],
+                                                                   choices=", ".join(COMPRESSION_ENCODINGS))
+        typer.echo(typer.style(message, fg=typer.colors.RED), err=True)
+        raise typer.Exit(1)
+    unsupported = unsupported_tuning(tuning)
+    for key, needed in unsupported.items():
+        message = strings["cli_export_tuning_unsupported"].format(option=key, version=needed, installed=nicegui_version)
+        typer.echo(typer.style(message, fg=typer.colors.RED), err=True)
+    if unsupported:
+        raise typer.Exit(1)
     
-    py_files = []
-    for f in views_dir.glob("*.py"):
-        if f.name == "__init__.py":
-            continue
-        if not f.stem.isidentifier():
-            typer.echo(typer.style(f"Warning: Skipping {f.name} because it is not a valid Python identifier.", fg=typer.colors.YELLOW))
-            continue
-        py_files.append(f.stem)
-        
-    for view_name in py_files:
-        imports.append(f"from product.views.{view_name} import render_view as render_{view_name}")
-        route_path = '/' if view_name == 'dashboard' or len(py_files) == 1 and view_name == py_files[0] else f'/{view_name}'
-        routes.append(f"""
-@ui.page('{route_path}')
-def route_{view_name}():
-    render_{view_name}()
-""")
-        
-    imports_block = "\n".join(imports)
-    routes_block = "".join(routes)
-
-    main_py_content = f"""from nicegui import ui
+    if not as_json:
+        typer.echo(strings["cli_export_start"])
+    
+    from designgui.loader import BytecodeCache
+    # Warnings go to stderr in --json mode so stdout stays parseable
+    warn = lambda message: typer.echo(typer.style(message, fg=typer.colors.YELLOW), err=as_json)
+    if prewarm and not lazy:
+        warn(strings["cli_export_prewarm_ignored"])
+    if tuning["compression"] == "brotli":
+        import importlib.util
+        if importlib.util.find_spec("brotli") is None:
+            warn(strings["cli_export_brotli_missing"])
+    changes = export_app(views_dir, prod_app_dir, host, port, clean=clean, lazy=lazy, prewarm=prewarm and lazy,
+                         static=static, tuning=tuning, warn=warn,
+                         bytecode_cache=BytecodeCache(cwd / ".designgui" / "cache" / "bytecode"))
+    if artifact:
+        changes["artifact"] = build_artifact(prod_app_dir, cwd / ARTIFACT_NAME, optimize=optimize)
+    
+    if as_json:
+        typer.echo(json.dumps(changes, indent=2))
+        return
+    typer.echo(typer.style(strings["cli_export_success"], fg=typer.colors.GREEN))
+    typer.echo(strings["cli_export_changes"].format(added=len(changes["added"]), modified=len(changes["modified"]),
+                                                    removed=len(changes["removed"]), unchanged=changes["unchanged"]))
+    if static:
+        typer.echo(strings["cli_export_static"].format(pages=", ".join(changes["static"]) or "none"))
+        for name, reasons in changes["live"].items():
+            more = strings["cli_export_live_more"].format(count=len(reasons) - 3) if len(reasons) > 3 else ""
+            typer.echo(strings["cli_export_live"].format(view=name, reasons="; ".join(reasons[:3]), more=more))
+    if artifact:
+        built = changes["artifact"]
+        typer.echo(strings["cli_export_artifact"].format(modules=len(built["modules"]), artifact=ARTIFACT_NAME,
+                                                         kb=built["bytes"] // 1024))
+    typer.echo(strings["cli_export_run_hint"].format(host=host, port=port))
 
-# Dynamically imported views
-{imports_block}
-{routes_block}
+def get_export_settings(config: dict, **overrides) -> dict:
+    """Production tuning of the exported app: the `export` section of config.json, overridden by CLI flags that were given."""
+    from designgui.export import TUNING
+    section = config.get("export", {})
+    settings = {key: section.get(key) for key in TUNING}
+    settings.update((key, value) for key, value in overrides.items() if value is not None)
+    return settings
 
-if __name__ in {{"__main__", "__mp_main__"}}:
-    # Reload and show are FALSE for production edge/headless optimization
-    ui.run(title='Production App', host='{host}', port={port}, reload=False, show=False)
-"""
-    (prod_app_dir / "main.py").write_text(main_py_content)
-    
-    typer.echo(typer.style(strings["cli_export_success"], fg=typer.colors.GREEN))
-    typer.echo(f"Run `cd production_app` and `python main.py` to start the headless server on {host}:{port}.")
+def get_memory_settings(config: dict) -> dict:
+    """MemoryGuard keyword arguments from the `memory` section of config.json."""
+    memory = config.get("memory", {})
+    return {
+        "tracing": memory.get("diagnostics", False),
+        "interval": memory.get("interval_s", 60.0),
+        "ceiling_mb": memory.get("ceiling_mb"),
+        "frames": memory.get("frames", 1),
+        "top": memory.get("top", 10),
+    }
 
 @app.command()
 def start(port: int = typer.Option(None, hidden=True)) -> None:
@@ -351,41 +411,202 @@ def start(port: int = typer.Option(None, hidden=True)) -> None:
     if str(Path.cwd()) not in sys.path:
         sys.path.insert(0, str(Path.cwd()))
         
+    from designgui.projects import valid_project_name
+    invalid = [name for name in config.get("projects") or {} if not valid_project_name(name)]
+    if invalid:
+        typer.echo(typer.style(strings["cli_start_invalid_projects"].format(names=", ".join(map(repr, invalid))),
+                               fg=typer.colors.RED), err=True)
+        raise typer.Exit(1)
+    
     from designgui.server import run_server
-    run_server(port=port, views_path=views_path)
+    run_server(port=port, views_path=views_path, debounce_ms=config.get("reload_debounce_ms", 150),
+               render_mode=config.get("render_mode", "reconcile"),
+               execution_mode=config.get("execution_mode", "inline"), sandbox_limits=get_sandbox_limits(config),
+               mounts=config.get("projects"), memory_settings=get_memory_settings(config))
+
+@app.command()
+def check(views: List[str] = typer.Argument(None, help="View files to check (default: every view)."),
+          workers: int = typer.Option(None, help="Worker processes (default: one per view, up to the CPU count).")) -> None:
+    """Import and headlessly render views in parallel, printing a per-view JSON report (exit code 1 if any fail)."""
+    config = get_config()
+    views_dir = Path.cwd() / Path(config.get("paths", {}).get("views", ".designgui/product/views"))
+    if not views_dir.exists():
+        typer.echo(typer.style(get_locale_strings()["cli_export_error"].format(dir=views_dir.name), fg=typer.colors.RED), err=True)
+        raise typer.Exit(1)
+    
+    from designgui.check import discover_views, run_check
+    paths = discover_views(views_dir, views)
+    if not paths:
+        typer.echo(json.dumps({"ok": True, "elapsed_ms": 0, "views": []}, indent=2))
+        return
+    limits = get_sandbox_limits(config)
+    limits.pop("workers")
+    report = run_check(paths, views_dir, workers=workers, **limits)
+    typer.echo(json.dumps(report, indent=2))
+    if not report["ok"]:
+        raise typer.Exit(1)
+
+@app.command()
+def snapshot(views: List[str] = typer.Argument(..., help="View files to render, e.g. dashboard.py."),
+             out: Path = typer.Option(None, "--out", "-o", help="Output file for one view, or directory for several (default: stdout / .designgui/snapshots)."),
+             page: bool = typer.Option(False, "--page", help="Wrap each snapshot in a standalone HTML document.")) -> None:
+    """Render views to static HTML in-process (no server boot), e.g. for snapshot tests in CI."""
+    config = get_config()
+    views_dir = Path.cwd() / Path(config.get("paths", {}).get("views", ".designgui/product/views"))
+    
+    from designgui.api import execute_submission
+    from designgui.check import discover_views
+    from designgui.headless import html_document
+    
+    paths = discover_views(views_dir, views)
+    if out is None and len(paths) > 1:
+        out = Path(".designgui") / "snapshots"
+    failed = False
+    for path in paths:
+        try:
+            source = path.read_text(encoding="utf-8")
+        except OSError as e:
+            typer.echo(typer.style(f"{path.name}: {e}", fg=typer.colors.RED), err=True)
+            failed = True
+            continue
+        report = execute_submission(source, path.name, (str(views_dir.parent.parent), str(views_dir)),
+                                    with_html=True, filename=str(path))
+        if not report["ok"]:
+            typer.echo(typer.style(f"{path.name}: {report['error']}", fg=typer.colors.RED), err=True)
+            if report["traceback"]:
+                typer.echo(report["traceback"], err=True)
+            failed = True
+            continue
+        markup = html_document(report["html"], title=path.stem) if page else report["html"] + "\n"
+        if out is None:
+            typer.echo(markup, nl=False)
+        else:
+            target = out / f"{path.stem}.html" if len(paths) > 1 or out.is_dir() else out
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(markup, encoding="utf-8")
+            typer.echo(f"{path.name} -> {target} ({report['element_count']} elements)", err=True)
+    if failed:
+        raise typer.Exit(1)
+
+DAEMON_START_TIMEOUT = 30.0
+
+daemon_app = typer.Typer(help="Run the Live Preview engine in the background: start, status, stop.")
+app.add_typer(daemon_app, name="daemon")
 
-@app.command("daemon")
-def daemon_command(port: int = typer.Option(None, help="Port to run the daemon on (overrides config.json)")) -> None:
+@daemon_app.callback(invoke_without_command=True)
+def daemon_command(ctx: typer.Context,
+                   port: int = typer.Option(None, help="Port to run the daemon on (overrides config.json)")) -> None:
     """Initialize the backend daemon enabling Autonomous Agents to execute previews structurally in the background."""
+    # Plain `designgui daemon` keeps meaning "start"
+    if ctx.invoked_subcommand is None:
+        daemon_start(port=port, timeout=DAEMON_START_TIMEOUT)
+
+@daemon_app.command("start")
+def daemon_start(port: int = typer.Option(None, help="Port to run the daemon on (overrides config.json)"),
+                 timeout: float = typer.Option(DAEMON_START_TIMEOUT, help="Seconds to wait for the readiness probe.")) -> None:
+    """Start the daemon and wait until it serves requests; reuse it if it is already running for this project."""
+    from designgui.daemon import DaemonError, log_path, start_daemon
     strings = get_locale_strings()
     
-    typer.echo(typer.style(strings["cli_security_daemon_warning"], fg=typer.colors.YELLOW))
-    
     config = get_config()
-    # strings = get_locale_strings() # Already called above
     target_port = port if port else config.get("daemon_port", 8080)
     views_path = config.get("paths", {}).get("views", ".designgui/product/views")
-    msg = strings["cli_daemon_init"].format(port=target_port)
-    typer.echo(msg)
-    typer.echo(f"Agents can write .py files to {views_path}/ to dynamically generate interactive dashboards.")
     
-    if str(Path.cwd()) not in sys.path:
-        sys.path.insert(0, str(Path.cwd()))
-        
-    cmd = [sys.executable, "-m", "designgui.cli", "start", "--port", str(target_port)]
+    started = time.monotonic()
+    try:
+        health, reused = start_daemon(Path.cwd(), target_port, timeout=timeout)
+    except DaemonError as e:
+        typer.echo(typer.style(str(e), fg=typer.colors.RED), err=True)
+        raise typer.Exit(1)
     
-    if sys.platform == "win32":
-        # Windows detached process
-        subprocess.Popen(cmd, creationflags=subprocess.DETACHED_PROCESS)
+    if reused:
+        typer.echo(strings["cli_daemon_reused"].format(
+            pid=health["pid"], port=health["port"], uptime=_format_duration(health["uptime_s"])))
+        return
+    typer.echo(typer.style(strings["cli_security_daemon_warning"], fg=typer.colors.YELLOW))
+    typer.echo(strings["cli_daemon_init"].format(port=target_port))
+    typer.echo(strings["cli_daemon_views_hint"].format(views=views_path))
+    typer.echo(strings["cli_daemon_render_hint"].format(port=target_port))
+    typer.echo(typer.style(strings["cli_daemon_success"], fg=typer.colors.GREEN) + " "
+               + strings["cli_daemon_ready"].format(pid=health["pid"], seconds=time.monotonic() - started, log=log_path(Path.cwd())))
+
+@daemon_app.command("status")
+def daemon_status_command(as_json: bool = typer.Option(False, "--json", help="Print the status as JSON.")) -> None:
+    """Report whether the daemon runs, with its uptime and resource usage. Exits 1 if it is not running."""
+    from designgui.daemon import daemon_status
+    strings = get_locale_strings()
+    status = daemon_status(Path.cwd())
+    if as_json:
+        typer.echo(json.dumps({"running": status is not None, **(status or {})}, indent=2))
+    elif status is None:
+        typer.echo(strings["cli_daemon_not_running"])
+    elif not status["ready"]:
+        typer.echo(strings["cli_daemon_unresponsive"].format(pid=status["pid"], port=status["port"]))
     else:
-        # Unix/Linux background daemon
-        subprocess.Popen(cmd, start_new_session=True)
-        
-    typer.echo(typer.style(strings.get("cli_daemon_success", "Daemon launched successfully in the background."), fg=typer.colors.GREEN))
+        rss = f"{status['rss_mb']} MB" if status["rss_mb"] is not None else "n/a"
+        typer.echo(strings["cli_daemon_status"].format(rss=rss, uptime=_format_duration(status["uptime_s"]), **status))
+    if status is None:
+        raise typer.Exit(1)
+
+@daemon_app.command("stop")
+def daemon_stop() -> None:
+    """Stop this project's daemon."""
+    from designgui.daemon import stop_daemon
+    strings = get_locale_strings()
+    pid = stop_daemon(Path.cwd())
+    if pid is None:
+        typer.echo(strings["cli_daemon_not_running"])
+    else:
+        typer.echo(strings["cli_daemon_stopped"].format(pid=pid))
+
+zygote_app = typer.Typer(help="Keep a pre-warmed interpreter that forks daemons and exported-app servers on demand.")
+app.add_typer(zygote_app, name="zygote")
+
+@zygote_app.command("start")
+def zygote_start() -> None:
+    """Start the zygote (NiceGUI and the UI library already imported); later `daemon start` calls fork from it."""
+    from designgui import zygote
+    strings = get_locale_strings()
+    if not zygote.supported():
+        typer.echo(typer.style(strings["cli_zygote_unsupported"], fg=typer.colors.YELLOW))
+        raise typer.Exit(1)
+    try:
+        info, reused = zygote.start()
+    except RuntimeError as e:
+        typer.echo(typer.style(str(e), fg=typer.colors.RED), err=True)
+        raise typer.Exit(1)
+    message = strings["cli_zygote_reused" if reused else "cli_zygote_started"]
+    typer.echo(message.format(pid=info["pid"], socket=zygote.socket_path()))
+
+@zygote_app.command("status")
+def zygote_status() -> None:
+    """Report whether the zygote runs. Exits 1 if it is not running."""
+    from designgui import zygote
+    strings = get_locale_strings()
+    info = zygote.ping()
+    if info is None:
+        typer.echo(strings["cli_zygote_not_running"])
+        raise typer.Exit(1)
+    typer.echo(strings["cli_zygote_status"].format(pid=info["pid"], uptime=_format_duration(info["uptime_s"]),
+                                                   spawned=info["spawned"], socket=zygote.socket_path()))
+
+@zygote_app.command("stop")
+def zygote_stop() -> None:
+    """Stop the zygote; servers it already forked keep running."""
+    from designgui import zygote
+    strings = get_locale_strings()
+    pid = zygote.stop()
+    typer.echo(strings["cli_zygote_not_running"] if pid is None else strings["cli_zygote_stopped"].format(pid=pid))
+
+def _format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m {secs}s" if hours else f"{minutes}m {secs}s" if minutes else f"{seconds:.1f}s"
 
 @app.command("remove")
 def remove() -> None:
     """Safely removes DesignGUI from the project."""
+    import shutil
     cwd = Path.cwd()
     strings = get_locale_strings()
     typer.echo(strings["cli_remove_start"])
@@ -396,6 +617,9 @@ def remove() -> None:
         
     designgui_dir = cwd / ".designgui"
     if designgui_dir.exists():
+        # A running daemon would keep serving (and writing into) the deleted project
+        from designgui.daemon import stop_daemon
+        stop_daemon(cwd)
         shutil.rmtree(designgui_dir, ignore_errors=True)
         
     legacy_instructions = cwd / "DESIGNGUI_INSTRUCTIONS.md"
@@ -405,6 +629,8 @@ def remove() -> None:
     production_app_dir = cwd / "production_app"
     if production_app_dir.exists():
         shutil.rmtree(production_app_dir, ignore_errors=True)
+    from designgui.export import ARTIFACT_NAME
+    (cwd / ARTIFACT_NAME).unlink(missing_ok=True)
     
     typer.echo(typer.style(strings["cli_remove_success"], fg=typer.colors.GREEN))
 
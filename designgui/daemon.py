@@ -0,0 +1,253 @@
+"""
+Daemon Lifecycle
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+HEALTH_ROUTE = "/api/health"
+STATE_FILE = "daemon.json"
+LOG_FILE = "daemon.log"
+
+DEFAULT_START_TIMEOUT = 30.0
+DEFAULT_STOP_TIMEOUT = 10.0
+_POLL_INTERVAL = 0.1
+
+
+class DaemonError(Exception):
+    """The daemon could not be started, reached or stopped; the message is meant for the CLI user."""
+
+
+def state_path(project_dir: Path) -> Path:
+    return Path(project_dir) / ".designgui" / STATE_FILE
+
+
+def log_path(project_dir: Path) -> Path:
+    return Path(project_dir) / ".designgui" / LOG_FILE
+
+
+def read_state(project_dir: Path) -> Optional[dict]:
+    """The PID/port record of this project's daemon, or None. A half-written record reads as `{}`."""
+    try:
+        text = state_path(project_dir).read_text(encoding="utf-8")
+    except OSError:
+        return None
+    try:
+        state = json.loads(text)
+    except ValueError:
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _remove_state(project_dir: Path, pid: Optional[int] = None):
+    """Delete the record, but only if it still belongs to `pid` (another start may have replaced it)."""
+    if pid is not None and (read_state(project_dir) or {}).get("pid") != pid:
+        return
+    try:
+        state_path(project_dir).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def pid_alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        import ctypes
+        # os.kill(pid, 0) would terminate the process on Windows; ask for its exit code instead
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        # Reap it if it is our own exited child, which would otherwise linger as a zombie
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except ChildProcessError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_designgui_process(pid: int) -> bool:
+    """Guard against a recycled PID: True unless the OS shows the process is something else."""
+    try:
+        cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return True
+    return b"designgui" in cmdline
+
+
+def probe(port: int, timeout: float = 1.0) -> Optional[dict]:
+    """Readiness probe: the daemon's health report, or None if nothing healthy answers on `port`."""
+    import urllib.error
+    import urllib.request
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{HEALTH_ROUTE}", timeout=timeout) as response:
+            health = json.loads(response.read())
+    except (OSError, ValueError, urllib.error.URLError):
+        return None
+    return health if isinstance(health, dict) and health.get("ok") else None
+
+
+def process_usage() -> dict:
+    """CPU time, thread count and memory of the calling process, without third-party dependencies."""
+    times = os.times()
+    usage = {"cpu_seconds": round(times.user + times.system, 3), "threads": threading.active_count(),
+             "rss_mb": None, "peak_rss_mb": None}
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["peak_rss_mb"] = round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        pass
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        usage["rss_mb"] = round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return usage
+
+
+def health_report(started_at: float, port: int, **extra) -> dict:
+    """Answer of the running server to HEALTH_ROUTE; `project` lets a CLI tell its own daemon from another's."""
+    return {"ok": True, "pid": os.getpid(), "port": port, "project": str(Path.cwd().resolve()),
+            "started_at": started_at, "uptime_s": round(time.time() - started_at, 3), **process_usage(), **extra}
+
+
+def _wait_ready(port: int, pid: int, deadline: float, process: Optional[subprocess.Popen] = None) -> Optional[dict]:
+    while True:
+        health = probe(port)
+        if health is not None and health.get("pid") == pid:
+            return health
+        exited = process.poll() is not None if process is not None else not pid_alive(pid)
+        if exited or time.monotonic() >= deadline:
+            return None
+        time.sleep(_POLL_INTERVAL)
+
+
+def _log_tail(project_dir: Path, lines: int = 15) -> str:
+    try:
+        return "\n".join(log_path(project_dir).read_text(encoding="utf-8", errors="replace").splitlines()[-lines:])
+    except OSError:
+        return ""
+
+
+def start_daemon(project_dir: Path, port: int, timeout: float = DEFAULT_START_TIMEOUT) -> Tuple[dict, bool]:
+    """
+    Make sure a healthy daemon serves `project_dir` and return (health report, reused).
+    An existing daemon (or one another `daemon start` is still booting) is reused instead of
+    spawning a rival; a new one is only reported once its readiness probe succeeds.
+    """
+    project_dir = Path(project_dir).resolve()
+    deadline = time.monotonic() + timeout
+    while True:
+        state = read_state(project_dir)
+        if state == {}:
+            # Another start created the record and is about to write its PID
+            if time.monotonic() >= deadline:
+                raise DaemonError(f"{state_path(project_dir)} is unreadable; remove it and retry.")
+            time.sleep(_POLL_INTERVAL)
+            continue
+        if state is not None:
+            pid = state.get("pid")
+            if isinstance(pid, int) and pid_alive(pid) and _is_designgui_process(pid):
+                health = _wait_ready(state.get("port", port), pid, deadline)
+                if health is not None:
+                    return health, True
+                raise DaemonError(f"Daemon (pid {pid}) is running but not answering on port {state.get('port')}. "
+                                  f"Run `designgui daemon stop` and check {log_path(project_dir)}.")
+            _remove_state(project_dir, pid)  # stale: the process is gone
+
+        # A foreground `designgui start` for this project counts as running; anything else is a conflict
+        health = probe(port)
+        if health is not None:
+            if health.get("project") == str(project_dir):
+                return health, True
+            raise DaemonError(f"Port {port} is already used by the daemon of {health.get('project')}.")
+
+        # Claim the record atomically so a concurrent start waits for this daemon instead of spawning its own
+        state_path(project_dir).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(state_path(project_dir), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            continue
+        break
+
+    with os.fdopen(fd, "w", encoding="utf-8") as record:
+        # A running zygote forks the server with NiceGUI already imported; otherwise start a fresh interpreter
+        from . import zygote
+        process = None
+        pid = zygote.spawn(project_dir, log_path(project_dir), ["start", "--port", str(port)])
+        if pid is None:
+            with open(log_path(project_dir), "ab") as log:
+                cmd = [sys.executable, "-m", "designgui.cli", "start", "--port", str(port)]
+                detach = ({"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+                          if sys.platform == "win32" else {"start_new_session": True})
+                process = subprocess.Popen(cmd, cwd=str(project_dir), stdin=subprocess.DEVNULL, stdout=log,
+                                           stderr=subprocess.STDOUT, **detach)
+            pid = process.pid
+        json.dump({"pid": pid, "port": port, "project": str(project_dir), "started_at": time.time(),
+                   "log": str(log_path(project_dir)), "zygote": process is None}, record, indent=2)
+
+    health = _wait_ready(port, pid, deadline, process)
+    if health is None:
+        exited = process.poll() is not None if process is not None else not pid_alive(pid)
+        reason = "exited during startup" if exited else f"was not ready within {timeout:g}s"
+        if not exited:
+            if process is not None:
+                process.kill()
+                process.wait()
+            else:
+                os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        _remove_state(project_dir, pid)
+        raise DaemonError(f"Daemon {reason} on port {port}. Last log lines:\n{_log_tail(project_dir)}")
+    return health, False
+
+
+def daemon_status(project_dir: Path) -> Optional[dict]:
+    """State record merged with the live health report, or None if no daemon runs (stale records are removed)."""
+    project_dir = Path(project_dir).resolve()
+    state = read_state(project_dir)
+    if not state:
+        return None
+    pid = state.get("pid")
+    if not (isinstance(pid, int) and pid_alive(pid) and _is_designgui_process(pid)):
+        _remove_state(project_dir, pid)
+        return None
+    health = probe(state.get("port", 0))
+    if health is None or health.get("pid") != pid:
+        return {**state, "ready": False}
+    return {**state, **health, "ready": True}
+
+
+def stop_daemon(project_dir: Path, timeout: float = DEFAULT_STOP_TIMEOUT) -> Optional[int]:
+    """Terminate this project's daemon (escalating to a kill after `timeout`); returns its PID, or None."""
+    project_dir = Path(project_dir).resolve()
+    state = read_state(project_dir)
+    if not state:
+        return None
+    pid = state.get("pid")
+    if not (isinstance(pid, int) and pid_alive(pid) and _is_designgui_process(pid)):
+        _remove_state(project_dir, pid)
+        return None
+    os.kill(pid, signal.SIGTERM)  # TerminateProcess on Windows
+    deadline = time.monotonic() + timeout
+    while pid_alive(pid) and time.monotonic() < deadline:
+        time.sleep(_POLL_INTERVAL)
+    if pid_alive(pid):
+        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+    _remove_state(project_dir, pid)
+    return pid
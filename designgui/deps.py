@@ -0,0 +1,140 @@
+"""
+View Dependency Graph
+"""
+import ast
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class DependencyGraph:
+    """
+    Import graph of every Python file in the product tree, built by AST-scanning sources.
+    Lets the live preview re-execute only the views that transitively import a changed
+    file (e.g. `shell.py` or `models.py`) instead of every open view on every save.
+
+    Import resolution mirrors the preview's sys.path: sibling views are importable by bare
+    name (`import widgets`) and the rest of the product tree as `product.*`.
+    """
+    def __init__(self, views_dir: Path, product_dir: Path):
+        self.views_dir = Path(views_dir)
+        self.product_dir = Path(product_dir)
+        self._imports: Dict[Path, Set[Path]] = {}
+        self._reverse: Optional[Dict[Path, Set[Path]]] = None
+
+    @property
+    def search_roots(self) -> List[Path]:
+        return [self.views_dir, self.product_dir.parent]
+
+    def scan(self):
+        """Rebuild the whole graph from disk."""
+        self._imports = {}
+        self._reverse = None
+        if self.product_dir.exists():
+            for path in self.product_dir.rglob("*.py"):
+                self.update(path)
+
+    def refresh(self, changed: Iterable[Path]):
+        """Apply a batch of saved files to the graph.
+        Created or deleted files can turn previously unresolvable imports elsewhere into edges
+        (or the reverse), so they trigger a full rescan; plain edits only rescan themselves."""
+        changed = [Path(p) for p in changed]
+        if any((p in self._imports) != p.exists() for p in changed):
+            self.scan()
+        else:
+            for path in changed:
+                self.update(path)
+
+    def update(self, path: Path):
+        """Rescan a single file's imports, or drop it from the graph if it was deleted."""
+        path = Path(path)
+        self._reverse = None
+        if not path.exists():
+            self._imports.pop(path, None)
+            return
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            # Keep the previous edges; the view will surface the error itself when executed
+            self._imports.setdefault(path, set())
+            return
+        deps = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    deps.update(self._resolve(alias.name, path, 0))
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ""
+                for alias in node.names:
+                    # `from a import b` may import submodule a.b or attribute b of a
+                    deps.update(self._resolve(f"{module}.{alias.name}" if module else alias.name, path, node.level))
+                if module:
+                    deps.update(self._resolve(module, path, node.level))
+        deps.discard(path)
+        self._imports[path] = deps
+
+    def _resolve(self, dotted: str, importer: Path, level: int) -> Set[Path]:
+        parts = [p for p in dotted.split(".") if p]
+        if level:
+            base = importer.parent
+            for _ in range(level - 1):
+                base = base.parent
+            roots = [base]
+        else:
+            roots = self.search_roots
+        found = set()
+        for root in roots:
+            candidate = root.joinpath(*parts) if parts else root
+            for target in (candidate.with_suffix(".py"), candidate / "__init__.py"):
+                if target.is_file() and self._in_product(target):
+                    found.add(target)
+                    break
+            if found:
+                break
+        return found
+
+    def _in_product(self, path: Path) -> bool:
+        try:
+            path.relative_to(self.product_dir)
+            return True
+        except ValueError:
+            return False
+
+    def dependents(self, changed: Iterable[Path]) -> Set[Path]:
+        """Return the changed files plus every file that transitively imports one of them."""
+        if self._reverse is None:
+            self._reverse = {}
+            for src, deps in self._imports.items():
+                for dep in deps:
+                    self._reverse.setdefault(dep, set()).add(src)
+        reverse = self._reverse
+        result = set()
+        stack = [Path(p) for p in changed]
+        while stack:
+            path = stack.pop()
+            if path in result:
+                continue
+            result.add(path)
+            stack.extend(reverse.get(path, ()))
+        return result
+
+    def affected_views(self, changed: Iterable[Path]) -> Set[str]:
+        """Filenames of top-level views that must re-execute after `changed` files were saved."""
+        return {p.name for p in self.dependents(changed) if p.parent == self.views_dir and p.name != "__init__.py"}
+
+    def module_names(self, path: Path) -> Set[str]:
+        """Every name under which `path` may sit in `sys.modules` given the preview's search roots."""
+        names = set()
+        for root in self.search_roots:
+            try:
+                rel = Path(path).relative_to(root)
+            except ValueError:
+                continue
+            parts = list(rel.with_suffix("").parts)
+            if parts and parts[-1] == "__init__":
+                parts.pop()
+            if parts:
+                names.add(".".join(parts))
+        return names
+
+    def imports_of(self, path: Path) -> Optional[Set[Path]]:
+        return self._imports.get(Path(path))
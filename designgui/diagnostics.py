@@ -0,0 +1,93 @@
+"""
+Memory Diagnostics & Ceiling
+"""
+import collections
+import time
+import tracemalloc
+from typing import List, Optional
+
+from .daemon import process_usage
+
+DEFAULT_INTERVAL_S = 60.0
+DEFAULT_TOP = 10
+DEFAULT_FRAMES = 1
+HISTORY = 120
+
+# Allocations made by the import machinery and by tracemalloc itself are noise, not leaks
+_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen *>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryGuard:
+    """
+    Periodic memory check of the preview process.
+    Every sample records the process RSS; in diagnostics mode it also takes a tracemalloc
+    snapshot, and `top_growth()` compares the latest one against the first so the
+    allocation sites that grew most since startup (typically old view versions kept alive
+    by callbacks) are listed with file and line. Crossing `ceiling_mb` trips the guard once;
+    the server then recycles itself instead of growing until the OS kills it.
+    """
+    def __init__(self, interval: float = DEFAULT_INTERVAL_S, ceiling_mb: Optional[float] = None,
+                 tracing: bool = False, frames: int = DEFAULT_FRAMES, top: int = DEFAULT_TOP):
+        self.interval = interval
+        self.ceiling_mb = ceiling_mb
+        self.tracing = tracing
+        self.frames = frames
+        self.top = top
+        self.tripped = False
+        self.history = collections.deque(maxlen=HISTORY)
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._latest: Optional[tracemalloc.Snapshot] = None
+
+    def start(self):
+        """Begin tracing (diagnostics mode only) and take the baseline snapshot."""
+        rss = process_usage()["rss_mb"]
+        if self.ceiling_mb and rss is not None and rss >= self.ceiling_mb:
+            # Recycling could never get below it, so every restart would trip again
+            print(f"Memory ceiling of {self.ceiling_mb:g} MB is below the startup RSS ({rss} MB); not enforced.", flush=True)
+            self.ceiling_mb = None
+        if self.tracing:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+            self._baseline = self._latest = tracemalloc.take_snapshot().filter_traces(_NOISE)
+
+    def sample(self) -> bool:
+        """Record RSS (and a snapshot when tracing); returns True the first time the ceiling is exceeded.
+        Blocking: with tracing on, a snapshot of a large heap takes a while, so call it off the event loop."""
+        rss = process_usage()["rss_mb"]
+        self.history.append((round(time.time(), 3), rss))
+        if self.tracing and tracemalloc.is_tracing():
+            self._latest = tracemalloc.take_snapshot().filter_traces(_NOISE)
+        if self.ceiling_mb and rss is not None and rss > self.ceiling_mb and not self.tripped:
+            self.tripped = True
+            return True
+        return False
+
+    def top_growth(self, limit: Optional[int] = None) -> Optional[List[dict]]:
+        """Allocation sites ordered by growth since the baseline, or None when not tracing."""
+        if self._baseline is None or self._latest is None:
+            return None
+        stats = self._latest.compare_to(self._baseline, "traceback" if self.frames > 1 else "lineno")
+        return [{
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback] if self.frames > 1 else None,
+            "size_kb": round(stat.size / 1024, 1),
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count_diff": stat.count_diff,
+        } for stat in stats[:limit or self.top] if stat.size_diff > 0]
+
+    def report(self, limit: Optional[int] = None) -> dict:
+        traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+        return {
+            "tracing": self.tracing,
+            "interval_s": self.interval,
+            "ceiling_mb": self.ceiling_mb,
+            "tripped": self.tripped,
+            **process_usage(),
+            "traced_mb": round(traced[0] / (1024 * 1024), 1) if traced else None,
+            "rss_history": list(self.history),
+            "top_growth": self.top_growth(limit),
+        }
@@ -0,0 +1,457 @@
+"""
+Incremental Production Export
+"""
+import ast
+import hashlib
+import importlib.util
+import json
+import marshal
+import re
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .loader import BytecodeCache
+
+# Content hashes of every file export wrote, kept in production_app/ between runs
+MANIFEST_FILE = ".designgui-export.json"
+MANIFEST_VERSION = 1
+
+ARTIFACT_NAME = "production_app.pyz"
+ARTIFACT_OPTIMIZE = 2
+ARTIFACT_INTERPRETER = "/usr/bin/env python3"
+_LIBRARY_ROOT = Path(__file__).resolve().parent.parent
+# ui_lib resolves components to submodules on first attribute access, which no import statement shows
+_WHOLE_PACKAGES = ("designgui.ui_lib",)
+# Fixed entry timestamps: the same export always produces a byte-identical artifact
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+_UNCHECKED_HASH_FLAGS = 0b01
+
+# Settings of the generated entry point; None keeps NiceGUI's default
+TUNING = ("compression", "cache_max_age", "reconnect_timeout", "message_history", "ping_interval", "ping_timeout", "workers")
+COMPRESSION_ENCODINGS = {"brotli": ("br", "gzip"), "gzip": ("gzip",), "none": ()}
+# NiceGUI release that added the `ui.run` option behind a setting (older ones reject it at startup)
+TUNING_MIN_NICEGUI = {"message_history": (2, 9), "cache_max_age": (2, 20)}
+
+# Pre-rendered pages link NiceGUI's bundled fonts (Material Icons), whose URL carries the version installed on the device
+STATIC_PREFIX_PLACEHOLDER = "%NICEGUI_STATIC%"
+# Pages change only with a deploy: let clients keep them but revalidate against the ETag on every visit
+STATIC_PAGE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def unsupported_tuning(tuning: dict, nicegui_version: Optional[str] = None) -> Dict[str, str]:
+    """Settings the installed (or given) NiceGUI version cannot apply, mapped to the version they need."""
+    if nicegui_version is None:
+        from nicegui import __version__ as nicegui_version
+    installed = tuple(int(part) for part in re.findall(r"\d+", nicegui_version)[:2])
+    return {key: ".".join(map(str, needed)) for key, needed in TUNING_MIN_NICEGUI.items()
+            if tuning.get(key) is not None and installed < needed}
+
+
+def discover_routes(views_dir: Path, warn: Callable[[str], None] = print) -> List[Tuple[str, str]]:
+    """(view module name, route path) for every exportable view; `dashboard` (or a lone view) is served at '/'."""
+    names = []
+    for f in sorted(Path(views_dir).glob("*.py")):
+        if f.name == "__init__.py":
+            continue
+        if not f.stem.isidentifier():
+            warn(f"Warning: Skipping {f.name} because it is not a valid Python identifier.")
+            continue
+        names.append(f.stem)
+    return [(name, '/' if name == 'dashboard' or len(names) == 1 else f'/{name}') for name in names]
+
+
+def render_main(routes: List[Tuple[str, str]], host: str, port: int, lazy: bool = False, prewarm: bool = False,
+                static: Iterable[str] = (), tuning: Optional[dict] = None) -> str:
+    """
+    Source of the exported app's entry point. By default every view is imported at startup;
+    with `lazy` a route imports its view module on the first request and caches it, so boot
+    time and memory depend on the views actually visited. `prewarm` additionally imports the
+    remaining views one by one in a worker thread once the server is up. Views named in
+    `static` were pre-rendered to `static/<name>.html` and are served as plain HTML with an
+    ETag instead of as NiceGUI pages. `tuning` holds the production settings (see TUNING).
+    """
+    static = set(static)
+    live = [(name, path) for name, path in routes if name not in static]
+    pages = [(name, path) for name, path in routes if name in static]
+    prewarm = prewarm and lazy and bool(live)
+    tuning = {key: value for key, value in (tuning or {}).items() if value is not None}
+    workers = tuning.get("workers") or 1
+    runtime = "compression" in tuning or "ping_interval" in tuning or "ping_timeout" in tuning or workers > 1
+
+    modules = (["asyncio"] if prewarm else []) + (["hashlib"] if pages else []) + \
+        (["importlib"] if lazy and live else []) + (["os"] if pages else [])
+    uses_app = pages or prewarm or "compression" in tuning or "ping_interval" in tuning or "ping_timeout" in tuning
+    nicegui = (["__version__ as nicegui_version"] if pages else []) + (["app"] if uses_app else []) + ["ui"]
+    header = "".join(f"import {module}\n" for module in modules) + ("\n" if modules else "") + \
+        f"from nicegui import {', '.join(nicegui)}\n"
+    if runtime:
+        header += "\nfrom designgui import production\n"
+    if pages:
+        header += "from starlette.requests import Request\nfrom starlette.responses import Response\n"
+
+    body = ""
+    if live and not lazy:
+        body += "\n# Dynamically imported views\n" + "\n".join(
+            f"from product.views.{name} import render_view as render_{name}" for name, _ in live) + "\n"
+        body += "".join(f"""
+@ui.page('{path}')
+def route_{name}():
+    render_{name}()
+""" for name, path in live)
+    elif live:
+        body += """
+# Views are imported on their first request, then cached
+_views = {}
+
+
+def _view(name):
+    render = _views.get(name)
+    if render is None:
+        render = _views[name] = importlib.import_module(f'product.views.{name}').render_view
+    return render
+"""
+        body += "".join(f"""
+@ui.page('{path}')
+def route_{name}():
+    _view('{name}')()
+""" for name, path in live)
+    if prewarm:
+        body += f"""
+
+async def _prewarm():
+    # Import the views nobody has visited yet off the event loop, one at a time, after startup
+    loop = asyncio.get_running_loop()
+    for name in {tuple(name for name, _ in live)!r}:
+        await loop.run_in_executor(None, _view, name)
+
+app.on_startup(_prewarm)
+"""
+    if pages:
+        body += f"""
+# Callback-free views pre-rendered at export time: plain HTML, no websocket or per-client state
+_STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+_pages = {{}}
+
+
+def _read(path):
+    # __loader__ reads from the export directory and from inside the .pyz artifact alike
+    get_data = getattr(globals().get('__loader__'), 'get_data', None)
+    if get_data is None:
+        with open(path, 'rb') as f:
+            return f.read()
+    return get_data(path)
+
+
+def _static_page(request, name):
+    page = _pages.get(name)
+    if page is None:
+        content = _read(os.path.join(_STATIC_DIR, name + '.html'))
+        content = content.replace(b'{STATIC_PREFIX_PLACEHOLDER}', f'/_nicegui/{{nicegui_version}}/static'.encode())
+        page = _pages[name] = (content, '"' + hashlib.sha256(content).hexdigest()[:32] + '"')
+    content, etag = page
+    headers = {{'ETag': etag, 'Cache-Control': '{STATIC_PAGE_CACHE_CONTROL}'}}
+    if etag in request.headers.get('if-none-match', ''):
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type='text/html; charset=utf-8', headers=headers)
+"""
+        body += "".join(f"""
+
+app.remove_route('{path}')
+
+
+@app.get('{path}', include_in_schema=False)
+def route_{name}(request: Request):
+    return _static_page(request, '{name}')
+""" for name, path in pages)
+    if tuning.keys() & {"compression", "ping_interval", "ping_timeout"}:
+        body += "\n\n# Production tuning (`designgui export` options or \"export\" in config.json)\n"
+        if "compression" in tuning:
+            body += "production.drop_nicegui_gzip(app)\n"
+            encodings = COMPRESSION_ENCODINGS[tuning["compression"]]
+            if encodings:
+                body += f"app.add_middleware(production.CompressionMiddleware, encodings={encodings!r})\n"
+        if "ping_interval" in tuning or "ping_timeout" in tuning:
+            body += (f"production.tune_websocket(app, ping_interval={tuning.get('ping_interval')!r}, "
+                     f"ping_timeout={tuning.get('ping_timeout')!r})\n")
+
+    options = ""
+    if "reconnect_timeout" in tuning:
+        options += f", reconnect_timeout={float(tuning['reconnect_timeout'])!r}"
+    if "message_history" in tuning:
+        options += f", message_history_length={int(tuning['message_history'])!r}"
+    if "cache_max_age" in tuning:
+        # NiceGUI's own assets live under a versioned path, so they can be cached until the next upgrade
+        options += f", cache_control_directives='public, max-age={int(tuning['cache_max_age'])}, immutable'"
+    if workers > 1:
+        return f"""{header}{body}
+
+if __name__ in {{"__main__", "__mp_main__"}}:
+    if production.worker_port() is None:
+        # Sticky proxy on the public port in front of one NiceGUI process per worker
+        production.serve_workers('{host}', {port}, workers={workers})
+    else:
+        # Reload and show are FALSE for production edge/headless optimization
+        ui.run(title='Production App', host='127.0.0.1', port=production.worker_port(), reload=False, show=False{options})
+"""
+    return f"""{header}{body}
+
+if __name__ in {{"__main__", "__mp_main__"}}:
+    # Reload and show are FALSE for production edge/headless optimization
+    ui.run(title='Production App', host='{host}', port={port}, reload=False, show=False{options})
+"""
+
+
+def prerender_view(views_dir: Path, name: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Render view `name` headlessly into a standalone static page. Returns (page, []) when no
+    element needs the NiceGUI runtime, else (None, reasons): the elements with event handlers,
+    Vue components or bindings, or the error that kept the view from rendering.
+    """
+    from .api import execute_submission
+    from .headless import html_document
+    path = Path(views_dir) / f"{name}.py"
+    report = execute_submission(path.read_text(encoding="utf-8"), path.name,
+                                (str(path.parent.parent.parent), str(path.parent)), with_html=True, filename=str(path))
+    if not report["ok"]:
+        return None, [f"{report['stage']}: {report['error']}"]
+    if report["live"]:
+        return None, report["live"]
+    fonts = f'\n<link href="{STATIC_PREFIX_PLACEHOLDER}/fonts.css" rel="stylesheet" type="text/css">'
+    return html_document(report["html"], title="Production App",
+                         extra_head=fonts if "material-icons" in report["html"] else ""), []
+
+
+def read_manifest(prod_app_dir: Path) -> Optional[dict]:
+    try:
+        manifest = json.loads((Path(prod_app_dir) / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _write_atomic(target: Path, data: bytes):
+    # A server running from the directory never imports a half-written file
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(target)
+
+
+def _product_files(product_dir: Path):
+    for path in sorted(product_dir.rglob("*")):
+        relative = path.relative_to(product_dir)
+        if path.is_file() and "__pycache__" not in relative.parts and path.suffix != ".pyc":
+            yield path, relative.as_posix()
+
+
+class _Sync:
+    """Writes desired files into the export directory, skipping those whose hash the manifest already records."""
+    def __init__(self, root: Path, previous: Dict[str, str]):
+        self.root = root
+        self.previous = previous
+        self.files: Dict[str, str] = {}
+        self.changes = {"added": [], "modified": [], "removed": []}
+        self.unchanged = 0
+
+    def is_current(self, rel: str, digest: Optional[str] = None) -> bool:
+        """True if `rel` exists as last exported (and, given `digest`, still has that content)."""
+        known = self.previous.get(rel)
+        return known is not None and (digest is None or known == digest) and (self.root / rel).is_file()
+
+    def keep(self, rel: str):
+        self.files[rel] = self.previous[rel]
+        self.unchanged += 1
+
+    def place(self, rel: str, data: bytes):
+        digest = hashlib.sha256(data).hexdigest()
+        if self.is_current(rel, digest):
+            self.keep(rel)
+            return
+        existed = (self.root / rel).is_file()
+        _write_atomic(self.root / rel, data)
+        self.files[rel] = digest
+        self.changes["modified" if existed else "added"].append(rel)
+
+    def remove_stale(self):
+        for rel in sorted(set(self.previous) - set(self.files)):
+            target = self.root / rel
+            target.unlink(missing_ok=True)
+            self.changes["removed"].append(rel)
+            # Drop directories the removal left empty (e.g. a deleted view's __pycache__)
+            parent = target.parent
+            while parent != self.root and parent.is_dir() and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+
+
+def export_app(views_dir: Path, prod_app_dir: Path, host: str, port: int,
+               bytecode_cache: Optional[BytecodeCache] = None, clean: bool = False,
+               lazy: bool = False, prewarm: bool = False, static: bool = False, tuning: Optional[dict] = None,
+               warn: Callable[[str], None] = print) -> dict:
+    """
+    Bring `prod_app_dir` up to date with the product tree (the parent of `views_dir`) and return the changeset.
+    Only files whose content hash differs from the manifest of the previous export are
+    written, files that disappeared from the product are deleted, and `main.py` is rewritten
+    only when its generated source changes (routes, host or port). Files export never wrote
+    are left alone. Without a manifest (first export, or `clean`) the directory is rebuilt.
+    With `static`, views without callbacks are pre-rendered to `static/` and served as HTML;
+    their data is frozen at export time.
+    """
+    views_dir, prod_app_dir = Path(views_dir), Path(prod_app_dir)
+    product_dir = views_dir.parent
+    manifest = None if clean else read_manifest(prod_app_dir)
+    if manifest is None and prod_app_dir.exists():
+        # Nothing tells which files are ours, so start from a clean directory like a first export
+        shutil.rmtree(prod_app_dir)
+    sync = _Sync(prod_app_dir, (manifest or {}).get("files", {}))
+
+    for source, relative in _product_files(product_dir):
+        rel = f"product/{relative}"
+        data = source.read_bytes()
+        source_changed = not sync.is_current(rel, hashlib.sha256(data).hexdigest())
+        sync.place(rel, data)
+        if source.suffix != ".py" or bytecode_cache is None:
+            continue
+        # Ship the preview's compile cache as checked-hash pycs so the edge device never compiles on boot
+        target = prod_app_dir / rel
+        pyc_rel = Path(importlib.util.cache_from_source(str(target))).relative_to(prod_app_dir).as_posix()
+        if not source_changed and sync.is_current(pyc_rel):
+            sync.keep(pyc_rel)
+            continue
+        try:
+            sync.place(pyc_rel, bytecode_cache.get_pyc(data, str(target)))
+        except SyntaxError:
+            warn(f"Warning: {source.name} has a syntax error and was not precompiled.")
+
+    routes = discover_routes(views_dir, warn)
+    static_pages, live_views = [], {}
+    for name, _ in routes if static else ():
+        page, reasons = prerender_view(views_dir, name)
+        if page is None:
+            live_views[name] = reasons
+        else:
+            sync.place(f"static/{name}.html", page.encode("utf-8"))
+            static_pages.append(name)
+    sync.place("main.py", render_main(routes, host, port, lazy, prewarm, static_pages, tuning).encode("utf-8"))
+    sync.remove_stale()
+
+    _write_atomic(prod_app_dir / MANIFEST_FILE, json.dumps({
+        "version": MANIFEST_VERSION,
+        "routes": dict((path, name) for name, path in routes),
+        "files": dict(sorted(sync.files.items())),
+    }, indent=2).encode("utf-8"))
+    previous_routes = (manifest or {}).get("routes")
+    return {**sync.changes, "unchanged": sync.unchanged, "full": manifest is None,
+            "static": static_pages, "live": live_views,
+            "routes_changed": previous_routes != dict((path, name) for name, path in routes)}
+
+
+def _imported_modules(source: bytes, module: str, is_package: bool) -> Set[str]:
+    """Absolute names of every module (or candidate submodule) `source` imports."""
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                package = module.split(".") if is_package else module.split(".")[:-1]
+                anchor = ".".join(package[:len(package) - node.level + 1])
+                base = f"{anchor}.{base}" if base else anchor
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+
+def _library_file(name: str) -> Optional[Path]:
+    candidate = _LIBRARY_ROOT.joinpath(*name.split("."))
+    for path in (candidate / "__init__.py", candidate.with_suffix(".py")):
+        if path.is_file():
+            return path
+    return None
+
+
+def library_modules(sources: Iterable[Tuple[str, bytes, bool]]) -> Dict[str, Path]:
+    """
+    The `designgui` modules a product needs at runtime: everything its files import from
+    the package, transitively, plus the enclosing packages. `sources` are (module name,
+    source, is package) of the product files. Returns module name -> file.
+    """
+    pending = set()
+    for module, source, is_package in sources:
+        try:
+            pending |= _imported_modules(source, module, is_package)
+        except SyntaxError:
+            continue
+    found: Dict[str, Path] = {}
+    while pending:
+        name = pending.pop()
+        if name in found or not (name == "designgui" or name.startswith("designgui.")):
+            continue
+        path = _library_file(name)
+        if path is None:
+            continue  # an attribute imported with `from designgui.x import name`
+        found[name] = path
+        parts = name.split(".")
+        pending.update(".".join(parts[:i]) for i in range(1, len(parts)))
+        if name in _WHOLE_PACKAGES:
+            pending.update(f"{name}.{f.stem}" for f in path.parent.glob("*.py") if f.name != "__init__.py")
+        pending |= _imported_modules(path.read_bytes(), name, path.name == "__init__.py")
+    return found
+
+
+def _compile_pyc(source: bytes, filename: str, optimize: int) -> bytes:
+    code = compile(source, filename, "exec", dont_inherit=True, optimize=optimize)
+    return b"".join([importlib.util.MAGIC_NUMBER, _UNCHECKED_HASH_FLAGS.to_bytes(4, "little"),
+                     importlib.util.source_hash(source), marshal.dumps(code)])
+
+
+def build_artifact(prod_app_dir: Path, target: Path, optimize: int = ARTIFACT_OPTIMIZE,
+                   interpreter: str = ARTIFACT_INTERPRETER) -> dict:
+    """
+    Bundle an exported app into one executable zipapp: `main.py` as `__main__`, the product
+    package and the `designgui` modules it imports as sourceless pycs compiled at `optimize`
+    (2 strips asserts and docstrings), plus its static pages. Startup then imports everything from one
+    file through zipimport instead of compiling loose sources on slow flash storage.
+    The archive is written next to `target` and renamed over it, so a deploy swaps it atomically.
+    """
+    prod_app_dir, target = Path(prod_app_dir), Path(target)
+    entries: Dict[str, bytes] = {}
+    product = []
+    for path, relative in _product_files(prod_app_dir / "product"):
+        name = f"product/{relative}"
+        if path.suffix != ".py":
+            entries[name] = path.read_bytes()
+            continue
+        source = path.read_bytes()
+        module = name[:-3].replace("/", ".")
+        is_package = path.name == "__init__.py"
+        product.append((module[:-len(".__init__")] if is_package else module, source, is_package))
+        entries[f"{name[:-3]}.pyc"] = _compile_pyc(source, f"{target.name}/{name}", optimize)
+    main_source = (prod_app_dir / "main.py").read_bytes()
+    library = library_modules(product + [("__main__", main_source, False)])
+    for path in library.values():
+        name = path.relative_to(_LIBRARY_ROOT).as_posix()
+        entries[f"{name[:-3]}.pyc"] = _compile_pyc(path.read_bytes(), f"{target.name}/{name}", optimize)
+    for path in sorted((prod_app_dir / "static").glob("*.html")):
+        entries[f"static/{path.name}"] = path.read_bytes()
+    entries["__main__.pyc"] = _compile_pyc(main_source, f"{target.name}/__main__.py", optimize)
+
+    tmp = target.with_name(f".{target.name}.tmp")
+    with open(tmp, "wb") as out:
+        out.write(f"#!{interpreter}\n".encode("utf-8"))
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name in sorted(entries):
+                info = zipfile.ZipInfo(name, date_time=_ZIP_EPOCH)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, entries[name])
+    tmp.chmod(0o755)
+    tmp.replace(target)
+    return {"path": str(target), "bytes": target.stat().st_size,
+            "sha256": hashlib.sha256(target.read_bytes()).hexdigest(),
+            "optimize": optimize, "modules": sorted(m for m, _, _ in product) + sorted(library)}
@@ -0,0 +1,103 @@
+"""
+Headless View Rendering
+"""
+import html
+import re
+from typing import Callable, List, Optional
+
+from nicegui import Client, binding
+from nicegui.element import Element
+from nicegui.page import page
+
+from .tailwind import StyleSheet
+
+# Props that NiceGUI renders as element content rather than attributes
+_CONTENT_PROPS = ("innerHTML",)
+_CLASS_ATTR = re.compile(r' class="([^"]*)"')
+
+
+class HeadlessRender:
+    """Result of rendering a view into a throwaway client that no browser is connected to.
+    `live` lists the elements that need the NiceGUI runtime; when it is empty the static HTML is the whole page."""
+    def __init__(self, element_count: int, html: Optional[str] = None, live: Optional[List[str]] = None):
+        self.element_count = element_count
+        self.html = html
+        self.live = live or []
+
+
+def render_headless(render: Callable[[], None], with_html: bool = False) -> HeadlessRender:
+    """Call `render` inside a detached NiceGUI client and report what it built.
+    Exceptions raised by `render` propagate; the client is always deleted."""
+    client = Client(page('/'), request=None)
+    try:
+        with client:
+            render()
+        content = client.content
+        element_count = sum(1 for _ in content.descendants())
+        markup = "".join(element_html(child) for child in content.default_slot.children) if with_html else None
+        return HeadlessRender(element_count, markup, live_elements(content))
+    finally:
+        client.delete()
+
+
+def render_html(render: Callable[[], None]) -> str:
+    """Static HTML of everything `render` builds, without uvicorn, a websocket or a browser.
+    Element ids restart with every detached client, so the output is stable across runs."""
+    return render_headless(render, with_html=True).html
+
+
+def live_elements(root: Element) -> List[str]:
+    """Elements below `root` that only work with a server behind them: event listeners
+    (the handlers run in Python), Vue components (their markup is rendered in the browser)
+    and data bindings (values are pushed over the websocket). One reason per element."""
+    bound = set()
+    for links in binding.bindings.values():
+        bound.update(id(obj) for link in links for obj in link[:2])
+    bound.update(id(obj) for link in binding.active_links for obj in (link[0], link[2]))
+    reasons = []
+    for element in root.descendants():
+        if element is root:
+            continue
+        label = f"{element.tag}#c{element.id}"
+        if element._event_listeners:
+            events = sorted({listener.type for listener in element._event_listeners.values()})
+            reasons.append(f"{label}: on {', '.join(events)}")
+        elif element.component is not None:
+            reasons.append(f"{label}: component {element.component.name}")
+        elif id(element) in bound:
+            reasons.append(f"{label}: binding")
+    return reasons
+
+
+def html_document(body: str, title: str = "DesignGUI Snapshot", head: Optional[str] = None, extra_head: str = "") -> str:
+    """Wrap rendered markup into a standalone page; by default it inlines CSS for exactly the classes it uses."""
+    if head is None:
+        stylesheet = StyleSheet()
+        stylesheet.add(cls for match in _CLASS_ATTR.finditer(body) for cls in html.unescape(match.group(1)).split())
+        head = f"<style>\n{stylesheet.css}</style>"
+    head += extra_head
+    return (f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{html.escape(title)}</title>\n'
+            f'{head}\n</head>\n<body>\n{body}\n</body>\n</html>\n')
+
+
+def element_html(element: Element) -> str:
+    """Serialize an element subtree to static HTML: tag, id, classes, inline style, scalar props and content.
+    Vue components (e.g. `q-btn`) keep their tag names; they only come alive with the NiceGUI runtime."""
+    data = element._to_dict()
+    tag = data['tag']
+    attrs = [f'id="c{element.id}"']
+    if data.get('class'):
+        attrs.append(f'class="{html.escape(" ".join(data["class"]))}"')
+    if data.get('style'):
+        style = ";".join(f"{k}:{v}" for k, v in data['style'].items())
+        attrs.append(f'style="{html.escape(style)}"')
+    content = html.escape(data['text']) if data.get('text') is not None else ""
+    for key, value in data.get('props', {}).items():
+        if key in _CONTENT_PROPS:
+            content = str(value)
+        elif value is True:
+            attrs.append(html.escape(key))
+        elif isinstance(value, (str, int, float)) and value is not False:
+            attrs.append(f'{html.escape(key)}="{html.escape(str(value))}"')
+    children = "".join(element_html(child) for slot in element.slots.values() for child in slot.children)
+    return f"<{tag} {' '.join(attrs)}>{content}{children}</{tag}>"
@@ -0,0 +1,84 @@
+"""
+Process-Wide View Index
+"""
+import ast
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class ViewEntry:
+    """What the preview needs to know about one top-level view file without importing it."""
+    def __init__(self, path: Path, mtime: float, digest: str, has_render_view: bool):
+        self.path = path
+        self.name = path.name
+        self.mtime = mtime
+        self.digest = digest
+        self.has_render_view = has_render_view
+
+    def __repr__(self):
+        return f"ViewEntry({self.name!r}, digest={self.digest[:8]}, has_render_view={self.has_render_view})"
+
+
+class ViewIndex:
+    """
+    Single index of the views directory, shared by every connected client.
+    Kept current from the reload hub's change sets instead of globbing the directory per
+    client on every save. `version` only moves when the set of view names changes, so
+    clients compare it to the version they last rendered and skip no-op dropdown updates.
+    """
+    def __init__(self, views_dir: Path):
+        self.views_dir = Path(views_dir)
+        self._entries: Dict[str, ViewEntry] = {}
+        self.version = 0
+
+    def scan(self):
+        """Rebuild the index from disk."""
+        self._entries = {}
+        if self.views_dir.exists():
+            for path in self.views_dir.glob("*.py"):
+                self._update(path)
+        self.version += 1
+
+    def refresh(self, changed: Iterable[Path]) -> bool:
+        """Apply a batch of changed paths; return True if views were added or removed."""
+        before = set(self._entries)
+        for path in changed:
+            path = Path(path)
+            if path.parent == self.views_dir and path.suffix == ".py":
+                self._update(path)
+        if set(self._entries) != before:
+            self.version += 1
+            return True
+        return False
+
+    def _update(self, path: Path):
+        if path.name == "__init__.py":
+            return
+        try:
+            stat = path.stat()
+            source = path.read_bytes()
+        except OSError:
+            self._entries.pop(path.name, None)
+            return
+        self._entries[path.name] = ViewEntry(path, stat.st_mtime, hashlib.sha256(source).hexdigest(),
+                                             _defines_render_view(source))
+
+    def names(self) -> List[str]:
+        """View filenames in a stable order for the dropdown."""
+        return sorted(self._entries)
+
+    def get(self, name: str) -> Optional[ViewEntry]:
+        return self._entries.get(name)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _defines_render_view(source: bytes) -> bool:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return False
+    return any(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "render_view"
+               for node in tree.body)
@@ -0,0 +1,218 @@
+"""
+Versioned View Module Cache
+"""
+import _imp
+import hashlib
+import importlib.util
+import inspect
+import marshal
+import sys
+import time
+import traceback
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from .metrics import MODULE_EXEC_SECONDS
+
+# PEP 552 flags: hash-based pyc whose source hash is checked against the .py on import
+_CHECKED_HASH_FLAGS = 0b11
+
+
+class BytecodeCache:
+    """
+    Persistent compile cache for view sources, shared by the live preview and `export`.
+    Entries are keyed by the source's sha256 and the interpreter's cache tag, and stored as
+    standard checked-hash `.pyc` payloads, so the exported app's regular import system can
+    load them straight from `__pycache__` without recompiling on first boot.
+    """
+    def __init__(self, cache_dir: Path, max_entries: int = 512):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, source: bytes) -> Path:
+        digest = hashlib.sha256(source).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.{sys.implementation.cache_tag}.pyc"
+
+    def get_pyc(self, source: bytes, filename: str) -> bytes:
+        """Return checked-hash pyc bytes for `source`, compiling and persisting them on a miss."""
+        entry = self._entry(source)
+        try:
+            data = entry.read_bytes()
+            if data[:4] == importlib.util.MAGIC_NUMBER and data[8:16] == importlib.util.source_hash(source):
+                self.hits += 1
+                return data
+        except OSError:
+            pass
+        self.misses += 1
+        code = compile(source, filename, "exec")
+        data = b"".join([
+            importlib.util.MAGIC_NUMBER,
+            _CHECKED_HASH_FLAGS.to_bytes(4, "little"),
+            importlib.util.source_hash(source),
+            marshal.dumps(code),
+        ])
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(entry)
+            self._prune()
+        except OSError:
+            # A read-only project still previews fine, just without persistence
+            pass
+        return data
+
+    def compile(self, source: bytes, filename: str):
+        """Return the code object for `source`, reusing the persisted compile when available."""
+        code = marshal.loads(self.get_pyc(source, filename)[16:])
+        # The entry may have been compiled for a file with identical content at another path
+        _imp._fix_co_filename(code, filename)
+        return code
+
+    def write_pycache(self, source_path: Path):
+        """Materialise the cached compile of `source_path` as its `__pycache__` pyc for regular imports."""
+        source_path = Path(source_path)
+        data = self.get_pyc(source_path.read_bytes(), str(source_path))
+        target = Path(importlib.util.cache_from_source(str(source_path)))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        return target
+
+    def _prune(self):
+        entries = list(self.cache_dir.glob("*.pyc"))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for stale in entries[:len(entries) - self.max_entries]:
+            stale.unlink(missing_ok=True)
+
+
+# Lives in each executed view's namespace: old closures keep the namespace (not the module) alive,
+# so a weak reference to this marker tells whether an evicted version is really gone
+_MARKER = "__designgui_version__"
+
+
+class _VersionMarker:
+    __slots__ = ("__weakref__",)
+
+
+class LoadedView:
+    """One executed version of a view file, shared by every client rendering it."""
+    def __init__(self, path: Path, digest: str, module_name: str):
+        self.path = path
+        self.digest = digest
+        self.module_name = module_name
+        self.module = None
+        self.render: Optional[Callable] = None
+        self.error: Optional[BaseException] = None
+        self.traceback: str = ""
+        self.owners: Set[Hashable] = set()
+
+
+class ViewModuleCache:
+    """
+    Executes each version of a view file once per process.
+    Versions are keyed by file path and content hash; every client acquires the shared
+    `LoadedView` and calls its `render_view` into its own preview pane. A superseded
+    version stays alive while any client still references it and is evicted (including
+    its `sys.modules` entry) as soon as the last one releases it.
+    """
+    def __init__(self, bytecode_cache: Optional[BytecodeCache] = None):
+        self.bytecode_cache = bytecode_cache
+        self._current: Dict[Path, LoadedView] = {}
+        self._by_owner: Dict[Hashable, LoadedView] = {}
+        self._live: Dict[str, LoadedView] = {}
+        # Markers of evicted versions, held weakly: anything still listed is kept alive from outside the cache
+        self._evicted: "weakref.WeakValueDictionary[str, _VersionMarker]" = weakref.WeakValueDictionary()
+        self._counter = 0
+        self.executions = 0
+
+    def acquire(self, path: Path, owner: Hashable, source: Optional[bytes] = None) -> LoadedView:
+        """Return the loaded version matching the file's current content (or `source`, if the caller
+        already read and vetted it), executing it on first use."""
+        path = Path(path)
+        if source is None:
+            source = path.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+        loaded = self._current.get(path)
+        if loaded is None or loaded.digest != digest:
+            loaded = self._execute(path, source, digest)
+            previous = self._current.get(path)
+            self._current[path] = loaded
+            if previous is not None:
+                self._maybe_evict(previous)
+
+        self.release(owner)
+        loaded.owners.add(owner)
+        self._by_owner[owner] = loaded
+        return loaded
+
+    def release(self, owner: Hashable):
+        """Drop the owner's reference to whatever version it was rendering."""
+        loaded = self._by_owner.pop(owner, None)
+        if loaded is not None:
+            loaded.owners.discard(owner)
+            self._maybe_evict(loaded)
+
+    def invalidate(self, path: Path):
+        """Force the next acquire of `path` to re-execute, e.g. after an imported module changed."""
+        loaded = self._current.pop(Path(path), None)
+        if loaded is not None:
+            self._maybe_evict(loaded)
+
+    def live_versions(self) -> Dict[Tuple[Path, str], int]:
+        """(path, content hash) → number of clients referencing it, for every version still in memory."""
+        return {(v.path, v.digest): len(v.owners) for v in self._live.values()}
+
+    def lingering_versions(self) -> List[str]:
+        """Module names of evicted versions that are still alive, e.g. held by an old `on_click` closure
+        or element tree. Run `gc.collect()` first to exclude garbage that merely awaits collection."""
+        return sorted(self._evicted.keys())
+
+    def _maybe_evict(self, loaded: LoadedView):
+        if loaded.owners or self._current.get(loaded.path) is loaded:
+            return
+        self._live.pop(loaded.module_name, None)
+        if sys.modules.get(loaded.module_name) is loaded.module:
+            del sys.modules[loaded.module_name]
+        if loaded.module is not None:
+            self._evicted[loaded.module_name] = loaded.module.__dict__[_MARKER]
+
+    def _execute(self, path: Path, source: bytes, digest: str) -> LoadedView:
+        self._counter += 1
+        module_name = f"dynamic_view_{path.stem}_v{self._counter}"
+        loaded = LoadedView(path, digest, module_name)
+        self._live[module_name] = loaded
+        self.executions += 1
+        started = time.perf_counter()
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, str(path))
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            module.__dict__[_MARKER] = _VersionMarker()
+            loaded.module = module
+            # Execute the exact bytes that were hashed, not whatever is on disk a moment later
+            if self.bytecode_cache is not None:
+                code = self.bytecode_cache.compile(source, str(path))
+            else:
+                code = compile(source, str(path), "exec")
+            exec(code, module.__dict__)
+            loaded.render = _find_render_function(module, module_name)
+        except Exception as e:
+            loaded.error = e
+            loaded.traceback = traceback.format_exc()
+        MODULE_EXEC_SECONDS.observe(time.perf_counter() - started)
+        return loaded
+
+
+def _find_render_function(module, module_name: str) -> Optional[Callable]:
+    """Prefer `render_view`, falling back to the first function defined in the module itself."""
+    if hasattr(module, 'render_view'):
+        return getattr(module, 'render_view')
+    for name, obj in inspect.getmembers(module, inspect.isfunction):
+        if obj.__module__ == module_name:
+            return obj
+    return None
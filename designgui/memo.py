@@ -0,0 +1,188 @@
+"""
+Reload-Surviving Memoization
+"""
+import contextlib
+import copy as _copy
+import functools
+import hashlib
+import inspect
+import marshal
+import pickle
+import sys
+import textwrap
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .metrics import REGISTRY, Counter
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_MB = 256.0
+
+MEMO_LOOKUPS = REGISTRY.register(Counter(
+    "designgui_memo_lookups_total", "Calls to @memoize'd data loaders, by cache outcome.", ["outcome"]))
+
+
+class DataCache:
+    """
+    Process-wide LRU store for the results of expensive view data loaders.
+    Lives in this module, which hot reloads never purge, so a loader's result outlives the
+    view module version that computed it. Entries are evicted least recently used first
+    once either `max_entries` or `max_bytes` (estimated from the pickled size) is exceeded.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self._journal: Optional[Set[Hashable]] = None
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.add(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None):
+        size = _estimate_size(value) if size is None else size
+        with self._lock:
+            if self._journal is not None:
+                self._journal.add(key)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self, qualname: Optional[str] = None):
+        """Drop every entry, or only those of loaders with this qualified name."""
+        with self._lock:
+            for key in [k for k in self._entries if qualname is None or k[0] == qualname]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    @contextlib.contextmanager
+    def journal(self):
+        """Collect the keys looked up or stored inside the block (one run at a time)."""
+        keys: Set[Hashable] = set()
+        self._journal = keys
+        try:
+            yield keys
+        finally:
+            self._journal = None
+
+    def export(self, keys: Iterable[Hashable]) -> List[bytes]:
+        """The cached entries among `keys`, each pickled on its own; unpicklable results are left out."""
+        with self._lock:
+            entries = [(key, *self._entries[key]) for key in keys if key in self._entries]
+        exported = []
+        for entry in entries:
+            try:
+                exported.append(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                continue
+        return exported
+
+    def load(self, exported: Iterable[bytes]) -> int:
+        """Store entries another process `export()`ed; returns how many could be unpickled here."""
+        loaded = 0
+        for blob in exported:
+            try:
+                key, value, size = pickle.loads(blob)
+            except Exception:
+                # e.g. an instance of a class that only exists in the exporting process
+                continue
+            self.put(key, value, size)
+            loaded += 1
+        return loaded
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The store every @memoize shares unless given its own
+store = DataCache()
+
+
+def memoize(func: Optional[Callable] = None, *, cache: Optional[DataCache] = None, copy: bool = False):
+    """
+    Cache a view's data loader across hot reloads:
+
+        @memoize
+        def load_orders(path="fixtures/orders.csv"):
+            ...
+
+    Results are keyed by the loader's qualified name and file, its arguments and a hash of its
+    own source, so saving a styling change elsewhere in the view reuses the loaded data while
+    editing the loader's body reloads it. Changes to helpers the loader calls or to files it
+    reads are not detected; call `clear()` (or edit the loader) to force a reload. Results are
+    shared between renders and clients: treat them as read-only, or pass `copy=True`.
+    """
+    if func is None:
+        return functools.partial(memoize, cache=cache, copy=copy)
+    target = cache if cache is not None else store
+    # The file keeps same-text loaders of different views apart (e.g. reading each view's own FIXTURE)
+    identity = (func.__qualname__, func.__code__.co_filename, _source_hash(func))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (*identity, _arguments_key(args, kwargs))
+        found, value = target.get(key)
+        MEMO_LOOKUPS.inc(outcome="hit" if found else "miss")
+        if not found:
+            value = func(*args, **kwargs)
+            target.put(key, value)
+        return _copy.deepcopy(value) if copy else value
+
+    wrapper.cache = target
+    wrapper.clear = functools.partial(target.clear, func.__qualname__)
+    return wrapper
+
+
+def clear():
+    """Empty the shared store, e.g. after fixtures changed on disk."""
+    store.clear()
+
+
+def _source_hash(func: Callable) -> str:
+    try:
+        source = textwrap.dedent(inspect.getsource(func)).encode("utf-8")
+    except (OSError, TypeError):
+        # No source on disk (e.g. exec'd from a string): fall back to the compiled body
+        source = marshal.dumps(func.__code__.co_code) + repr(func.__code__.co_consts).encode("utf-8")
+    return hashlib.sha256(source).hexdigest()
+
+
+def _arguments_key(args: tuple, kwargs: dict) -> Hashable:
+    key = (args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        # Lists and dicts as arguments: key on their pickled form instead
+        return pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _estimate_size(value: Any) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
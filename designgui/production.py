@@ -0,0 +1,287 @@
+"""
+Production Runtime Tuning
+"""
+import asyncio
+import itertools
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import zlib
+from typing import List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import brotli
+except ImportError:  # optional: `pip install designgui[brotli]`
+    brotli = None
+
+# Set in the environment of each worker process started by serve_workers()
+WORKER_PORT_ENV = "DESIGNGUI_WORKER_PORT"
+STICKY_COOKIE = "designgui_worker"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+MINIMUM_SIZE = 500
+BACKEND_CONNECT_TIMEOUT = 10.0
+RESTART_DELAY_S = 1.0
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing text responses (HTML, JS, CSS, JSON, SVG) with the first of
+    `encodings` the client accepts. Brotli is used only when the `brotli` package is installed;
+    otherwise those clients get gzip. Responses are compressed as they stream, and responses
+    that are small, already encoded or of another type pass through untouched.
+    """
+    def __init__(self, app, encodings: Sequence[str] = ("br", "gzip"), minimum_size: int = MINIMUM_SIZE,
+                 gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.encodings = [e for e in encodings if e == "gzip" or (e == "br" and brotli is not None)]
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = {part.split(";")[0].strip() for part in Headers(scope=scope).get("accept-encoding", "").split(",")}
+        encoding = next((e for e in self.encodings if e in accepted), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self))
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str, settings: CompressionMiddleware):
+        self.send = send
+        self.encoding = encoding
+        self.settings = settings
+        self.start = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            return self.compressor.process(data) + (self.compressor.finish() if final else self.compressor.flush())
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+    async def __call__(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message["type"] == "http.response.start":
+            self.start = message  # held until the first body chunk decides whether to compress
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        body, more = message.get("body", b""), message.get("more_body", False)
+        if self.compressor is None:
+            headers = Headers(raw=self.start["headers"])
+            if ("content-encoding" in headers or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                    or (not more and len(body) < self.settings.minimum_size)):
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = brotli.Compressor(quality=self.settings.brotli_quality) if self.encoding == "br" \
+                else zlib.compressobj(self.settings.gzip_level, zlib.DEFLATED, 31)
+            body = self._compress(body, not more)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more})
+            return
+        await self.send({"type": "http.response.body", "body": self._compress(body, not more), "more_body": more})
+
+
+def drop_nicegui_gzip(app):
+    """`ui.run` always installs GZipMiddleware; remove it when the stack is built, so that
+    CompressionMiddleware (or a reverse proxy) is the only one compressing."""
+    build = app.build_middleware_stack
+
+    def build_without_gzip():
+        app.user_middleware[:] = [m for m in app.user_middleware if m.cls is not GZipMiddleware]
+        return build()
+    app.build_middleware_stack = build_without_gzip
+
+
+def tune_websocket(app, ping_interval: Optional[float] = None, ping_timeout: Optional[float] = None):
+    """Override the engine.io heartbeat NiceGUI derives from `reconnect_timeout` at startup."""
+    def apply():
+        from nicegui import core
+        if ping_interval is not None:
+            core.sio.eio.ping_interval = ping_interval
+        if ping_timeout is not None:
+            core.sio.eio.ping_timeout = ping_timeout
+    app.on_startup(apply)
+
+
+def worker_port() -> Optional[int]:
+    """Loopback port this process serves as one of serve_workers()' workers, or None in the parent."""
+    port = os.environ.get(WORKER_PORT_ENV)
+    return int(port) if port else None
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class _Workers:
+    """Keeps one app process per backend port running, restarting any that exits."""
+    def __init__(self, argv: List[str], ports: List[int]):
+        self.argv = argv
+        self.ports = ports
+        self.processes: List[Optional[subprocess.Popen]] = [None] * len(ports)
+        self.stopping = False
+
+    def spawn(self, index: int):
+        env = {**os.environ, WORKER_PORT_ENV: str(self.ports[index])}
+        self.processes[index] = subprocess.Popen([sys.executable, *self.argv], env=env)
+
+    async def supervise(self):
+        for index in range(len(self.ports)):
+            self.spawn(index)
+        while not self.stopping:
+            await asyncio.sleep(RESTART_DELAY_S)
+            for index, process in enumerate(self.processes):
+                if process.poll() is not None and not self.stopping:
+                    print(f"Worker {index} exited with {process.returncode}; restarting.", flush=True)
+                    self.spawn(index)
+
+    def stop(self):
+        self.stopping = True
+        for process in self.processes:
+            if process is not None and process.poll() is None:
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+def _worker_from_cookie(head: bytes, workers: int) -> Optional[int]:
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() != b"cookie":
+            continue
+        for pair in value.decode("latin-1").split(";"):
+            key, _, index = pair.strip().partition("=")
+            if key == STICKY_COOKIE and index.isdigit() and int(index) < workers:
+                return int(index)
+    return None
+
+
+async def _connect(port: int):
+    deadline = time.monotonic() + BACKEND_CONNECT_TIMEOUT
+    while True:
+        try:
+            return await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            # The worker is still booting (or being restarted)
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, header: bytes = b""):
+    """Copy until EOF; `header` is added to the first final HTTP response head passing through."""
+    try:
+        while header:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if head.startswith(b"HTTP/1.1 1") and not head.startswith(b"HTTP/1.1 101"):
+                writer.write(head)  # interim response, e.g. 100 Continue
+                continue
+            writer.write(head[:-2] + header + b"\r\n")
+            header = b""
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.CancelledError):
+        pass
+    finally:
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+def _sticky_handler(ports: List[int]):
+    assign = itertools.cycle(range(len(ports)))
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        index = _worker_from_cookie(head, len(ports))
+        new_client = index is None
+        if new_client:
+            index = next(assign)
+        try:
+            upstream_reader, upstream_writer = await _connect(ports[index])
+        except OSError:
+            writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            writer.close()
+            return
+        upstream_writer.write(head)
+        # Pin the browser to this worker: the page and its websocket must reach the same process.
+        # Both directions start at once, so a request body (e.g. a first-hit POST) is never held back.
+        cookie = f"Set-Cookie: {STICKY_COOKIE}={index}; Path=/; HttpOnly; SameSite=Lax\r\n".encode("latin-1")
+        await asyncio.gather(_pipe(reader, upstream_writer),
+                             _pipe(upstream_reader, writer, cookie if new_client else b""))
+    return handle
+
+
+def serve_workers(host: str, port: int, workers: int, argv: Optional[List[str]] = None):
+    """
+    Multi-process mode for multi-core devices. NiceGUI keeps each client's element tree in
+    the process that rendered its page, so it cannot share one port between processes.
+    Instead run `workers` copies of this app (`argv`, default: the running script) on
+    loopback ports behind a sticky proxy on host:port. New browsers are assigned round-robin
+    and pinned by the `designgui_worker` cookie, so a page and its websocket always reach the
+    same worker. Blocks until SIGINT or SIGTERM, then stops the workers.
+    """
+    ports = [_free_port() for _ in range(workers)]
+    pool = _Workers(argv if argv is not None else sys.argv[:1], ports)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stopped.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+        server = await asyncio.start_server(_sticky_handler(ports), host, port)
+        supervisor = asyncio.create_task(pool.supervise())
+        print(f"Serving {workers} workers on http://{host}:{port} (sticky sessions)", flush=True)
+        try:
+            await stopped.wait()
+        finally:
+            server.close()
+            supervisor.cancel()
+            pool.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pool.stop()
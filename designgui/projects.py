@@ -0,0 +1,135 @@
+"""
+Mounted Preview Projects
+"""
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .deps import DependencyGraph
+from .index import ViewIndex
+from .reloads import ReloadTracker
+from .watcher import DEFAULT_DEBOUNCE_MS, ReloadHub, start_observer
+
+DEFAULT_VIEWS_PATH = ".designgui/product/views"
+
+# Mounted projects are served under /p/<name>/ (preview page) and /p/<name>/api/... (agent API)
+MOUNT_PREFIX = "/p"
+
+_PROJECT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def valid_project_name(name) -> bool:
+    """Project names become URL path segments, so only letters, digits, '-' and '_' are allowed."""
+    return isinstance(name, str) and bool(_PROJECT_NAME.match(name))
+
+
+def read_config(root: Path) -> dict:
+    """The project's .designgui/config.json, or {} if it is missing or unreadable."""
+    try:
+        config = json.loads((Path(root) / ".designgui" / "config.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
+class Project:
+    """
+    One project root served by the preview process.
+    Owns everything that used to be process-wide per views directory: the reload hub fed by
+    its own watchdog observer (scoped to its product tree), the import graph, the view index
+    and the reload generations. The executed-module cache, stylesheet and sandbox workers stay
+    shared, which is what lets many workspaces live in one NiceGUI process.
+    """
+    def __init__(self, name: str, root: Path, views_path: Optional[str] = None,
+                 debounce_ms: int = DEFAULT_DEBOUNCE_MS, prefix: str = ""):
+        self.name = name
+        self.root = Path(root).resolve()
+        self.prefix = prefix
+        views_path = views_path or read_config(self.root).get("paths", {}).get("views", DEFAULT_VIEWS_PATH)
+        self.views_dir = self.root / views_path
+        self.product_dir = self.views_dir.parent
+        self.hub = ReloadHub(debounce_ms)
+        self.dependency_graph = DependencyGraph(self.views_dir, self.product_dir)
+        self.view_index = ViewIndex(self.views_dir)
+        self.reload_tracker = ReloadTracker()
+        self.observer = None
+
+    @property
+    def import_roots(self) -> Tuple[str, str]:
+        # Grandparent for `product.models` / `product.shell` like the exported app, views dir for siblings
+        return (str(self.product_dir.parent), str(self.views_dir))
+
+    @property
+    def url(self) -> str:
+        return self.prefix or "/"
+
+    def settings(self) -> Tuple[str, str]:
+        """(locale, font family) from config.json, re-read on every page load so edits apply without a restart."""
+        config = read_config(self.root)
+        return config.get("locale", "en-US"), config.get("font_family", "Inter, sans-serif")
+
+    def owns(self, path) -> bool:
+        """True if `path` (a module file) belongs to this project's product tree."""
+        return Path(path).is_relative_to(self.product_dir)
+
+    def scan(self):
+        """Build the import graph and view index from disk and seed the reload generations."""
+        self.dependency_graph.scan()
+        self.view_index.scan()
+        for name in self.view_index.names():
+            self.reload_tracker.seed(name, self.view_index.get(name).digest)
+
+    def start(self):
+        """Watch the whole product tree so shell.py / models.py edits reach the views importing them."""
+        if self.observer is None and self.views_dir.exists():
+            self.observer = start_observer(self.hub, str(self.product_dir), recursive=True)
+
+    def stop(self):
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "root": str(self.root), "views_dir": str(self.views_dir), "url": self.url,
+                "views": len(self.view_index), "watching": self.observer is not None}
+
+
+class ProjectRegistry:
+    """
+    Projects served by this process, keyed by name. The default project (the directory
+    `designgui start` ran in) is mounted at "/"; the rest under MOUNT_PREFIX. Projects can
+    be added and removed while the server runs; two mounts of the same views directory are
+    refused since their watchers would race each other over the same files.
+    """
+    def __init__(self):
+        self._projects: Dict[str, Project] = {}
+        self.default: Optional[Project] = None
+
+    def add(self, project: Project) -> Project:
+        if project.name in self._projects:
+            raise ValueError(f"A project named {project.name!r} is already mounted.")
+        for other in self._projects.values():
+            if other.views_dir == project.views_dir:
+                raise ValueError(f"{project.views_dir} is already mounted as {other.name!r}.")
+        self._projects[project.name] = project
+        if self.default is None and not project.prefix:
+            self.default = project
+        return project
+
+    def remove(self, name: str) -> Project:
+        project = self._projects[name]
+        if project is self.default:
+            raise ValueError("The default project cannot be unmounted.")
+        return self._projects.pop(name)
+
+    def get(self, name: Optional[str]) -> Optional[Project]:
+        """The named project, or the default one for `None`."""
+        return self.default if name is None else self._projects.get(name)
+
+    def all(self) -> List[Project]:
+        return list(self._projects.values())
+
+    def __len__(self):
+        return len(self._projects)
@@ -0,0 +1,166 @@
+"""
+Keyed Preview Reconciliation
+"""
+from typing import Callable, Hashable, List, Optional
+
+from nicegui.element import Element
+
+
+class ReconcileStats:
+    """What a reconcile pass actually had to send to the browser."""
+    def __init__(self):
+        self.unchanged = 0
+        self.updated = 0
+        self.inserted = 0
+        self.removed = 0
+
+    @property
+    def sent(self) -> int:
+        """Elements whose state goes over the websocket (updates, inserts and deletions)."""
+        return self.updated + self.inserted + self.removed
+
+    def __repr__(self):
+        return f"ReconcileStats(unchanged={self.unchanged}, updated={self.updated}, inserted={self.inserted}, removed={self.removed})"
+
+
+def element_key(element: Element) -> Optional[Hashable]:
+    """Explicit reconciliation key, set on any element with `.props('key=...')`."""
+    return element._props.get('key')
+
+
+def _compatible(old: Element, new: Element) -> bool:
+    return type(old) is type(new) and old.tag == new.tag
+
+
+class _Reconciler:
+    """
+    Diffs a freshly rendered tree against the one already mounted in the browser.
+
+    The new tree is always kept on the Python side, so every handler, callback and
+    component attribute belongs to the latest render. What is reused is the *browser*
+    state: a new element matched to an old one (same position, tag, type and key) takes
+    over the old element's id and event listener ids, and is only sent if its serialized
+    form differs. Unmatched new subtrees are mounted, unmatched old subtrees are deleted.
+
+    NOTE: this relies on NiceGUI's element ids, `Client.elements` and `Outbox.updates`.
+    """
+    def __init__(self, container: Element):
+        self.container = container
+        self.client = container.client
+        self.outbox = self.client.outbox
+        self.pending_before = set(self.outbox.updates.keys())
+        self.stats = ReconcileStats()
+
+    def run(self, render: Callable[[], None]) -> ReconcileStats:
+        container = self.container
+        before = container._to_dict()
+        old_children = list(container.default_slot.children)
+        with container:
+            staging = Element('div')
+        container.default_slot.children.remove(staging)
+        try:
+            with staging:
+                render()
+        except Exception:
+            self._discard_unsent(list(staging.descendants(include_self=True)))
+            self._restore(container, before)
+            raise
+
+        new_children = list(staging.default_slot.children)
+        staging.default_slot.children.clear()
+        self._discard_unsent([staging])
+
+        container.default_slot.children[:] = self._reconcile_slot(old_children, new_children)
+        for child in container.default_slot.children:
+            child.parent_slot = container.default_slot
+        self._restore(container, before)
+        return self.stats
+
+    def _restore(self, container: Element, before: dict):
+        """Only resend the container itself if its children actually changed."""
+        if container._to_dict() != before or container.id in self.pending_before:
+            self.outbox.enqueue_update(container)
+        else:
+            self.outbox.updates.pop(container.id, None)
+
+    def _discard_unsent(self, elements: List[Element]):
+        """Delete elements the browser has never seen, without sending deletions for them."""
+        self.client.remove_elements(elements)
+        for element in elements:
+            self.outbox.updates.pop(element.id, None)
+
+    def _reconcile_slot(self, old_children: List[Element], new_children: List[Element]) -> List[Element]:
+        keyed = {}
+        unkeyed = []
+        for old in old_children:
+            key = element_key(old)
+            if key is None:
+                unkeyed.append(old)
+            else:
+                keyed.setdefault(key, old)
+
+        matched = set()
+        position = 0
+        for new in new_children:
+            key = element_key(new)
+            candidate = None
+            if key is not None:
+                candidate = keyed.get(key)
+            elif position < len(unkeyed):
+                candidate = unkeyed[position]
+                position += 1
+            if candidate is not None and id(candidate) not in matched and _compatible(candidate, new):
+                matched.add(id(candidate))
+                self._adopt(candidate, new)
+            else:
+                self.stats.inserted += sum(1 for _ in new.descendants(include_self=True))
+
+        for old in old_children:
+            if id(old) not in matched:
+                removed = list(old.descendants(include_self=True))
+                self.client.remove_elements(removed)
+                self.stats.removed += len(removed)
+        return new_children
+
+    def _adopt(self, old: Element, new: Element):
+        for name, new_slot in new.slots.items():
+            old_slot = old.slots.get(name)
+            old_children = list(old_slot.children) if old_slot is not None else []
+            new_slot.children[:] = self._reconcile_slot(old_children, list(new_slot.children))
+
+        # Reuse the listener ids the browser already has bound, pairing listeners in order
+        listeners = {}
+        for old_listener, new_listener in zip(list(old._event_listeners.values()), list(new._event_listeners.values())):
+            if _listener_signature(old_listener) == _listener_signature(new_listener):
+                new_listener.id = old_listener.id
+        for listener in new._event_listeners.values():
+            listener.element_id = old.id
+            listeners[listener.id] = listener
+        new._event_listeners = listeners
+
+        old_state = old._to_dict()
+        fresh_id = new.id
+        self.client.remove_elements([old])
+        self.outbox.updates.pop(fresh_id, None)
+        self.client.elements.pop(fresh_id, None)
+        new.id = old.id
+        self.client.elements[new.id] = new
+
+        if new._to_dict() != old_state or old.id in self.pending_before:
+            self.outbox.updates[new.id] = new
+            self.stats.updated += 1
+        else:
+            # Drop the deletion queued by remove_elements: the browser keeps its element
+            self.outbox.updates.pop(new.id, None)
+            self.stats.unchanged += 1
+
+
+def _listener_signature(listener) -> dict:
+    signature = listener.to_dict()
+    signature.pop('listener_id')
+    return signature
+
+
+def reconcile(container: Element, render: Callable[[], None]) -> ReconcileStats:
+    """Render into `container`, sending only the elements that differ from what is already mounted."""
+    return _Reconciler(container).run(render)
@@ -0,0 +1,136 @@
+"""
+Per-View Reload Generations
+"""
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+
+class ViewReload:
+    """Latest reload of one view: a monotonically increasing generation and the outcome of rendering it."""
+    def __init__(self, name: str):
+        self.name = name
+        self.generation = 0
+        self.digest: Optional[str] = None
+        # idle (not rendered since startup) | stale (changed, nothing renders it yet) | pending | ok | error
+        self.status = "idle"
+        self.outcome: Optional[dict] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("ok", "error")
+
+    def to_dict(self) -> dict:
+        return {
+            "view": self.name,
+            "generation": self.generation,
+            "hash": self.digest,
+            "status": self.status,
+            "outcome": self.outcome,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ReloadTracker:
+    """
+    Tracks which version of each view has finished rendering, so agents and tests can wait
+    for a save to be picked up instead of sleeping. `begin()` bumps the view's generation
+    when a broadcast reaches it and marks it stale; whoever renders it first (a client showing
+    the view, or a validation started for a waiter) `claim()`s it, and `finish()` records the
+    outcome unless a newer generation has begun meanwhile. `wait()` long-polls for a
+    generation or a content hash.
+    """
+    def __init__(self):
+        self._views: Dict[str, ViewReload] = {}
+        # Created by wait() inside the running loop: an Event made at import time may bind to another loop
+        self._changed: Optional[asyncio.Event] = None
+        self._changed_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self, name: str) -> ViewReload:
+        if name not in self._views:
+            self._views[name] = ViewReload(name)
+        return self._views[name]
+
+    def all(self) -> Dict[str, ViewReload]:
+        return dict(self._views)
+
+    def seed(self, name: str, digest: Optional[str]):
+        """Record the content hash a view had at startup, before anything rendered it."""
+        reload = self.get(name)
+        if reload.status == "idle":
+            reload.digest = digest
+
+    def begin(self, name: str, digest: Optional[str]) -> int:
+        reload = self.get(name)
+        reload.generation += 1
+        reload.digest = digest
+        reload.status = "stale"
+        reload.outcome = None
+        reload.started_at = None
+        reload.finished_at = None
+        self._notify()
+        return reload.generation
+
+    def claim(self, name: str, generation: int) -> bool:
+        """Mark stale `generation` as being rendered; False if it is superseded or already claimed."""
+        reload = self.get(name)
+        if reload.generation != generation or reload.status != "stale":
+            return False
+        reload.status = "pending"
+        reload.started_at = time.time()
+        self._notify()
+        return True
+
+    def finish(self, name: str, generation: int, outcome: dict) -> bool:
+        """Record the outcome of `generation`; returns False if it was superseded."""
+        reload = self.get(name)
+        if reload.generation != generation:
+            return False
+        reload.status = "ok" if outcome.get("ok") else "error"
+        reload.outcome = outcome
+        reload.finished_at = time.time()
+        self._notify()
+        return True
+
+    def _notify(self):
+        # Wake every waiter once; each re-checks its own condition against the new state
+        changed, self._changed = self._changed, None
+        if changed is not None:
+            changed.set()
+
+    async def wait(self, name: str, generation: Optional[int] = None, digest: Optional[str] = None,
+                   timeout: float = 30.0, on_idle: Optional[Callable[[str], None]] = None) -> Optional[ViewReload]:
+        """
+        Block until `name` has finished rendering `generation` (or a later one) or the version whose
+        content hash is `digest`. Returns the view's state, or None on timeout.
+        `on_idle` is called once per generation if the awaited version is current but nothing renders
+        it: it changed while no client showed it, or it was never rendered (e.g. an agent rewrote
+        identical content, which produces no broadcast).
+        """
+        deadline = time.monotonic() + timeout
+        kicked = None
+        while True:
+            reload = self.get(name)
+            awaited = ((generation is not None and reload.generation >= generation)
+                       or (digest is not None and reload.digest == digest))
+            if awaited and reload.finished:
+                return reload
+            if awaited and reload.status in ("idle", "stale") and on_idle is not None and kicked != reload.generation:
+                on_idle(name)
+                kicked = self.get(name).generation
+                continue
+            if generation is None and digest is None:
+                return reload
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            loop = asyncio.get_running_loop()
+            if self._changed is None or self._changed_loop is not loop:
+                self._changed, self._changed_loop = asyncio.Event(), loop
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
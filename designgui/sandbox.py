@@ -0,0 +1,261 @@
+"""
+Sandboxed View Execution
+"""
+import asyncio
+import hashlib
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from .api import execute_submission, failure_report
+
+try:
+    import resource
+except ImportError:  # Windows: only the wall-clock timeout applies
+    resource = None
+
+class SandboxResult:
+    """Outcome of one sandboxed dry run of a view version.
+    `report` is the worker's `execute_submission` report (stage, timings, element count), or a
+    failure report with stage "sandbox" when the worker had to be killed. `memo` holds the
+    @memoize results the dry run used, exported for `memo.store.load()`."""
+    def __init__(self, report: dict, elapsed: float = 0.0, memo: Sequence[bytes] = ()):
+        self.report = report
+        self.memo = memo
+        self.ok = report["ok"]
+        self.error = report["error"] or ""
+        self.traceback = report["traceback"] or ""
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"SandboxResult(ok={self.ok}, error={self.error!r}, elapsed={self.elapsed:.3f})"
+
+
+class _Worker:
+    def __init__(self, ctx, cpu_seconds: int, memory_mb: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, cpu_seconds, memory_mb),
+                                   name="designgui-sandbox", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.retired = False
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class SandboxPool:
+    """
+    Pool of worker processes that dry-run a view (module import plus `render_view` into a
+    throwaway client) before the preview executes it on the event loop.
+
+    Each worker runs under a CPU-time limit (RLIMIT_CPU) and an address-space cap on top of
+    its own baseline (RLIMIT_AS; Linux does not enforce RLIMIT_RSS). The parent adds a
+    wall-clock timeout for blocking calls. A worker that overruns or dies is killed and
+    replaced in the background, and the caller gets a failed `SandboxResult` to show.
+    Concurrent runs of the same file version share a single dry run. With `idle_timeout`, all
+    workers are stopped once no run arrived for that many seconds; the next run spawns them again.
+    """
+    def __init__(self, workers: int = 2, timeout: float = 5.0, cpu_seconds: int = 5, memory_mb: int = 512,
+                 idle_timeout: Optional[float] = None):
+        self.size = max(1, workers)
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._loop = None
+        self._inflight: Dict[Tuple[Path, str], asyncio.Future] = {}
+        self._closed = False
+        self._start_lock = threading.Lock()
+        self._busy = 0
+        self._idle_timer: Optional[asyncio.TimerHandle] = None
+
+    def start(self):
+        """Spawn every worker up front (blocking; each one imports NiceGUI once)."""
+        with self._start_lock:
+            self._workers = [w for w in self._workers if not w.retired and w.process.is_alive()]
+            while len(self._workers) < self.size:
+                self._workers.append(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.cpu_seconds, self.memory_mb)
+
+    async def run(self, path: Path, source: bytes, import_roots: Sequence[str] = (),
+                  purge_root: Optional[Path] = None) -> SandboxResult:
+        """Dry-run `source` (the content of `path`) in a worker and report whether it completed within limits."""
+        key = (Path(path), hashlib.sha256(source).hexdigest())
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(key, source, list(import_roots), purge_root))
+            self._inflight[key] = future
+        return await asyncio.shield(future)
+
+    async def _run(self, key, source: bytes, import_roots, purge_root) -> SandboxResult:
+        self._busy += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        try:
+            loop = asyncio.get_running_loop()
+            if self._loop is not loop:
+                # The idle queue (and any pending replacement) belongs to a single event loop
+                self._loop = loop
+                self._idle = asyncio.Queue()
+                await asyncio.to_thread(self.start)
+                for worker in self._workers:
+                    self._idle.put_nowait(worker)
+            worker = await self._idle.get()
+            job = (str(key[0]), source, import_roots, str(purge_root) if purge_root else None)
+            healthy = False
+            try:
+                result, healthy = await asyncio.to_thread(self._call, worker, job)
+            finally:
+                if healthy:
+                    self._idle.put_nowait(worker)
+                else:
+                    worker.retired = True
+                    self.restarts += 1
+                    asyncio.ensure_future(self._replace(worker))
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            self._busy -= 1
+            if not self._busy and self.idle_timeout is not None and not self._closed:
+                self._idle_timer = asyncio.get_running_loop().call_later(self.idle_timeout, self._stop_idle)
+
+    def _stop_idle(self):
+        """Stop every worker after `idle_timeout` without runs; the next run starts a fresh set."""
+        self._idle_timer = None
+        if self._busy or not self._workers:
+            return
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.retired = True
+        # Forget the idle queue so the next run spawns workers and rebuilds it
+        self._loop = None
+        asyncio.ensure_future(asyncio.to_thread(lambda: [worker.kill() for worker in workers]))
+
+    def _call(self, worker: _Worker, job) -> Tuple[SandboxResult, bool]:
+        started = time.perf_counter()
+        try:
+            worker.conn.send(job)
+            if not worker.conn.poll(self.timeout):
+                worker.kill()
+                return self._killed(f"View did not finish within the {self.timeout:g}s timeout; its worker was killed.", started)
+            report, healthy, memo = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(timeout=5)
+            if resource is not None and worker.process.exitcode == -signal.SIGXCPU:
+                reason = f"exceeded the {self.cpu_seconds}s CPU time limit"
+            elif worker.process.exitcode == -signal.SIGKILL:
+                reason = "was killed (likely out of memory)"
+            else:
+                reason = f"exited with code {worker.process.exitcode}"
+            return self._killed(f"View {reason}; its worker was recycled.", started)
+        return SandboxResult(report, time.perf_counter() - started, memo), healthy
+
+    @staticmethod
+    def _killed(error: str, started: float) -> Tuple[SandboxResult, bool]:
+        elapsed = time.perf_counter() - started
+        return SandboxResult(failure_report("sandbox", error, total_ms=round(elapsed * 1000, 3)), elapsed), False
+
+    async def _replace(self, worker: _Worker):
+        idle = self._idle
+        await asyncio.to_thread(worker.kill)
+        if self._closed:
+            return
+        fresh = await asyncio.to_thread(self._spawn)
+        self._workers = [w for w in self._workers if w is not worker] + [fresh]
+        idle.put_nowait(fresh)
+
+    def close(self):
+        self._closed = True
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        for worker in self._workers:
+            worker.kill()
+        self._workers = []
+
+
+def _apply_memory_limit(memory_mb: int):
+    if resource is None or not memory_mb:
+        return
+    try:
+        with open("/proc/self/statm") as statm:
+            baseline = int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        baseline = 0
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = baseline + memory_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _apply_cpu_limit(cpu_seconds: int):
+    """RLIMIT_CPU counts the process lifetime, so each job gets a budget on top of what was used so far."""
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = math.ceil(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _dry_run(path: str, source: bytes, import_roots, purge_root: Optional[str]) -> dict:
+    try:
+        return execute_submission(source.decode("utf-8"), Path(path).name, import_roots, filename=path)
+    finally:
+        # Product modules are re-imported fresh by the next job, like the preview does after a save
+        if purge_root:
+            for name, mod in list(sys.modules.items()):
+                if str(getattr(mod, '__file__', None) or '').startswith(purge_root):
+                    del sys.modules[name]
+
+
+def _worker_main(conn, cpu_seconds: int, memory_mb: int):
+    # Pay the heavy imports once, outside the per-job limits (ui_lib exports load lazily, so touch each)
+    from . import memo, ui_lib
+    for name in ui_lib.__all__:
+        getattr(ui_lib, name)
+
+    _apply_memory_limit(memory_mb)
+    while True:
+        try:
+            path, source, import_roots, purge_root = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        _apply_cpu_limit(cpu_seconds)
+        healthy = True
+        loaded = []
+        try:
+            with memo.store.journal() as keys:
+                report = _dry_run(path, source, import_roots, purge_root)
+            # Hand the loaded data to the preview, whose own render then hits the cache
+            loaded = memo.store.export(keys)
+        except MemoryError:
+            # The heap may be fragmented or half-initialised; let the pool recycle this worker
+            healthy = False
+            report = failure_report("sandbox", f"View exceeded the {memory_mb} MB memory limit.", traceback.format_exc())
+        except BaseException as e:
+            report = failure_report("exec", f"{type(e).__name__}: {e}", traceback.format_exc())
+        try:
+            conn.send((report, healthy, loaded))
+        except (OSError, ValueError):
+            return
@@ -1,46 +1,322 @@
 """
 Live Preview Engine
 """
-import importlib.util
+import asyncio
+import functools
+import gc
+import ipaddress
+import os
 import sys
-import inspect
+import time
 import traceback
 import json
 from pathlib import Path
-from nicegui import ui
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from typing import List, Optional
+from fastapi import Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from nicegui import ui, Client, background_tasks
 
-import time
 import secrets as _secrets
 from nicegui import app
 
-# Global singleton to prevent thread explosion per page load
-_observer_instance = None
+from .api import execute_submission, failure_report, valid_view_name
+from .check import check_views, discover_views
+from .daemon import HEALTH_ROUTE, health_report
+from .diagnostics import MemoryGuard
+from .headless import render_headless
+from .loader import BytecodeCache, ViewModuleCache
+from .memo import store as memo_store
+from .metrics import API_SUBMISSIONS, CONTENT_TYPE, REGISTRY, RENDER_ERRORS, RENDER_SECONDS, RENDERS, SAVE_TO_RENDER_SECONDS, register_gauge
+from .projects import MOUNT_PREFIX, Project, ProjectRegistry, valid_project_name
+from .reconcile import reconcile
+from .sandbox import SandboxPool
+from .tailwind import StyleSheet, element_classes
+from .watcher import DEFAULT_DEBOUNCE_MS
 
-def get_or_create_observer(views_dir_path):
-    global _observer_instance
-    if _observer_instance is None and Path(views_dir_path).exists():
-        
-        class GlobalHotReloadHandler(FileSystemEventHandler):
-            def on_modified(self, event):
-                if event.is_directory or not event.src_path.endswith('.py'):
-                    return
-                # Tell all connected clients via app storage that a refresh occurred
-                app.storage.general['last_modified'] = time.time()
-                
-            def on_created(self, event):
-                self.on_modified(event)
+# Project roots served by this process, each with its own watcher, reload hub, import graph, view index and reload generations
+projects = ProjectRegistry()
 
-            def on_deleted(self, event):
-                self.on_modified(event)
+# Executed view modules shared across clients and projects, keyed by file path and content hash
+view_cache = ViewModuleCache()
+
+# Worker processes that dry-run each view under CPU, memory and time limits ("sandbox" execution mode)
+sandbox_pool = None
+
+# Lazily started pool for /api/check when the preview itself runs inline; capped, and stopped
+# after a quiet spell so an occasional check does not keep one process per core alive
+check_pool = None
+CHECK_POOL_MAX_WORKERS = 4
+CHECK_POOL_IDLE_S = 60.0
+
+# RSS samples, tracemalloc growth sites (diagnostics mode) and the memory ceiling, served at /api/diagnostics/memory
+memory_guard = MemoryGuard()
+
+# Set once the memory ceiling was crossed: run_server re-executes the process after the server stopped
+_recycle_requested = False
+# Command line that starts this server again, captured by run_server; None if it cannot be told
+_restart_argv: Optional[List[str]] = None
+# Why a crossed ceiling did not recycle the process, for /api/diagnostics/memory
+_recycle_skipped: Optional[str] = None
+
+# Tailwind utilities compiled locally from scanned sources and rendered elements, served at STYLESHEET_ROUTE
+stylesheet = StyleSheet()
+STYLESHEET_ROUTE = '/designgui/tailwind.css'
+
+# Swap in a newer stylesheet without a flash: the old <link> is dropped once the new one has loaded
+_SWAP_STYLESHEET_JS = """(() => {
+  const links = document.querySelectorAll('link[data-designgui-tailwind]');
+  const link = links[links.length - 1].cloneNode();
+  link.href = %r;
+  link.onload = () => {
+    if (!link.isConnected) return;
+    for (const old of document.querySelectorAll('link[data-designgui-tailwind]')) { if (old === link) break; old.remove(); }
+  };
+  links[links.length - 1].after(link);
+})()"""
+
+# Project whose `product` package and sibling views currently own sys.modules and the front of sys.path
+_active_project = None
+
+
+def local_only(request: Request):
+    """Dependency of every agent endpoint: they execute, persist and mount code, so only loopback clients may call them."""
+    host = request.client.host if request.client else ""
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = host == "localhost"
+    if not loopback:
+        raise HTTPException(status_code=403, detail="The agent API only accepts requests from this machine.")
+
+
+def _purge_module(name: str, path: Path):
+    """Drop a product module from sys.modules (and its parent package attribute) so the next import re-executes it."""
+    module = sys.modules.get(name)
+    if module is None or Path(getattr(module, '__file__', None) or '') != path:
+        return
+    del sys.modules[name]
+    parent, _, child = name.rpartition('.')
+    if parent in sys.modules and getattr(sys.modules[parent], child, None) is module:
+        delattr(sys.modules[parent], child)
+
+
+def _activate(project: Project):
+    """Point `product.*` and bare sibling imports at `project` before any of its code executes.
+    Every mounted project ships its own `product` package, so switching projects evicts the previous
+    owner's product modules (they re-import on next use); consecutive renders of one project pay nothing."""
+    global _active_project
+    if _active_project is not project:
+        others = [p for p in projects.all() if p is not project]
+        if _active_project is not None and _active_project not in others:
+            others.append(_active_project)  # just unmounted
+        if others:
+            for name, module in list(sys.modules.items()):
+                # Executed view versions are owned by view_cache, which drops them from sys.modules itself
+                file = getattr(module, '__file__', None)
+                if file and not name.startswith('dynamic_view_') and any(other.owns(file) for other in others):
+                    del sys.modules[name]
+            for other in others:
+                for root in other.import_roots:
+                    while root in sys.path:
+                        sys.path.remove(root)
+        _active_project = project
+    roots = list(project.import_roots)
+    if sys.path[:len(roots)] != roots:
+        for root in roots:
+            while root in sys.path:
+                sys.path.remove(root)
+        sys.path[0:0] = roots
+
+
+def _invalidate_dependencies(project: Project, changed):
+    """Hub subscriber registered ahead of every client: update the import graph and purge stale modules."""
+    project.dependency_graph.refresh(changed)
+    for path in project.dependency_graph.dependents(changed):
+        for name in project.dependency_graph.module_names(path):
+            _purge_module(name, path)
+        # Unchanged views importing a changed module must still re-execute once
+        view_cache.invalidate(path)
+
+
+def _scan_styles(changed):
+    """Hub subscriber: pick up classes from saved sources before any client re-renders them."""
+    stylesheet.scan_files(path for path in changed if path.suffix == ".py")
+
+
+def _stylesheet_url() -> str:
+    return f"{STYLESHEET_ROUTE}?v={stylesheet.digest}"
+
+
+def _track_reloads(project: Project, changed):
+    """Hub subscriber: every view affected by a broadcast gets a new, stale generation. Clients showing
+    the view record its outcome from their own render; /api/reloads waiters validate the rest on demand."""
+    for name in project.dependency_graph.affected_views(changed):
+        entry = project.view_index.get(name)
+        project.reload_tracker.begin(name, entry.digest if entry else None)
 
-        _observer_instance = Observer()
-        # Schedule the singleton handler
-        _observer_instance.schedule(GlobalHotReloadHandler(), views_dir_path, recursive=False)
-        _observer_instance.start()
-        
-    return _observer_instance
+
+def _claim_reload(project: Project, name: str) -> Optional[int]:
+    """Let a client's render of `name` stand in for validating its newest, not yet rendered generation."""
+    reload = project.reload_tracker.get(name)
+    return reload.generation if project.reload_tracker.claim(name, reload.generation) else None
+
+
+def _start_validation(project: Project, name: str):
+    """`on_idle` of /api/reloads waiters: validate the current version of a view no client is rendering."""
+    tracker = project.reload_tracker
+    generation = tracker.get(name).generation
+    if tracker.get(name).status == "idle":
+        entry = project.view_index.get(name)
+        generation = tracker.begin(name, entry.digest if entry else None)
+    if tracker.claim(name, generation):
+        background_tasks.create(_validate_view(project, name, generation), name=f'designgui-validate-{project.name}-{name}')
+
+
+def _view_outcome(loaded, element_count: int = None, error: Exception = None, trace: str = None) -> dict:
+    """Reload outcome of one render of an executed view version, shaped like an /api/render report."""
+    if loaded.error is not None:
+        return failure_report("exec", f"{type(loaded.error).__name__}: {loaded.error}", loaded.traceback)
+    if loaded.render is None:
+        return failure_report("missing_render", "No render function found. Please define 'render_view()'.")
+    if error is not None:
+        return failure_report("render", f"{type(error).__name__}: {error}", trace)
+    outcome = failure_report(None, None)
+    outcome.update(ok=True, element_count=element_count, has_render_view=hasattr(loaded.module, "render_view"))
+    return outcome
+
+
+async def _validate_view(project: Project, name: str, generation: int):
+    """Render the view once without a browser, for a waiter asking about a version no client is showing.
+    In sandbox mode the worker's report is the outcome, so nothing runs on the event loop."""
+    path = project.views_dir / name
+    started = time.perf_counter()
+    try:
+        source = path.read_bytes()
+    except OSError:
+        project.reload_tracker.finish(name, generation, failure_report("deleted", f"{name} no longer exists."))
+        return
+    if sandbox_pool is not None:
+        result = await sandbox_pool.run(path, source, project.import_roots, project.product_dir)
+        project.reload_tracker.finish(name, generation, result.report)
+        return
+    _activate(project)
+    loaded = view_cache.acquire(path, owner=("reload-tracker", project.name, name), source=source)
+    if loaded.error is not None or loaded.render is None:
+        outcome = _view_outcome(loaded)
+    else:
+        try:
+            outcome = _view_outcome(loaded, element_count=render_headless(loaded.render).element_count)
+        except Exception as e:
+            outcome = _view_outcome(loaded, error=e, trace=traceback.format_exc())
+    outcome["timings_ms"]["total"] = round((time.perf_counter() - started) * 1000, 3)
+    project.reload_tracker.finish(name, generation, outcome)
+
+
+async def _render_submission(payload: dict, project: Project) -> dict:
+    """Run submitted view source through the same gates as a saved view and optionally persist it."""
+    name = payload.get("name", "submitted.py")
+    source = payload["source"]
+    if sandbox_pool is not None:
+        result = await sandbox_pool.run(project.views_dir / name, source.encode("utf-8"), project.import_roots,
+                                        project.product_dir)
+        if not result.ok:
+            return result.report
+    _activate(project)
+    report = execute_submission(source, name, project.import_roots, bytecode_cache=view_cache.bytecode_cache,
+                                with_html=bool(payload.get("html")))
+    if report["ok"] and payload.get("persist"):
+        # Atomic replace: the watcher sees one finished file and live clients reload it as usual
+        target = project.views_dir / name
+        tmp = target.with_name(f".{name}.tmp")
+        tmp.write_text(source, encoding="utf-8")
+        tmp.replace(target)
+        report["persisted"] = str(target.relative_to(project.root))
+    return report
+
+
+async def _watch_memory():
+    """Sample memory every interval off the event loop; recycle the server once the ceiling is crossed."""
+    memory_guard.start()
+    while True:
+        await asyncio.sleep(memory_guard.interval)
+        if await asyncio.get_running_loop().run_in_executor(None, memory_guard.sample):
+            _recycle(f"RSS exceeded the {memory_guard.ceiling_mb:g} MB memory ceiling")
+
+
+def _recycle(reason: str):
+    """Stop serving cleanly; run_server then replaces the process image (same PID, fresh heap)."""
+    global _recycle_requested, _recycle_skipped
+    if _restart_argv is None:
+        # Shutting down would leave nothing serving, so keep the process and say why
+        _recycle_skipped = (f"{reason}, but the server was not started from a command line it can repeat "
+                            "(use `designgui start` or `python -m designgui.cli start`)")
+        print(f"Not recycling the preview server: {_recycle_skipped}.", flush=True)
+        return
+    print(f"Recycling the preview server: {reason}.", flush=True)
+    _recycle_requested = True
+    app.shutdown()
+
+
+def _restart_command() -> Optional[List[str]]:
+    """The interpreter plus the module or script and arguments this process was started with,
+    or None when it was not started from a command line (e.g. an interactive session or `-c`)."""
+    main = sys.modules.get("__main__")
+    spec = getattr(main, "__spec__", None)
+    if spec is not None:
+        # `python -m ...`; zygote children run the CLI exactly like `python -m designgui.cli`
+        module = "designgui.cli" if spec.name == "designgui.zygote" else spec.name
+        return [sys.executable, "-m", module.rsplit(".__main__", 1)[0], *sys.argv[1:]]
+    script = sys.argv[0] if sys.argv else ""
+    if script and Path(script).is_file():
+        # A script or the `designgui` console-script wrapper, both runnable by this interpreter
+        return [sys.executable, script, *sys.argv[1:]]
+    return None
+
+
+def _memory_report(top: int = None) -> dict:
+    """The guard's report plus what usually leaks across reloads: module versions and elements per client."""
+    report = memory_guard.report(top)
+    versions = {}
+    for (path, _), owners in view_cache.live_versions().items():
+        view = versions.setdefault(str(path), {"versions": 0, "owners": 0})
+        view["versions"] += 1
+        view["owners"] += owners
+    report["view_versions"] = versions
+    report["lingering_versions"] = view_cache.lingering_versions()
+    report["recycle_skipped"] = _recycle_skipped
+    report["clients"] = [{"id": c.id, "path": c.page.path, "connected": c.has_socket_connection,
+                          "elements": len(c.elements)} for c in Client.instances.values()]
+    return report
+
+
+def mount_project(project: Project) -> Project:
+    """Register `project` and start serving it: index its views, subscribe its hub and start its watcher.
+    Safe to call while the server runs; the hub binds to the running loop if there is one."""
+    projects.add(project)
+    project.scan()
+    # Subscriber order matters: graph and index are current before any client re-renders
+    project.hub.subscribe(functools.partial(_invalidate_dependencies, project))
+    project.hub.subscribe(project.view_index.refresh)
+    project.hub.subscribe(functools.partial(_track_reloads, project))
+    project.hub.subscribe(_scan_styles)
+    # Seed the stylesheet like Tailwind's content scan of the product tree
+    stylesheet.scan_files(project.product_dir.rglob("*.py"))
+    try:
+        project.hub.bind_loop(asyncio.get_running_loop())
+    except RuntimeError:
+        pass  # mounted before startup; run_server binds every hub once the loop exists
+    project.start()
+    return project
+
+
+def unmount_project(name: str) -> Project:
+    """Stop watching a mounted project and drop its executed views; clients still showing it stop reloading."""
+    project = projects.remove(name)
+    project.stop()
+    for view in project.view_index.names():
+        view_cache.release(("reload-tracker", project.name, view))
+        view_cache.invalidate(project.views_dir / view)
+    return project
 
 
 def _get_storage_secret() -> str:
@@ -60,18 +336,12 @@ def _get_storage_secret() -> str:
         return _secrets.token_hex(32)
 
 
-def preview_environment(views_path: str = ".designgui/product/views"):
-    try:
-        config = json.loads(Path(".designgui/config.json").read_text())
-        locale = config.get("locale", "en-US")
-        font_family = config.get("font_family", "Inter, sans-serif")
-    except Exception:
-        locale = "en-US"
-        font_family = "Inter, sans-serif"
+def preview_environment(project: Project = None, render_mode: str = "reconcile"):
+    project = project or projects.default
+    locale, font_family = project.settings()
         
     # Global CSS injection for CJK and standard typographies
     ui.add_head_html(f'<style>body {{ font-family: {font_family}; }}</style>')
-    ui.add_head_html('<script src="https://cdn.tailwindcss.com"></script>')
     
     # RTL Parsing natively skipping Hebrew explicitly as requested
     rtl_locales = ["ar", "fa", "ur"]
@@ -82,10 +352,13 @@ def preview_environment(views_path: str = ".designgui/product/views"):
         ui.query('html').props('dir="ltr"')
         ui.query('body').classes('p-0 m-0 bg-gray-50 text-left')
     
+    client = ui.context.client
+    
     with ui.column().classes('w-full h-screen p-0 m-0'):
         # Header / Controls
         with ui.row().classes('w-full bg-white border-b border-gray-200 p-4 flex justify-between items-center shadow-sm z-10'):
-            ui.label('Nice Design OS - Live Preview').classes('text-lg font-bold text-gray-800')
+            ui.label('Nice Design OS - Live Preview' if project is projects.default
+                     else f'Nice Design OS - {project.name}').classes('text-lg font-bold text-gray-800')
             
             with ui.row().classes('gap-2 items-center'):
                 ui.label('View Source:').classes('text-sm text-gray-500 font-medium')
@@ -99,100 +372,391 @@ def preview_environment(views_path: str = ".designgui/product/views"):
         # Empty container waiting for AI code
         preview_pane = ui.column().classes('w-full h-full p-8 overflow-y-auto')
         
+        listed_version = None
+        
         def update_file_list():
-            views_dir = Path.cwd() / Path(views_path)
-            if views_dir.exists():
-                py_files = [f.name for f in views_dir.glob("*.py") if f.name != "__init__.py"]
-                view_select.options = py_files
-                view_select.update()
-                if py_files and view_select.value not in py_files:
-                    view_select.set_value(py_files[0])
-                    # set_value triggers on_change, which calls render_generated_view
+            nonlocal listed_version
+            # Only touch the dropdown when views were added or removed since this client last listed them
+            if listed_version == project.view_index.version:
+                return
+            listed_version = project.view_index.version
+            py_files = project.view_index.names()
+            view_select.options = py_files
+            view_select.update()
+            if py_files and view_select.value not in py_files:
+                view_select.set_value(py_files[0])
+                # set_value triggers on_change, which calls render_generated_view
                     
-        def render_generated_view(filename):
+        def show_error(filename, error_trace, summary, stage):
+            RENDER_ERRORS.inc(stage=stage)
+            preview_pane.clear()
+            with preview_pane:
+                ui.label("Error Rendering View:").classes('text-red-600 font-bold text-lg')
+                ui.code(error_trace).classes('w-full mt-2 whitespace-pre-wrap')
+            ui.notify(f"Error loading {filename}: {summary}", type="negative")
+        
+        render_generation = 0
+        styles_digest = None
+        
+        def sync_styles():
+            nonlocal styles_digest
+            # Catch classes built at runtime (f-strings, data-driven variants) that no source scan could see
+            stylesheet.add(element_classes(client.elements.values()))
+            if styles_digest is not None and styles_digest != stylesheet.digest:
+                styles_digest = stylesheet.digest
+                client.run_javascript(_SWAP_STYLESHEET_JS % _stylesheet_url())
+                    
+        def render_generated_view(filename, trigger="select", saved_at=None):
+            nonlocal render_generation
             if not filename:
                 return
+            RENDERS.inc(trigger=trigger)
+            render_generation += 1
+            generation = render_generation
             
-            module_path = Path.cwd() / Path(views_path) / filename
+            if projects.get(project.name) is not project:
+                ui.notify(f"Project {project.name} is no longer mounted.", type="warning")
+                return
+            module_path = project.views_dir / filename
             if not module_path.exists():
                 ui.notify(f"View file {filename} not found.")
                 return
-                
-            preview_pane.clear() # Clear old UI
             
-            try:
-                # Dynamically load the python file
-                module_name = f"dynamic_view_{filename[:-3]}"
-                
-                # Force strictly pure reload by purging stale references
-                if module_name in sys.modules:
-                    del sys.modules[module_name]
-                
-                # Make sure views_path is in sys.path for relative imports within the views
-                views_dir_str = str(Path.cwd() / Path(views_path))
-                if views_dir_str not in sys.path:
-                    sys.path.insert(0, views_dir_str)
-                    
-                spec = importlib.util.spec_from_file_location(module_name, str(module_path))
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[module_name] = module
-                spec.loader.exec_module(module)
-                
-                # Execute the default function or the view function
-                target_func = None
-                if hasattr(module, 'render_view'):
-                    target_func = getattr(module, 'render_view')
+            # This render is the reload outcome /api/reloads waiters get, so no second, headless one runs
+            tracked = _claim_reload(project, filename)
+            if sandbox_pool is None:
+                execute_view(filename, module_path, tracked=tracked)
+                observe_latency(saved_at)
+            else:
+                background_tasks.create(sandboxed_render(filename, module_path, project.import_roots, generation, saved_at,
+                                                         tracked), name='designgui-sandboxed-render')
+        
+        def observe_latency(saved_at):
+            if saved_at is not None:
+                SAVE_TO_RENDER_SECONDS.observe(time.monotonic() - saved_at)
+        
+        async def sandboxed_render(filename, module_path, import_roots, generation, saved_at, tracked=None):
+            with client:
+                # Prove the view terminates within limits in a worker before it runs on the event loop
+                try:
+                    source = module_path.read_bytes()
+                except OSError as e:
+                    ui.notify(f"Could not read {filename}: {e}", type="negative")
+                    report_reload(filename, tracked, failure_report("deleted", f"{filename} no longer exists."))
+                    return
+                result = await sandbox_pool.run(module_path, source, import_roots, module_path.parent.parent)
+                if (generation != render_generation or client.id not in Client.instances
+                        or projects.get(project.name) is not project):
+                    # Superseded by a newer save or selection (or unmounted) while the worker ran
+                    report_reload(filename, tracked, result.report)
+                    return
+                if result.ok or result.report["stage"] == "missing_render":
+                    # The worker's @memoize results make this second run skip the expensive loading;
+                    # a missing render_view is reported by execute_view with its own hint
+                    memo_store.load(result.memo)
+                    execute_view(filename, module_path, source, tracked=tracked)
                 else:
-                    for name, obj in inspect.getmembers(module, inspect.isfunction):
-                        if obj.__module__ == module_name:
-                            target_func = obj
-                            break
-                
-                if target_func:
-                    with preview_pane:
-                        target_func()
-                    ui.notify(f"Reloaded {filename} successfully.", type="positive")
+                    show_error(filename, result.traceback or result.error, result.error, stage="sandbox")
+                    report_reload(filename, tracked, result.report)
+                observe_latency(saved_at)
+        
+        def report_reload(filename, tracked, outcome):
+            if tracked is not None:
+                project.reload_tracker.finish(filename, tracked, outcome)
+        
+        def execute_view(filename, module_path, source=None, tracked=None):
+            # Sibling views and `product.*` must resolve inside this client's project
+            _activate(project)
+            # Each file version executes once per process; every client reuses the cached module
+            try:
+                loaded = view_cache.acquire(module_path, owner=client.id, source=source)
+            except OSError as e:
+                ui.notify(f"Could not read {filename}: {e}", type="negative")
+                report_reload(filename, tracked, failure_report("deleted", f"{filename} no longer exists."))
+                return
+            
+            if loaded.error is not None:
+                show_error(filename, loaded.traceback, str(loaded.error), stage="exec")
+                report_reload(filename, tracked, _view_outcome(loaded))
+                return
+            
+            if loaded.render is None:
+                RENDER_ERRORS.inc(stage="missing_render")
+                preview_pane.clear()
+                with preview_pane:
+                    ui.label(f"Could not find a render function in {filename}. Please define 'render_view()'.").classes('text-red-500 font-bold p-4 bg-red-50 rounded border border-red-200 w-full')
+                report_reload(filename, tracked, _view_outcome(loaded))
+                return
+            
+            started = time.perf_counter()
+            try:
+                if render_mode == "reconcile":
+                    # Diff against the mounted tree so only changed elements go over the websocket
+                    reconcile(preview_pane, loaded.render)
                 else:
+                    preview_pane.clear() # Clear old UI
                     with preview_pane:
-                        ui.label(f"Could not find a render function in {filename}. Please define 'render_view()'.").classes('text-red-500 font-bold p-4 bg-red-50 rounded border border-red-200 w-full')
-
+                        loaded.render()
+                RENDER_SECONDS.observe(time.perf_counter() - started)
+                outcome = _view_outcome(loaded, element_count=sum(1 for _ in preview_pane.descendants()))
+                outcome["timings_ms"]["total"] = round((time.perf_counter() - started) * 1000, 3)
+                sync_styles()
+                ui.notify(f"Reloaded {filename} successfully.", type="positive")
+                report_reload(filename, tracked, outcome)
             except Exception as e:
-                error_trace = traceback.format_exc()
-                with preview_pane:
-                    ui.label("Error Rendering View:").classes('text-red-600 font-bold text-lg')
-                    ui.code(error_trace).classes('w-full mt-2 whitespace-pre-wrap')
-                ui.notify(f"Error loading {filename}: {str(e)}", type="negative")
+                report_reload(filename, tracked, _view_outcome(loaded, error=e, trace=traceback.format_exc()))
+                show_error(filename, traceback.format_exc(), str(e), stage="render")
 
         # Initial population
         update_file_list()
         
-        # Track the last known modification timestamp locally per-client connection
-        # Initialize storage if it doesn't exist
-        if 'last_modified' not in app.storage.general:
-            app.storage.general['last_modified'] = 0.0
-            
-        client_last_seen = app.storage.general['last_modified']
+        # Linked last so the first paint already has every class of the initial render
+        sync_styles()
+        styles_digest = stylesheet.digest
+        ui.add_head_html(f'<link rel="stylesheet" href="{_stylesheet_url()}" data-designgui-tailwind>')
         
-        def check_for_updates():
-            nonlocal client_last_seen
-            current_mod = app.storage.general.get('last_modified', 0.0)
-            if current_mod > client_last_seen:
-                client_last_seen = current_mod
+        # Push-based reloads: the hub invokes this callback on the event loop right after a save
+        def on_reload(changed):
+            if client.id not in Client.instances:
+                # Client was pruned without a clean disconnect (e.g. it never opened a websocket)
+                on_disconnect()
+                return
+            with client:
                 update_file_list()
-                if view_select.value:
-                    render_generated_view(view_select.value)
+                # Only re-execute when the shown view transitively imports one of the changed files
+                if view_select.value and view_select.value in project.dependency_graph.affected_views(changed):
+                    render_generated_view(view_select.value, trigger="reload", saved_at=project.hub.batch_started)
                     
-        # Check every 500ms for updates within the correct client context boundary
-        ui.timer(0.5, check_for_updates)
+        def on_disconnect():
+            project.hub.unsubscribe(on_reload)
+            view_cache.release(client.id)
+            
+        project.hub.subscribe(on_reload)
+        client.on_disconnect(on_disconnect)
 
-def run_server(port: int = 8080, views_path: str = ".designgui/product/views"):
+def run_server(port: int = 8080, views_path: str = ".designgui/product/views", debounce_ms: int = DEFAULT_DEBOUNCE_MS,
+               render_mode: str = "reconcile", execution_mode: str = "inline", sandbox_limits: dict = None,
+               mounts: dict = None, memory_settings: dict = None, host: str = "127.0.0.1"):
+    """Serve the project in the working directory at "/" plus every `mounts` entry (name → project root)
+    under MOUNT_PREFIX; more projects can be mounted and unmounted at runtime through /api/projects.
+    Binds to loopback by default; the agent API refuses non-loopback clients even when `host` is public."""
+    started_at = time.time()
+    
+    # Compiled view bytecode survives daemon restarts in .designgui/cache/bytecode
+    view_cache.bytecode_cache = BytecodeCache(Path.cwd() / ".designgui" / "cache" / "bytecode")
+    
+    # Each project gets its own watchdog observer and hub, started once ahead of clients
+    # (per-file coalescing window applied to watchdog bursts before a reload is broadcast)
+    invalid = [name for name in (mounts or {}) if not valid_project_name(name)]
+    if invalid:
+        # Names become URL path segments, so refuse them before anything is mounted
+        raise ValueError(f"Invalid project name(s) {', '.join(map(repr, invalid))}: "
+                         "use only letters, digits, '-' and '_'.")
+    mount_project(Project("default", Path.cwd(), views_path, debounce_ms))
+    for name, root in (mounts or {}).items():
+        mount_project(Project(name, Path(root), debounce_ms=debounce_ms, prefix=f"{MOUNT_PREFIX}/{name}"))
+    # Seed the stylesheet like Tailwind's content scan: the UI library and this preview chrome
+    stylesheet.scan_files([Path(__file__), *Path(__file__).parent.joinpath("ui_lib").glob("*.py")])
+    
+    def bind_hubs():
+        for project in projects.all():
+            project.hub.bind_loop(asyncio.get_running_loop())
+    app.on_startup(bind_hubs)
+    
+    global memory_guard, _restart_argv
+    memory_guard = MemoryGuard(**(memory_settings or {}))
+    _restart_argv = _restart_command()
+    if memory_guard.ceiling_mb and _restart_argv is None:
+        print("The memory ceiling is set, but this process cannot be restarted from its command line; "
+              "crossing it will only be reported.", flush=True)
+    if memory_guard.tracing or memory_guard.ceiling_mb:
+        app.on_startup(lambda: background_tasks.create(_watch_memory(), name='designgui-memory-guard'))
+    
+    global sandbox_pool
+    if execution_mode == "sandbox":
+        sandbox_pool = SandboxPool(**(sandbox_limits or {}))
+        # Workers import NiceGUI in the background while the server finishes starting
+        app.on_startup(lambda: asyncio.get_running_loop().run_in_executor(None, sandbox_pool.start))
+        app.on_shutdown(sandbox_pool.close)
+    
+    register_gauge("designgui_connected_clients", "Preview clients with an open websocket.",
+                   lambda: sum(1 for c in Client.instances.values() if c.has_socket_connection))
+    register_gauge("designgui_live_elements", "UI elements currently held in memory across all clients.",
+                   lambda: sum(len(c.elements) for c in Client.instances.values()))
+    register_gauge("designgui_live_view_versions", "Executed view module versions still referenced or current.",
+                   lambda: len(view_cache.live_versions()))
+    register_gauge("designgui_mounted_projects", "Project roots served by this process.", lambda: len(projects))
+    register_gauge("designgui_lingering_view_versions", "Evicted view module versions still referenced from outside the cache.",
+                   lambda: len(view_cache.lingering_versions()))
+    
+    def unknown_project(name: str) -> JSONResponse:
+        return JSONResponse({"ok": False, "error": f"No project named {name!r} is mounted."}, status_code=404)
     
-    # Initialize Watchdog Singleton Thread once ahead of clients
-    views_dir_path = str(Path.cwd() / Path(views_path))
-    get_or_create_observer(views_dir_path)
+    @app.get(HEALTH_ROUTE)
+    def health_api():
+        """Readiness probe for `designgui daemon`, with uptime and resource usage of this process."""
+        return JSONResponse(health_report(started_at, port, views=sum(len(p.view_index) for p in projects.all()),
+                                          projects=len(projects),
+                                          clients=sum(1 for c in Client.instances.values() if c.has_socket_connection)))
+    
+    @app.get('/metrics')
+    def metrics():
+        return Response(REGISTRY.expose(), media_type=CONTENT_TYPE)
+    
+    @app.get(STYLESHEET_ROUTE)
+    def tailwind_css(request: Request, v: str = None):
+        """Locally compiled Tailwind CSS; immutable when requested by its content digest."""
+        css, digest = stylesheet.css, stylesheet.digest
+        headers = {"ETag": f'"{digest}"',
+                   "Cache-Control": "public, max-age=31536000, immutable" if v == digest else "no-cache"}
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(css, media_type="text/css", headers=headers)
+    
+    @app.get('/api/diagnostics/memory', dependencies=[Depends(local_only)])
+    async def memory_api(top: int = None, collect: bool = True):
+        """Fresh memory sample: RSS history, top allocation growth (diagnostics mode), view versions, elements per client."""
+        if collect:
+            gc.collect()  # so lingering versions are really held by something, not just awaiting collection
+        if await asyncio.get_running_loop().run_in_executor(None, memory_guard.sample):
+            _recycle(f"RSS exceeded the {memory_guard.ceiling_mb:g} MB memory ceiling")
+        return JSONResponse(_memory_report(top))
+    
+    @app.get('/api/projects', dependencies=[Depends(local_only)])
+    def projects_api():
+        """Every mounted project with its preview URL and view count."""
+        return JSONResponse({"projects": [p.to_dict() for p in projects.all()]})
+    
+    @app.post('/api/projects', dependencies=[Depends(local_only)])
+    async def mount_api(request: Request):
+        """Mount another project root at runtime; body: {"name": ..., "root": ..., "views": optional path}."""
+        try:
+            payload = await request.json()
+        except ValueError:
+            return JSONResponse({"ok": False, "error": "Request body must be JSON."}, status_code=400)
+        if not isinstance(payload, dict) or not valid_project_name(payload.get("name")):
+            return JSONResponse({"ok": False, "error": "Field 'name' must contain only letters, digits, '-' and '_'."},
+                                status_code=400)
+        if not isinstance(payload.get("root"), str) or not isinstance(payload.get("views", ""), str):
+            return JSONResponse({"ok": False, "error": "Field 'root' (string) is required."}, status_code=400)
+        if not (Path(payload["root"]) / ".designgui" / "config.json").is_file():
+            return JSONResponse({"ok": False, "error": f"{payload['root']} is not a DesignGUI project (no .designgui/config.json)."},
+                                status_code=400)
+        project = Project(payload["name"], Path(payload["root"]), payload.get("views"), debounce_ms,
+                          prefix=f"{MOUNT_PREFIX}/{payload['name']}")
+        if not project.views_dir.is_dir():
+            return JSONResponse({"ok": False, "error": f"Views directory {project.views_dir} does not exist."},
+                                status_code=400)
+        try:
+            mount_project(project)
+        except ValueError as e:
+            return JSONResponse({"ok": False, "error": str(e)}, status_code=409)
+        return JSONResponse({"ok": True, **project.to_dict()}, status_code=201)
+    
+    @app.delete('/api/projects/{name}', dependencies=[Depends(local_only)])
+    async def unmount_api(name: str):
+        """Unmount a project at runtime; its watcher stops and its executed views are released."""
+        if projects.get(name) is None:
+            return unknown_project(name)
+        try:
+            project = unmount_project(name)
+        except ValueError as e:
+            return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+        return JSONResponse({"ok": True, **project.to_dict()})
+    
+    # Every agent endpoint exists at /api/... for the default project and /p/<name>/api/... for mounted ones
+    def project_routes(method, path):
+        def register(handler):
+            method(path, dependencies=[Depends(local_only)])(handler)
+            method(f"{MOUNT_PREFIX}/{{project}}{path}", dependencies=[Depends(local_only)])(handler)
+            return handler
+        return register
+    
+    @project_routes(app.post, '/api/render')
+    async def render_api(request: Request, project: str = None):
+        """Execute view source in memory and answer with a JSON report in the same request (no file round-trip)."""
+        target = projects.get(project)
+        if target is None:
+            return unknown_project(project)
+        try:
+            payload = await request.json()
+        except ValueError:
+            return JSONResponse({"ok": False, "error": "Request body must be JSON."}, status_code=400)
+        if not isinstance(payload, dict) or not isinstance(payload.get("source"), str):
+            return JSONResponse({"ok": False, "error": "Field 'source' (string) is required."}, status_code=400)
+        if not valid_view_name(payload.get("name", "submitted.py")):
+            return JSONResponse({"ok": False, "error": "Field 'name' must look like 'my_view.py'."}, status_code=400)
+        if payload.get("persist") and "name" not in payload:
+            return JSONResponse({"ok": False, "error": "Field 'name' is required when 'persist' is true."}, status_code=400)
+        report = await _render_submission(payload, target)
+        API_SUBMISSIONS.inc(outcome="ok" if report["ok"] else "error")
+        return JSONResponse(report)
+    
+    @project_routes(app.get, '/api/reloads')
+    def reloads_api(project: str = None):
+        """Current reload generation and outcome of every view."""
+        target = projects.get(project)
+        if target is None:
+            return unknown_project(project)
+        return JSONResponse({name: target.reload_tracker.get(name).to_dict() for name in target.view_index.names()})
+    
+    @project_routes(app.get, '/api/reloads/{name}')
+    async def reload_wait_api(name: str, generation: int = None, hash: str = None, timeout: float = 30.0,
+                              project: str = None):
+        """Long-poll until `name` finished rendering `generation` (or later) or the version with content `hash`."""
+        target = projects.get(project)
+        if target is None:
+            return unknown_project(project)
+        # Unknown names are allowed: an agent may ask right after creating the file, before the watcher saw it
+        if not valid_view_name(name):
+            return JSONResponse({"error": f"Invalid view name {name!r}."}, status_code=404)
+        tracker = target.reload_tracker
+        reload = await tracker.wait(name, generation=generation, digest=hash, timeout=max(0.0, min(timeout, 300.0)),
+                                    on_idle=functools.partial(_start_validation, target))
+        if reload is None:
+            return JSONResponse({"timed_out": True, **tracker.get(name).to_dict()})
+        return JSONResponse({"timed_out": False, **reload.to_dict()})
+    
+    @project_routes(app.post, '/api/check')
+    async def check_api(request: Request, project: str = None):
+        """Validate many views in parallel across worker processes; body: {"views": [...]} or empty for all."""
+        global check_pool
+        target = projects.get(project)
+        if target is None:
+            return unknown_project(project)
+        try:
+            payload = await request.json() if await request.body() else {}
+        except ValueError:
+            return JSONResponse({"ok": False, "error": "Request body must be JSON."}, status_code=400)
+        names = payload.get("views") if isinstance(payload, dict) else None
+        if names is not None and (not isinstance(names, list)
+                                  or not all(isinstance(n, str) and valid_view_name(n if n.endswith(".py") else f"{n}.py") for n in names)):
+            return JSONResponse({"ok": False, "error": "Field 'views' must be a list of view names like 'dashboard.py'."}, status_code=400)
+        pool = sandbox_pool
+        if pool is None:
+            if check_pool is None:
+                check_pool = SandboxPool(**{**(sandbox_limits or {}), "workers": min(os.cpu_count() or 2, CHECK_POOL_MAX_WORKERS),
+                                            "idle_timeout": CHECK_POOL_IDLE_S})
+                app.on_shutdown(check_pool.close)
+            pool = check_pool
+        return JSONResponse(await check_views(discover_views(target.views_dir, names), target.views_dir, pool))
     
     @ui.page('/')
     def index():
-        preview_environment(views_path=views_path)
+        preview_environment(projects.default, render_mode=render_mode)
+    
+    @ui.page(f'{MOUNT_PREFIX}/{{project}}')
+    def mounted_index(project: str):
+        target = projects.get(project)
+        if target is None or target is projects.default:
+            raise HTTPException(status_code=404, detail=f"No project named {project!r} is mounted.")
+        preview_environment(target, render_mode=render_mode)
         
-    ui.run(title='Nice Design OS - Live Preview', port=port, reload=False, storage_secret=_get_storage_secret())
+    ui.run(title='Nice Design OS - Live Preview', host=host, port=port, reload=False, storage_secret=_get_storage_secret(),
+           tailwind=False)
+    
+    if _recycle_requested:
+        # Same PID and arguments, fresh heap: daemon.json stays valid and browsers reconnect on their own
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(_restart_argv[0], _restart_argv)
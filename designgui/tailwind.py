@@ -0,0 +1,733 @@
+"""
+Local Tailwind Stylesheet
+"""
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# --- Theme (Tailwind v3 defaults) ---
+
+_SHADES = ("50", "100", "200", "300", "400", "500", "600", "700", "800", "900", "950")
+_PALETTE = {
+    "slate": "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617",
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712",
+    "zinc": "fafafa f4f4f5 e4e4e7 d4d4d8 a1a1aa 71717a 52525b 3f3f46 27272a 18181b 09090b",
+    "neutral": "fafafa f5f5f5 e5e5e5 d4d4d4 a3a3a3 737373 525252 404040 262626 171717 0a0a0a",
+    "stone": "fafaf9 f5f5f4 e7e5e4 d6d3d1 a8a29e 78716c 57534e 44403c 292524 1c1917 0c0a09",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a",
+    "orange": "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407",
+    "amber": "fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f 451a03",
+    "yellow": "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12 422006",
+    "lime": "f7fee7 ecfccb d9f99d bef264 a3e635 84cc16 65a30d 4d7c0f 3f6212 365314 1a2e05",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16",
+    "emerald": "ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b 022c22",
+    "teal": "f0fdfa ccfbf1 99f6e4 5eead4 2dd4bf 14b8a6 0d9488 0f766e 115e59 134e4a 042f2e",
+    "cyan": "ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63 083344",
+    "sky": "f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e 082f49",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b",
+    "violet": "f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95 2e1065",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764",
+    "fuchsia": "fdf4ff fae8ff f5d0fe f0abfc e879f9 d946ef c026d3 a21caf 86198f 701a75 4a044e",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724",
+    "rose": "fff1f2 ffe4e6 fecdd3 fda4af fb7185 f43f5e e11d48 be123c 9f1239 881337 4c0519",
+}
+COLORS: Dict[str, str] = {f"{name}-{shade}": f"#{value}" for name, values in _PALETTE.items()
+                          for shade, value in zip(_SHADES, values.split())}
+COLORS.update({"black": "#000", "white": "#fff", "transparent": "transparent",
+               "current": "currentColor", "inherit": "inherit"})
+
+SPACING = {"0": "0px", "px": "1px", **{f"{n:g}": f"{n / 4:g}rem" for n in (
+    0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 5, 6, 7, 8, 9, 10, 11, 12, 14, 16, 20, 24, 28, 32, 36, 40, 44, 48, 52, 56, 60, 64,
+    72, 80, 96)}}
+
+SCREENS = {"sm": "640px", "md": "768px", "lg": "1024px", "xl": "1280px", "2xl": "1536px"}
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"), "5xl": ("3rem", "1"),
+    "6xl": ("3.75rem", "1"), "7xl": ("4.5rem", "1"), "8xl": ("6rem", "1"), "9xl": ("8rem", "1"),
+}
+FONT_WEIGHTS = {"thin": "100", "extralight": "200", "light": "300", "normal": "400", "medium": "500",
+                "semibold": "600", "bold": "700", "extrabold": "800", "black": "900"}
+FONT_FAMILIES = {
+    "sans": 'ui-sans-serif,system-ui,sans-serif,"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji"',
+    "serif": 'ui-serif,Georgia,Cambria,"Times New Roman",Times,serif',
+    "mono": 'ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace',
+}
+RADII = {"none": "0px", "sm": "0.125rem", "": "0.25rem", "md": "0.375rem", "lg": "0.5rem", "xl": "0.75rem",
+         "2xl": "1rem", "3xl": "1.5rem", "full": "9999px"}
+SHADOWS = {
+    "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "": "0 1px 3px 0 rgb(0 0 0 / 0.1),0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1),0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1),0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "xl": "0 20px 25px -5px rgb(0 0 0 / 0.1),0 8px 10px -6px rgb(0 0 0 / 0.1)",
+    "2xl": "0 25px 50px -12px rgb(0 0 0 / 0.25)",
+    "inner": "inset 0 2px 4px 0 rgb(0 0 0 / 0.05)",
+    "none": "0 0 #0000",
+}
+MAX_WIDTHS = {"none": "none", "xs": "20rem", "sm": "24rem", "md": "28rem", "lg": "32rem", "xl": "36rem",
+              "2xl": "42rem", "3xl": "48rem", "4xl": "56rem", "5xl": "64rem", "6xl": "72rem", "7xl": "80rem",
+              "prose": "65ch", **{f"screen-{k}": v for k, v in SCREENS.items()}}
+BLURS = {"none": "0", "sm": "4px", "": "8px", "md": "12px", "lg": "16px", "xl": "24px", "2xl": "40px", "3xl": "64px"}
+ANIMATIONS = {
+    "spin": ("spin 1s linear infinite", "@keyframes spin{to{transform:rotate(360deg)}}"),
+    "ping": ("ping 1s cubic-bezier(0,0,0.2,1) infinite", "@keyframes ping{75%,100%{transform:scale(2);opacity:0}}"),
+    "pulse": ("pulse 2s cubic-bezier(0.4,0,0.6,1) infinite", "@keyframes pulse{50%{opacity:.5}}"),
+    "bounce": ("bounce 1s infinite", "@keyframes bounce{0%,100%{transform:translateY(-25%);animation-timing-function:"
+               "cubic-bezier(0.8,0,1,1)}50%{transform:none;animation-timing-function:cubic-bezier(0,0,0.2,1)}}"),
+    "none": ("none", None),
+}
+
+_TRANSFORM = ("transform:translate(var(--tw-translate-x),var(--tw-translate-y)) rotate(var(--tw-rotate)) "
+              "scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))")
+_BOX_SHADOW = "box-shadow:var(--tw-ring-offset-shadow),var(--tw-ring-shadow),var(--tw-shadow)"
+_TIMING = "transition-timing-function:cubic-bezier(0.4,0,0.2,1);transition-duration:150ms"
+_CHILDREN = " > :not([hidden]) ~ :not([hidden])"
+
+# A condensed Tailwind preflight plus the per-element defaults the composable utilities rely on
+PREFLIGHT = """\
+*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb;\
+--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-scale-x:1;--tw-scale-y:1;\
+--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;--tw-ring-color:rgb(59 130 246 / 0.5);\
+--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000}
+::before,::after{--tw-content:''}
+html{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4}
+body{margin:0;line-height:inherit}
+hr{height:0;color:inherit;border-top-width:1px}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+code,kbd,samp,pre{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace;font-size:1em}
+table{text-indent:0;border-color:inherit;border-collapse:collapse}
+button,input,optgroup,select,textarea{font-family:inherit;font-size:100%;font-weight:inherit;line-height:inherit;color:inherit;margin:0;padding:0}
+button,select{text-transform:none}
+button,[type='button'],[type='reset'],[type='submit']{-webkit-appearance:button;background-color:transparent;background-image:none}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}
+fieldset{margin:0;padding:0}
+ol,ul,menu{list-style:none;margin:0;padding:0}
+textarea{resize:vertical}
+input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}
+button,[role="button"]{cursor:pointer}
+:disabled{cursor:default}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+[hidden]{display:none}
+"""
+
+# --- Value resolvers: return a CSS value, or None if the utility value does not apply ---
+
+
+_CLOSING = {"(": ")", "[": "]"}
+
+
+def _arbitrary(value: str) -> Optional[str]:
+    if len(value) > 2 and value[0] == "[" and value[-1] == "]" and _valid_arbitrary(value[1:-1]):
+        return value[1:-1].replace("_", " ")
+    return None
+
+
+def _valid_arbitrary(value: str) -> bool:
+    """
+    Like Tailwind, refuse values that could escape their declaration: `;`, `{` and `}` end it
+    (and would leak rules into every project's shared sheet), `<` could close the inline <style>
+    of a snapshot, a backslash could escape a quote, and brackets and quotes must be balanced.
+    """
+    expected, quote = [], None
+    for char in value:
+        if char in ";{}<\\":
+            return False
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in _CLOSING:
+            expected.append(_CLOSING[char])
+        elif char in ")]":
+            if not expected or expected.pop() != char:
+                return False
+    return quote is None and not expected
+
+
+def _fraction(value: str) -> Optional[str]:
+    top, _, bottom = value.partition("/")
+    if top.isdigit() and bottom.isdigit() and int(bottom):
+        return f"{int(top) / int(bottom) * 100:.6f}".rstrip("0").rstrip(".") + "%"
+    return None
+
+
+def _spacing(value: str) -> Optional[str]:
+    return SPACING.get(value) or _arbitrary(value)
+
+
+def _inset(value: str) -> Optional[str]:
+    return {"auto": "auto", "full": "100%"}.get(value) or _spacing(value) or _fraction(value)
+
+
+def _size(viewport: str) -> Callable[[str], Optional[str]]:
+    keywords = {"auto": "auto", "full": "100%", "screen": f"100{viewport}", "svh": "100svh", "lvh": "100lvh",
+                "dvh": "100dvh", "min": "min-content", "max": "max-content", "fit": "fit-content"}
+    return lambda value: keywords.get(value) or _spacing(value) or _fraction(value)
+
+
+def _max_width(value: str) -> Optional[str]:
+    return MAX_WIDTHS.get(value) or _size("vw")(value)
+
+
+def _number(*allowed: str, scale: float = 1, unit: str = "") -> Callable[[str], Optional[str]]:
+    def resolve(value: str) -> Optional[str]:
+        if value in allowed:
+            return f"{int(value) * scale:g}{unit}"
+        return _arbitrary(value)
+    return resolve
+
+
+def _color(value: str) -> Optional[str]:
+    value, _, alpha = value.partition("/")
+    color = COLORS.get(value) or _arbitrary(value)
+    if color is None or not alpha:
+        return color
+    opacity = _arbitrary(alpha) or (f"{int(alpha) / 100:g}" if alpha.isdigit() else None)
+    hex_digits = color[1:] if color.startswith("#") else ""
+    if opacity is None or len(hex_digits) not in (3, 6) or not all(c in "0123456789abcdefABCDEF" for c in hex_digits):
+        return None
+    if len(hex_digits) == 3:
+        hex_digits = "".join(c * 2 for c in hex_digits)
+    r, g, b = (int(hex_digits[i:i + 2], 16) for i in (0, 2, 4))
+    return f"rgb({r} {g} {b} / {opacity})"
+
+
+def _looks_like_color(value: str) -> bool:
+    return value.startswith(("#", "rgb", "hsl")) or value in ("transparent", "currentColor")
+
+
+def _negate(value: str) -> str:
+    if value in ("0", "0px", "auto"):
+        return value
+    if re.fullmatch(r"[\d.]+[a-z%]*", value):
+        return f"-{value}"
+    return f"calc({value} * -1)"
+
+
+# --- Utility table: registration order is the cascade order of the generated rules ---
+
+class _Css(NamedTuple):
+    """
+    Declarations of a utility, plus a selector suffix (e.g. for `space-x-*`), keyframes it needs and
+    a per-screen template (`container`: one `min-width` media query per breakpoint, `{}` = its width).
+    """
+    declarations: str
+    suffix: str = ""
+    keyframes: Optional[str] = None
+    per_screen: Optional[str] = None
+
+
+class _Utility(NamedTuple):
+    order: int
+    handler: Callable[[str], Union[str, _Css, None]]
+    negatable: bool
+
+
+_STATIC: Dict[str, Tuple[int, Union[str, _Css]]] = {}
+_DYNAMIC: Dict[str, List[_Utility]] = {}
+_order = 0
+
+
+def _static(**rules: Union[str, _Css]):
+    """Fixed utilities; keyword names use `_` for `-` (e.g. `inline_flex`)."""
+    global _order
+    for name, declarations in rules.items():
+        _order += 1
+        _STATIC[name.replace("_", "-")] = (_order, declarations)
+
+
+def _dynamic(prefix: str, resolve: Callable[[str], Optional[str]], template: str, negatable: bool = False):
+    """`<prefix>-<value>` utilities; `{}` in the template receives the resolved value."""
+    def handler(value: str) -> Optional[str]:
+        resolved = resolve(value)
+        return None if resolved is None else template.replace("{}", resolved)
+    _custom(prefix, handler, negatable)
+
+
+def _custom(prefix: str, handler: Callable[[str], Union[str, _Css, None]], negatable: bool = False):
+    """`<prefix>-<value>` utilities whose handler builds the declarations (or a `_Css`) itself."""
+    global _order
+    _order += 1
+    _DYNAMIC.setdefault(prefix, []).append(_Utility(_order, handler, negatable))
+
+
+_static(container=_Css("width:100%", per_screen="max-width:{}"))
+_static(sr_only="position:absolute;width:1px;height:1px;padding:0;margin:-1px;overflow:hidden;"
+                "clip:rect(0,0,0,0);white-space:nowrap;border-width:0",
+        not_sr_only="position:static;width:auto;height:auto;padding:0;margin:0;overflow:visible;"
+                    "clip:auto;white-space:normal")
+_static(pointer_events_none="pointer-events:none", pointer_events_auto="pointer-events:auto",
+        visible="visibility:visible", invisible="visibility:hidden", collapse="visibility:collapse")
+_static(static="position:static", fixed="position:fixed", absolute="position:absolute",
+        relative="position:relative", sticky="position:sticky")
+_dynamic("inset", _inset, "inset:{}", negatable=True)
+_dynamic("inset-x", _inset, "left:{};right:{}", negatable=True)
+_dynamic("inset-y", _inset, "top:{};bottom:{}", negatable=True)
+for _side in ("top", "right", "bottom", "left", "start", "end"):
+    _dynamic(_side, _inset, f"{'inset-inline-' + _side if _side in ('start', 'end') else _side}:{{}}", negatable=True)
+_static(isolate="isolation:isolate")
+_dynamic("z", lambda v: "auto" if v == "auto" else _number("0", "10", "20", "30", "40", "50")(v), "z-index:{}", negatable=True)
+_dynamic("order", lambda v: {"first": "-9999", "last": "9999", "none": "0"}.get(v)
+         or _number(*map(str, range(1, 13)))(v), "order:{}", negatable=True)
+_dynamic("col", lambda v: "auto" if v == "auto" else _arbitrary(v), "grid-column:{}")
+_dynamic("col-span", lambda v: "1 / -1" if v == "full" else
+         (f"span {v} / span {v}" if v.isdigit() else _arbitrary(v)), "grid-column:{}")
+_dynamic("col-start", lambda v: v if v.isdigit() or v == "auto" else None, "grid-column-start:{}")
+_dynamic("col-end", lambda v: v if v.isdigit() or v == "auto" else None, "grid-column-end:{}")
+_dynamic("row-span", lambda v: "1 / -1" if v == "full" else
+         (f"span {v} / span {v}" if v.isdigit() else _arbitrary(v)), "grid-row:{}")
+_dynamic("row-start", lambda v: v if v.isdigit() or v == "auto" else None, "grid-row-start:{}")
+_dynamic("row-end", lambda v: v if v.isdigit() or v == "auto" else None, "grid-row-end:{}")
+_static(mx_auto="margin-left:auto;margin-right:auto")
+_dynamic("m", lambda v: "auto" if v == "auto" else _spacing(v), "margin:{}", negatable=True)
+_dynamic("mx", lambda v: "auto" if v == "auto" else _spacing(v), "margin-left:{};margin-right:{}", negatable=True)
+_dynamic("my", lambda v: "auto" if v == "auto" else _spacing(v), "margin-top:{};margin-bottom:{}", negatable=True)
+for _short, _prop in (("s", "inline-start"), ("e", "inline-end"), ("t", "top"), ("r", "right"),
+                      ("b", "bottom"), ("l", "left")):
+    _dynamic(f"m{_short}", lambda v: "auto" if v == "auto" else _spacing(v), f"margin-{_prop}:{{}}", negatable=True)
+_static(box_border="box-sizing:border-box", box_content="box-sizing:content-box")
+_dynamic("line-clamp", lambda v: v if v.isdigit() else None,
+         "overflow:hidden;display:-webkit-box;-webkit-box-orient:vertical;-webkit-line-clamp:{}")
+_static(block="display:block", inline_block="display:inline-block", inline="display:inline", flex="display:flex",
+        inline_flex="display:inline-flex", table="display:table", inline_table="display:inline-table",
+        table_caption="display:table-caption", table_cell="display:table-cell",
+        table_column="display:table-column", table_row="display:table-row", flow_root="display:flow-root",
+        grid="display:grid", inline_grid="display:inline-grid", contents="display:contents",
+        list_item="display:list-item", hidden="display:none")
+_dynamic("aspect", lambda v: {"auto": "auto", "square": "1 / 1", "video": "16 / 9"}.get(v) or _arbitrary(v),
+         "aspect-ratio:{}")
+_dynamic("size", _size("vw"), "width:{};height:{}")
+_dynamic("h", _size("vh"), "height:{}")
+_dynamic("max-h", lambda v: "none" if v == "none" else _size("vh")(v), "max-height:{}")
+_dynamic("min-h", _size("vh"), "min-height:{}")
+_dynamic("w", _size("vw"), "width:{}")
+_dynamic("min-w", _size("vw"), "min-width:{}")
+_dynamic("max-w", _max_width, "max-width:{}")
+_dynamic("flex", lambda v: {"1": "1 1 0%", "auto": "1 1 auto", "initial": "0 1 auto", "none": "none"}.get(v)
+         or _arbitrary(v), "flex:{}")
+_static(shrink="flex-shrink:1", shrink_0="flex-shrink:0", flex_shrink="flex-shrink:1", flex_shrink_0="flex-shrink:0",
+        grow="flex-grow:1", grow_0="flex-grow:0", flex_grow="flex-grow:1", flex_grow_0="flex-grow:0")
+_dynamic("basis", _size("vw"), "flex-basis:{}")
+_static(table_auto="table-layout:auto", table_fixed="table-layout:fixed",
+        border_collapse="border-collapse:collapse", border_separate="border-collapse:separate")
+_dynamic("translate-x", lambda v: _size("vw")(v) if v not in ("auto", "screen") else None,
+         f"--tw-translate-x:{{}};{_TRANSFORM}", negatable=True)
+_dynamic("translate-y", lambda v: _size("vh")(v) if v not in ("auto", "screen") else None,
+         f"--tw-translate-y:{{}};{_TRANSFORM}", negatable=True)
+_dynamic("rotate", _number("0", "1", "2", "3", "6", "12", "45", "90", "180", unit="deg"),
+         f"--tw-rotate:{{}};{_TRANSFORM}", negatable=True)
+_SCALES = ("0", "50", "75", "90", "95", "100", "105", "110", "125", "150")
+_dynamic("scale", _number(*_SCALES, scale=0.01), f"--tw-scale-x:{{}};--tw-scale-y:{{}};{_TRANSFORM}", negatable=True)
+_dynamic("scale-x", _number(*_SCALES, scale=0.01), f"--tw-scale-x:{{}};{_TRANSFORM}", negatable=True)
+_dynamic("scale-y", _number(*_SCALES, scale=0.01), f"--tw-scale-y:{{}};{_TRANSFORM}", negatable=True)
+_static(transform=_TRANSFORM, transform_none="transform:none")
+_custom("animate", lambda v: v in ANIMATIONS and _Css(f"animation:{ANIMATIONS[v][0]}", keyframes=ANIMATIONS[v][1]))
+_static(cursor_auto="cursor:auto", cursor_default="cursor:default", cursor_pointer="cursor:pointer",
+        cursor_wait="cursor:wait", cursor_text="cursor:text", cursor_move="cursor:move", cursor_help="cursor:help",
+        cursor_not_allowed="cursor:not-allowed", cursor_none="cursor:none", cursor_grab="cursor:grab",
+        cursor_grabbing="cursor:grabbing")
+_static(select_none="user-select:none", select_text="user-select:text", select_all="user-select:all",
+        select_auto="user-select:auto", resize_none="resize:none", resize_y="resize:vertical",
+        resize_x="resize:horizontal", resize="resize:both")
+_static(list_inside="list-style-position:inside", list_outside="list-style-position:outside",
+        list_none="list-style-type:none", list_disc="list-style-type:disc", list_decimal="list-style-type:decimal",
+        appearance_none="appearance:none")
+_dynamic("grid-cols", lambda v: f"repeat({v},minmax(0,1fr))" if v.isdigit() else
+         ({"none": "none", "subgrid": "subgrid"}.get(v) or _arbitrary(v)), "grid-template-columns:{}")
+_dynamic("grid-rows", lambda v: f"repeat({v},minmax(0,1fr))" if v.isdigit() else
+         ({"none": "none", "subgrid": "subgrid"}.get(v) or _arbitrary(v)), "grid-template-rows:{}")
+_static(flex_row="flex-direction:row", flex_row_reverse="flex-direction:row-reverse", flex_col="flex-direction:column",
+        flex_col_reverse="flex-direction:column-reverse", flex_wrap="flex-wrap:wrap",
+        flex_wrap_reverse="flex-wrap:wrap-reverse", flex_nowrap="flex-wrap:nowrap")
+_static(place_content_center="place-content:center", place_items_center="place-items:center",
+        content_center="align-content:center", content_start="align-content:flex-start",
+        content_end="align-content:flex-end", content_between="align-content:space-between",
+        items_start="align-items:flex-start", items_end="align-items:flex-end", items_center="align-items:center",
+        items_baseline="align-items:baseline", items_stretch="align-items:stretch",
+        justify_normal="justify-content:normal", justify_start="justify-content:flex-start",
+        justify_end="justify-content:flex-end", justify_center="justify-content:center",
+        justify_between="justify-content:space-between", justify_around="justify-content:space-around",
+        justify_evenly="justify-content:space-evenly", justify_stretch="justify-content:stretch",
+        justify_items_start="justify-items:start", justify_items_end="justify-items:end",
+        justify_items_center="justify-items:center", justify_items_stretch="justify-items:stretch")
+_dynamic("gap", _spacing, "gap:{}")
+_dynamic("gap-x", _spacing, "column-gap:{}")
+_dynamic("gap-y", _spacing, "row-gap:{}")
+_custom("space-x", lambda v: _spacing(v) and _Css(f"margin-left:{_spacing(v)}", _CHILDREN), negatable=True)
+_custom("space-y", lambda v: _spacing(v) and _Css(f"margin-top:{_spacing(v)}", _CHILDREN), negatable=True)
+_static(divide_x=_Css("border-left-width:1px;border-right-width:0", _CHILDREN),
+        divide_y=_Css("border-top-width:1px;border-bottom-width:0", _CHILDREN))
+_custom("divide-x", lambda v: v in ("0", "2", "4", "8") and _Css(f"border-left-width:{v}px;border-right-width:0", _CHILDREN))
+_custom("divide-y", lambda v: v in ("0", "2", "4", "8") and _Css(f"border-top-width:{v}px;border-bottom-width:0", _CHILDREN))
+_custom("divide", lambda v: _color(v) and _Css(f"border-color:{_color(v)}", _CHILDREN))
+_static(self_auto="align-self:auto", self_start="align-self:flex-start", self_end="align-self:flex-end",
+        self_center="align-self:center", self_stretch="align-self:stretch", self_baseline="align-self:baseline",
+        justify_self_start="justify-self:start", justify_self_end="justify-self:end",
+        justify_self_center="justify-self:center", justify_self_stretch="justify-self:stretch")
+for _axis in ("", "-x", "-y"):
+    _static(**{f"overflow{_axis.replace('-', '_')}_{mode}": f"overflow{_axis}:{mode}"
+               for mode in ("auto", "hidden", "clip", "visible", "scroll")})
+_static(truncate="overflow:hidden;text-overflow:ellipsis;white-space:nowrap",
+        text_ellipsis="text-overflow:ellipsis", text_clip="text-overflow:clip")
+_static(whitespace_normal="white-space:normal", whitespace_nowrap="white-space:nowrap", whitespace_pre="white-space:pre",
+        whitespace_pre_line="white-space:pre-line", whitespace_pre_wrap="white-space:pre-wrap",
+        whitespace_break_spaces="white-space:break-spaces", text_wrap="text-wrap:wrap", text_nowrap="text-wrap:nowrap",
+        text_balance="text-wrap:balance", text_pretty="text-wrap:pretty",
+        break_normal="overflow-wrap:normal;word-break:normal", break_words="overflow-wrap:break-word",
+        break_all="word-break:break-all")
+_dynamic("rounded", lambda v: RADII.get(v) or _arbitrary(v), "border-radius:{}")
+_static(rounded=f"border-radius:{RADII['']}")
+for _side, _corners in (("s", ("start-start", "end-start")), ("e", ("start-end", "end-end")),
+                        ("t", ("top-left", "top-right")), ("r", ("top-right", "bottom-right")),
+                        ("b", ("bottom-right", "bottom-left")), ("l", ("top-left", "bottom-left"))):
+    _static(**{f"rounded_{_side}": ";".join(f"border-{c}-radius:{RADII['']}" for c in _corners)})
+    _dynamic(f"rounded-{_side}", lambda v: RADII.get(v) or _arbitrary(v),
+             ";".join(f"border-{c}-radius:{{}}" for c in _corners))
+for _corner, _prop in (("tl", "top-left"), ("tr", "top-right"), ("br", "bottom-right"), ("bl", "bottom-left")):
+    _static(**{f"rounded_{_corner}": f"border-{_prop}-radius:{RADII['']}"})
+    _dynamic(f"rounded-{_corner}", lambda v: RADII.get(v) or _arbitrary(v), f"border-{_prop}-radius:{{}}")
+_BORDER_WIDTH = lambda v: f"{v}px" if v in ("0", "2", "4", "8") else (  # noqa: E731
+    None if _arbitrary(v) is None or _looks_like_color(_arbitrary(v)) else _arbitrary(v))
+_static(border="border-width:1px")
+_dynamic("border", _BORDER_WIDTH, "border-width:{}")
+for _side, _props in (("x", ("left", "right")), ("y", ("top", "bottom")), ("s", ("inline-start",)),
+                      ("e", ("inline-end",)), ("t", ("top",)), ("r", ("right",)), ("b", ("bottom",)), ("l", ("left",))):
+    _static(**{f"border_{_side}": ";".join(f"border-{p}-width:1px" for p in _props)})
+    _dynamic(f"border-{_side}", _BORDER_WIDTH, ";".join(f"border-{p}-width:{{}}" for p in _props))
+_static(border_solid="border-style:solid", border_dashed="border-style:dashed", border_dotted="border-style:dotted",
+        border_double="border-style:double", border_hidden="border-style:hidden", border_none="border-style:none")
+_dynamic("border", _color, "border-color:{}")
+for _side, _props in (("x", ("left", "right")), ("y", ("top", "bottom")), ("t", ("top",)), ("r", ("right",)),
+                      ("b", ("bottom",)), ("l", ("left",))):
+    _dynamic(f"border-{_side}", _color, ";".join(f"border-{p}-color:{{}}" for p in _props))
+_dynamic("bg", lambda v: None if (_arbitrary(v) or "").startswith(("url(", "linear-gradient", "radial-gradient"))
+         else _color(v), "background-color:{}")
+_static(bg_none="background-image:none")
+_dynamic("bg-gradient-to", lambda v: {"t": "top", "tr": "top right", "r": "right", "br": "bottom right", "b": "bottom",
+                                      "bl": "bottom left", "l": "left", "tl": "top left"}.get(v),
+         "background-image:linear-gradient(to {},var(--tw-gradient-stops))")
+_dynamic("bg", lambda v: _arbitrary(v) if (_arbitrary(v) or "").startswith(("url(", "linear-gradient", "radial-gradient"))
+         else None, "background-image:{}")
+_dynamic("from", _color, "--tw-gradient-from:{};--tw-gradient-to:transparent;"
+         "--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to)")
+_dynamic("via", _color, "--tw-gradient-to:transparent;--tw-gradient-stops:var(--tw-gradient-from),{},var(--tw-gradient-to)")
+_dynamic("to", _color, "--tw-gradient-to:{}")
+_static(bg_cover="background-size:cover", bg_contain="background-size:contain", bg_auto="background-size:auto",
+        bg_center="background-position:center", bg_top="background-position:top", bg_bottom="background-position:bottom",
+        bg_no_repeat="background-repeat:no-repeat", bg_repeat="background-repeat:repeat",
+        bg_fixed="background-attachment:fixed")
+_static(fill_current="fill:currentColor", stroke_current="stroke:currentColor")
+_static(object_contain="object-fit:contain", object_cover="object-fit:cover", object_fill="object-fit:fill",
+        object_none="object-fit:none", object_scale_down="object-fit:scale-down", object_center="object-position:center")
+_dynamic("p", _spacing, "padding:{}")
+_dynamic("px", _spacing, "padding-left:{};padding-right:{}")
+_dynamic("py", _spacing, "padding-top:{};padding-bottom:{}")
+for _short, _prop in (("s", "inline-start"), ("e", "inline-end"), ("t", "top"), ("r", "right"),
+                      ("b", "bottom"), ("l", "left")):
+    _dynamic(f"p{_short}", _spacing, f"padding-{_prop}:{{}}")
+_static(text_left="text-align:left", text_center="text-align:center", text_right="text-align:right",
+        text_justify="text-align:justify", text_start="text-align:start", text_end="text-align:end")
+_static(align_baseline="vertical-align:baseline", align_top="vertical-align:top", align_middle="vertical-align:middle",
+        align_bottom="vertical-align:bottom", align_text_top="vertical-align:text-top",
+        align_text_bottom="vertical-align:text-bottom")
+_dynamic("font", lambda v: FONT_FAMILIES.get(v), "font-family:{}")
+_custom("text", lambda v: (f"font-size:{FONT_SIZES[v][0]};line-height:{FONT_SIZES[v][1]}" if v in FONT_SIZES else
+                           (None if _arbitrary(v) is None or _looks_like_color(_arbitrary(v))
+                            else f"font-size:{_arbitrary(v)}")))
+_dynamic("font", lambda v: FONT_WEIGHTS.get(v) or (None if _arbitrary(v) is None or not _arbitrary(v).isdigit()
+                                                    else _arbitrary(v)), "font-weight:{}")
+_static(uppercase="text-transform:uppercase", lowercase="text-transform:lowercase",
+        capitalize="text-transform:capitalize", normal_case="text-transform:none",
+        italic="font-style:italic", not_italic="font-style:normal", tabular_nums="font-variant-numeric:tabular-nums")
+_dynamic("leading", lambda v: {"none": "1", "tight": "1.25", "snug": "1.375", "normal": "1.5", "relaxed": "1.625",
+                               "loose": "2"}.get(v) or (_spacing(v) if v.isdigit() else _arbitrary(v)), "line-height:{}")
+_dynamic("tracking", lambda v: {"tighter": "-0.05em", "tight": "-0.025em", "normal": "0em", "wide": "0.025em",
+                                "wider": "0.05em", "widest": "0.1em"}.get(v) or _arbitrary(v), "letter-spacing:{}")
+_dynamic("text", _color, "color:{}")
+_static(underline="text-decoration-line:underline", overline="text-decoration-line:overline",
+        line_through="text-decoration-line:line-through", no_underline="text-decoration-line:none")
+_dynamic("decoration", _color, "text-decoration-color:{}")
+_dynamic("underline-offset", lambda v: f"{v}px" if v in ("0", "1", "2", "4", "8") else None,
+         "text-underline-offset:{}")
+_static(antialiased="-webkit-font-smoothing:antialiased;-moz-osx-font-smoothing:grayscale",
+        subpixel_antialiased="-webkit-font-smoothing:auto;-moz-osx-font-smoothing:auto")
+_dynamic("placeholder", _color, "color:{}")
+_dynamic("accent", _color, "accent-color:{}")
+_dynamic("caret", _color, "caret-color:{}")
+_dynamic("opacity", lambda v: _number(*map(str, range(0, 101, 5)), scale=0.01)(v), "opacity:{}")
+_static(shadow=f"--tw-shadow:{SHADOWS['']};{_BOX_SHADOW}")
+_dynamic("shadow", lambda v: SHADOWS.get(v) if v else None, f"--tw-shadow:{{}};{_BOX_SHADOW}")
+_static(outline_none="outline:2px solid transparent;outline-offset:2px", outline="outline-style:solid",
+        outline_dashed="outline-style:dashed", outline_dotted="outline-style:dotted")
+_dynamic("outline", lambda v: f"{v}px" if v in ("0", "1", "2", "4", "8") else None, "outline-width:{}")
+_dynamic("outline", _color, "outline-color:{}")
+_dynamic("outline-offset", lambda v: f"{v}px" if v in ("0", "1", "2", "4", "8") else None, "outline-offset:{}")
+_RING = ("--tw-ring-offset-shadow:0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color);"
+         "--tw-ring-shadow:0 0 0 calc({} + var(--tw-ring-offset-width)) var(--tw-ring-color);" + _BOX_SHADOW)
+_static(ring=_RING.replace("{}", "3px"), ring_inset="--tw-ring-inset:inset")
+_dynamic("ring", lambda v: f"{v}px" if v in ("0", "1", "2", "4", "8") else None, _RING)
+_dynamic("ring", _color, "--tw-ring-color:{}")
+_dynamic("ring-offset", lambda v: f"{v}px" if v in ("0", "1", "2", "4", "8") else None, "--tw-ring-offset-width:{}")
+_dynamic("ring-offset", _color, "--tw-ring-offset-color:{}")
+_static(blur=f"filter:blur({BLURS['']})", grayscale="filter:grayscale(100%)", grayscale_0="filter:grayscale(0)")
+_dynamic("blur", lambda v: BLURS.get(v) if v else None, "filter:blur({})")
+_static(backdrop_blur=f"backdrop-filter:blur({BLURS['']})")
+_dynamic("backdrop-blur", lambda v: BLURS.get(v) if v else None, "backdrop-filter:blur({})")
+_static(transition="transition-property:color,background-color,border-color,text-decoration-color,fill,stroke,opacity,"
+                   f"box-shadow,transform,filter,backdrop-filter;{_TIMING}",
+        transition_none="transition-property:none", transition_all=f"transition-property:all;{_TIMING}",
+        transition_colors="transition-property:color,background-color,border-color,text-decoration-color,fill,stroke;"
+                          f"{_TIMING}",
+        transition_opacity=f"transition-property:opacity;{_TIMING}",
+        transition_shadow=f"transition-property:box-shadow;{_TIMING}",
+        transition_transform=f"transition-property:transform;{_TIMING}")
+_DURATIONS = ("0", "75", "100", "150", "200", "300", "500", "700", "1000")
+_dynamic("delay", _number(*_DURATIONS, unit="ms"), "transition-delay:{}")
+_dynamic("duration", _number(*_DURATIONS, unit="ms"), "transition-duration:{}")
+_static(ease_linear="transition-timing-function:linear", ease_in="transition-timing-function:cubic-bezier(0.4,0,1,1)",
+        ease_out="transition-timing-function:cubic-bezier(0,0,0.2,1)",
+        ease_in_out="transition-timing-function:cubic-bezier(0.4,0,0.2,1)")
+_dynamic("content", lambda v: "none" if v == "none" else _arbitrary(v), "--tw-content:{};content:var(--tw-content)")
+
+# --- Variants ---
+
+_PSEUDO_CLASSES = {
+    "hover": ":hover", "focus": ":focus", "focus-within": ":focus-within", "focus-visible": ":focus-visible",
+    "active": ":active", "visited": ":visited", "disabled": ":disabled", "enabled": ":enabled",
+    "checked": ":checked", "required": ":required", "invalid": ":invalid", "read-only": ":read-only",
+    "empty": ":empty", "first": ":first-child", "last": ":last-child", "only": ":only-child",
+    "odd": ":nth-child(odd)", "even": ":nth-child(even)", "first-of-type": ":first-of-type",
+    "last-of-type": ":last-of-type", "placeholder-shown": ":placeholder-shown", "open": "[open]",
+}
+_PSEUDO_ELEMENTS = {
+    "before": "::before", "after": "::after", "placeholder": "::placeholder", "selection": "::selection",
+    "marker": "::marker", "file": "::file-selector-button", "first-letter": "::first-letter",
+    "first-line": "::first-line",
+}
+# Matches the `tailwind.config.darkMode` NiceGUI sets up for its dark mode toggle
+_ANCESTORS = {"dark": "body.body--dark ", "rtl": '[dir="rtl"] ', "ltr": '[dir="ltr"] '}
+
+
+class _Rule(NamedTuple):
+    sort_key: Tuple[int, int, int, str]
+    css: str
+    screen: Optional[str]
+    keyframes: Optional[str]
+
+
+def _split_variants(name: str) -> List[str]:
+    """Split on `:` outside of arbitrary `[...]` values."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(name):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == ":" and depth == 0:
+            parts.append(name[start:i])
+            start = i + 1
+    parts.append(name[start:])
+    return parts
+
+
+def _escape(name: str) -> str:
+    escaped = []
+    for i, char in enumerate(name):
+        if char.isascii() and (char.isalnum() or char in "-_"):
+            escaped.append(f"\\3{char} " if i == 0 and char.isdigit() else char)
+        else:
+            escaped.append("\\" + char)
+    return "".join(escaped)
+
+
+def _utility(name: str) -> Optional[Tuple[int, _Css]]:
+    """Resolve a variant-free utility (optionally `-` negated) to its cascade order and CSS."""
+    negative = name.startswith("-")
+    if negative:
+        name = name[1:]
+    elif name in _STATIC:
+        order, result = _STATIC[name]
+        return order, result if isinstance(result, _Css) else _Css(result)
+    # Longest prefix first, so `border-t-2` is not mistaken for `border` with value `t-2`
+    dash = len(name)
+    while True:
+        dash = name.rfind("-", 0, dash)
+        if dash <= 0:
+            return None
+        prefix, value = name[:dash], name[dash + 1:]
+        if "[" in prefix:
+            continue
+        for utility in _DYNAMIC.get(prefix, ()):
+            if negative and not utility.negatable:
+                continue
+            result = utility.handler(value)
+            if not result:
+                continue
+            result = result if isinstance(result, _Css) else _Css(result)
+            if negative:
+                result = result._replace(declarations=_negate_declarations(result.declarations))
+            return utility.order, result
+
+
+def _negate_declarations(declarations: str) -> str:
+    """`-m-4` and friends: negate every value except the shared transform composition."""
+    negated = []
+    for declaration in declarations.split(";"):
+        prop, _, value = declaration.partition(":")
+        negated.append(declaration if prop == "transform" else f"{prop}:{_negate(value)}")
+    return ";".join(negated)
+
+
+def compile_class(name: str) -> Optional[_Rule]:
+    """Compile one class (with variants, `!` and `-` prefixes) into a CSS rule, or None if it is not Tailwind."""
+    if not name or len(name) > 200:
+        return None
+    *variants, utility = _split_variants(name)
+    important = utility.startswith("!")
+    resolved = _utility(utility[1:] if important else utility)
+    if resolved is None:
+        return None
+    order, (declarations, suffix, keyframes, per_screen) = resolved
+
+    selector, pseudo_element, ancestors, screen = f".{_escape(name)}", "", "", None
+    for variant in variants:
+        group, _, state = variant.partition("-")
+        if variant in SCREENS and screen is None:
+            screen = variant
+        elif variant in _PSEUDO_CLASSES:
+            selector += _PSEUDO_CLASSES[variant]
+        elif variant in _PSEUDO_ELEMENTS and not pseudo_element:
+            pseudo_element = _PSEUDO_ELEMENTS[variant]
+            if variant in ("before", "after") and "content:var(--tw-content)" not in declarations:
+                declarations = f"content:var(--tw-content);{declarations}"
+        elif group in ("group", "peer") and state in _PSEUDO_CLASSES:
+            ancestors += f".{group}{_PSEUDO_CLASSES[state]}{' ' if group == 'group' else ' ~ '}"
+        elif variant in _ANCESTORS:
+            ancestors = _ANCESTORS[variant] + ancestors
+        else:
+            return None
+    if important:
+        declarations = ";".join(f"{d} !important" for d in declarations.split(";"))
+    full_selector = f"{ancestors}{selector}{pseudo_element}{suffix}"
+    css = f"{full_selector}{{{declarations}}}"
+    if per_screen:
+        # Nested inside the variant's own media query when there is one, which CSS allows
+        css += "".join(f"\n@media (min-width:{width}){{{full_selector}{{{per_screen.replace('{}', width)}"
+                       f"{' !important' if important else ''}}}}}" for width in SCREENS.values())
+    screen_index = list(SCREENS).index(screen) + 1 if screen else 0
+    return _Rule((screen_index, 1 if variants else 0, order, name), css, screen, keyframes)
+
+
+# Tailwind-style content scanning: candidate tokens in source text, arbitrary values may hold quotes
+_CANDIDATE = re.compile(r"(?:[\w\-!:./#%@]|\[[^\]\s]*\])+")
+
+
+def extract_candidates(text: str) -> Iterator[str]:
+    """Every token in `text` that could be a class name; most are not and simply compile to nothing."""
+    # Class strings inside Python string literals escape their quotes (e.g. "content-[\'\']")
+    text = text.replace("\\'", "'").replace('\\"', '"')
+    for match in _CANDIDATE.finditer(text):
+        token = match.group().rstrip(".:")
+        if token and (token[0].islower() or token[0] in "-!@" or token[0].isdigit()):
+            yield token
+
+
+def element_classes(elements: Iterable) -> Iterator[str]:
+    """Classes currently applied to NiceGUI elements, including `ui.query(...)` selectors."""
+    for element in elements:
+        yield from element._classes
+        queried = element._props.get("classes")
+        if isinstance(queried, list):
+            yield from queried
+
+
+class StyleSheet:
+    """
+    Tailwind utilities compiled locally, so the preview needs neither the CDN script nor the
+    in-browser JIT. Classes are added as they are discovered (scanned from sources, or read off
+    rendered elements); each class compiles once, and the CSS text plus its content digest are
+    rebuilt only when a new rule appears. Safe to feed from the watchdog thread.
+    """
+    def __init__(self, preflight: bool = True):
+        self.preflight = preflight
+        self._lock = threading.Lock()
+        self._seen: Dict[str, Optional[_Rule]] = {}
+        self._css: Optional[str] = None
+        self._digest: Optional[str] = None
+
+    def add(self, classes: Iterable[str]) -> bool:
+        """Compile classes not seen before; returns True if the stylesheet grew."""
+        grew = False
+        with self._lock:
+            for name in classes:
+                if name in self._seen:
+                    continue
+                rule = self._seen[name] = compile_class(name)
+                grew = grew or rule is not None
+            if grew:
+                self._css = self._digest = None
+        return grew
+
+    def scan(self, text: str) -> bool:
+        return self.add(extract_candidates(text))
+
+    def scan_files(self, paths: Iterable[Path]) -> bool:
+        grew = False
+        for path in paths:
+            try:
+                grew = self.scan(Path(path).read_text(encoding="utf-8")) or grew
+            except (OSError, UnicodeDecodeError):
+                continue
+        return grew
+
+    @property
+    def classes(self) -> List[str]:
+        """Class names that produced a rule, in cascade order."""
+        with self._lock:
+            rules = sorted(rule for rule in self._seen.values() if rule is not None)
+        return [rule.sort_key[3] for rule in rules]
+
+    @property
+    def css(self) -> str:
+        with self._lock:
+            self._rebuild_if_stale()
+            return self._css
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the current CSS; the preview uses it as a cache-busting URL parameter."""
+        with self._lock:
+            self._rebuild_if_stale()
+            return self._digest
+
+    def _rebuild_if_stale(self):
+        # Caller holds self._lock
+        if self._css is None:
+            self._css = self._build()
+            self._digest = hashlib.sha256(self._css.encode("utf-8")).hexdigest()[:16]
+
+    def _build(self) -> str:
+        rules = sorted(rule for rule in self._seen.values() if rule is not None)
+        lines = [PREFLIGHT] if self.preflight else []
+        screen = None
+        for rule in rules:
+            if rule.screen != screen:
+                if screen is not None:
+                    lines.append("}")
+                if rule.screen is not None:
+                    lines.append(f"@media (min-width:{SCREENS[rule.screen]}){{")
+                screen = rule.screen
+            lines.append(rule.css)
+        if screen is not None:
+            lines.append("}")
+        lines.extend(sorted({rule.keyframes for rule in rules if rule.keyframes}))
+        return "\n".join(lines) + "\n"
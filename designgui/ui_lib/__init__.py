@@ -1,13 +1,22 @@
 """
 UI Library for Nice Design OS
 """
-from .base import TailwindElement
-from .primitives import Box, Flex, Stack, Container, Text, Divider
-from .inputs import Button, Input, ToggleSwitch, Slider, RadioGroup, Select, Checkbox, Textarea
-from .display import Image, Icon, Avatar, DropdownMenu, Table, Tabs, TabPanel, Accordion, Card, Badge, Modal
-from .layout import Sidebar, Header, Sheet
-from .feedback import Skeleton, Spinner, Toast
-from .composites import AuthForm, StatGrid, EmptyState, Stepper, TopNav, DataFeed
+import importlib
+from typing import TYPE_CHECKING
+
+# Component name -> submodule defining it. Components are imported on first attribute access,
+# so `from designgui.ui_lib import Button` loads only the inputs module (and NiceGUI) it needs,
+# and importing the package itself (e.g. to read `__all__`) loads nothing.
+_EXPORTS = {
+    'TailwindElement': 'base',
+    **dict.fromkeys(['Box', 'Flex', 'Stack', 'Container', 'Text', 'Divider'], 'primitives'),
+    **dict.fromkeys(['Button', 'Input', 'ToggleSwitch', 'Slider', 'RadioGroup', 'Select', 'Checkbox', 'Textarea'], 'inputs'),
+    **dict.fromkeys(['Image', 'Icon', 'Avatar', 'DropdownMenu', 'Table', 'Tabs', 'TabPanel', 'Accordion', 'Card',
+                     'Badge', 'Modal'], 'display'),
+    **dict.fromkeys(['Sidebar', 'Header', 'Sheet'], 'layout'),
+    **dict.fromkeys(['Skeleton', 'Spinner', 'Toast'], 'feedback'),
+    **dict.fromkeys(['AuthForm', 'StatGrid', 'EmptyState', 'Stepper', 'TopNav', 'DataFeed'], 'composites'),
+}
 
 __all__ = [
     'TailwindElement',
@@ -18,3 +27,26 @@ __all__ = [
     'Skeleton', 'Spinner', 'Toast',
     'AuthForm', 'StatGrid', 'EmptyState', 'Stepper', 'TopNav', 'DataFeed'
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .base import TailwindElement
+    from .primitives import Box, Flex, Stack, Container, Text, Divider
+    from .inputs import Button, Input, ToggleSwitch, Slider, RadioGroup, Select, Checkbox, Textarea
+    from .display import Image, Icon, Avatar, DropdownMenu, Table, Tabs, TabPanel, Accordion, Card, Badge, Modal
+    from .layout import Sidebar, Header, Sheet
+    from .feedback import Skeleton, Spinner, Toast
+    from .composites import AuthForm, StatGrid, EmptyState, Stepper, TopNav, DataFeed
@@ -71,7 +71,7 @@ class DropdownMenu(TailwindElement):
             
             # The dropdown content (hidden by default, shown on group hover/click)
             self._menu_container = TailwindElement('div').classes(
-                'hidden group-hover:block absolute right-0 mt-2 w-56 rounded-md shadow-lg bg-white ring-1 ring-black ring-opacity-5 z-50'
+                'hidden group-hover:block absolute right-0 mt-2 w-56 rounded-md shadow-lg bg-white ring-1 ring-black/5 z-50'
             )
             
             with self._menu_container:
@@ -271,7 +271,7 @@ class Modal(TailwindElement):
         A Tailwind wrapper bridging NiceGUI's native dialog functions.
         Uses ui.dialog as the root base natively supporting open/close.
         """
-        classes = ['fixed', 'inset-0', 'z-50', 'flex', 'items-center', 'justify-center', 'bg-black', 'bg-opacity-50', 'hidden']
+        classes = ['fixed', 'inset-0', 'z-50', 'flex', 'items-center', 'justify-center', 'bg-black/50', 'hidden']
         if base_classes:
             classes.extend(base_classes)
         super().__init__('div', classes)
@@ -102,7 +102,8 @@ class ToggleSwitch(TailwindElement):
                 if self.value:
                     self._input.props('checked')
                 ui.element('div').classes('w-11 h-6 bg-gray-200 peer-focus:outline-none peer-focus:ring-4 peer-focus:ring-blue-300 rounded-full peer peer-checked:after:translate-x-full peer-checked:after:border-white after:content-[\'\'] after:absolute after:top-[2px] after:left-[2px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-5 after:w-5 after:transition-all peer-checked:bg-blue-600')
-            ui.element('span').classes('ml-3 text-sm font-medium text-gray-900').set_text(label)
+            label_el = ui.element('span').classes('ml-3 text-sm font-medium text-gray-900')
+            label_el._props['innerHTML'] = html.escape(label)
             
         def handle_change(e: Any):
             if e.args and isinstance(e.args, dict) and 'target.checked' in e.args:
@@ -177,7 +178,8 @@ class RadioGroup(TailwindElement):
                     if opt == self.value:
                         radio.props('checked')
                     self._radio_elements[opt] = radio
-                    ui.element('span').classes('ml-2 text-sm font-medium text-gray-900').set_text(opt)
+                    opt_label = ui.element('span').classes('ml-2 text-sm font-medium text-gray-900')
+                    opt_label._props['innerHTML'] = safe_opt
                     
         def handle_change(e: Any):
             val = e.args.get('target.value', self.value) if isinstance(e.args, dict) else self.value
@@ -212,7 +214,8 @@ class Select(TailwindElement):
         with self:
             for opt in self.options:
                 safe_opt = html.escape(opt)
-                option_el = ui.element('option').props(f'value="{safe_opt}"').set_text(opt)
+                option_el = ui.element('option').props(f'value="{safe_opt}"')
+                option_el._props['innerHTML'] = safe_opt
                 if opt == self.value:
                     option_el.props('selected')
                 self._option_elements[opt] = option_el
@@ -250,7 +253,8 @@ class Checkbox(TailwindElement):
             self._input = ui.element('input').classes('h-4 w-4 text-blue-600 focus:ring-blue-500 border-gray-300 rounded').props('type="checkbox"')
             if self.value:
                 self._input.props('checked')
-            ui.element('span').classes('ml-2 block text-sm text-gray-900').set_text(label)
+            label_el = ui.element('span').classes('ml-2 block text-sm text-gray-900')
+            label_el._props['innerHTML'] = html.escape(label)
             
         def handle_change(e: Any):
             if e.args and isinstance(e.args, dict) and 'target.checked' in e.args:
@@ -0,0 +1,159 @@
+"""
+File Watcher & Reload Broadcast
+"""
+import asyncio
+import hashlib
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from .metrics import RELOADS, WATCHER_EVENTS
+
+DEFAULT_DEBOUNCE_MS = 150
+
+
+def hash_file(path: Path) -> Optional[str]:
+    """Return the sha256 of a file's bytes, or None if it no longer exists."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except (FileNotFoundError, IsADirectoryError, PermissionError):
+        return None
+
+
+class ReloadHub:
+    """
+    Push-based fan-out of view reloads.
+    Watchdog fires on its own observer thread; `publish()` hands the raw path over to the
+    asyncio loop with `call_soon_threadsafe`. There each file is debounced over its own
+    window and dropped if its content hash did not change, so a burst of events from one
+    atomic save (temp file, rename, several modifies) turns into a single broadcast that
+    carries the set of files that actually changed.
+    """
+    def __init__(self, debounce_ms: int = DEFAULT_DEBOUNCE_MS):
+        self.debounce = debounce_ms / 1000
+        self._subscribers: List[Callable[[FrozenSet[Path]], None]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._hashes: Dict[Path, Optional[str]] = {}
+        self._pending: Dict[Path, asyncio.TimerHandle] = {}
+        self._first_seen: Dict[Path, float] = {}
+        self._ready: Set[Path] = set()
+        self._ready_since: Optional[float] = None
+        self._emit_scheduled = False
+        self.generation = 0
+        # time.monotonic() of the first watcher event behind the most recent broadcast
+        self.batch_started: Optional[float] = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Attach the event loop that subscriber callbacks must run on."""
+        self._loop = loop
+
+    def prime(self, paths: Iterable[Path]):
+        """Record the current content hash of known files so no-op saves are dropped from the first event on."""
+        for path in paths:
+            self._hashes[Path(path)] = hash_file(Path(path))
+
+    def subscribe(self, callback: Callable[[FrozenSet[Path]], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[FrozenSet[Path]], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, path):
+        """Thread-safe entry point for the watchdog observer thread."""
+        WATCHER_EVENTS.inc()
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._schedule, Path(path))
+
+    def _schedule(self, path: Path):
+        # Every new event for the same file restarts that file's debounce window
+        handle = self._pending.pop(path, None)
+        if handle is not None:
+            handle.cancel()
+        self._first_seen.setdefault(path, time.monotonic())
+        self._pending[path] = self._loop.call_later(self.debounce, self._settle, path)
+
+    def _settle(self, path: Path):
+        self._pending.pop(path, None)
+        first_seen = self._first_seen.pop(path, time.monotonic())
+        digest = hash_file(path)
+        if path in self._hashes and self._hashes[path] == digest:
+            return
+        self._hashes[path] = digest
+        self._ready.add(path)
+        self._ready_since = min(first_seen, self._ready_since or first_seen)
+        # Files settling in the same loop iteration are batched into one broadcast
+        if not self._emit_scheduled:
+            self._emit_scheduled = True
+            self._loop.call_soon(self._broadcast)
+
+    def _broadcast(self):
+        self._emit_scheduled = False
+        changed = frozenset(self._ready)
+        self._ready.clear()
+        if not changed:
+            return
+        self.batch_started, self._ready_since = self._ready_since, None
+        self.generation += 1
+        RELOADS.inc()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            # One broken client must never starve the others of the reload
+            try:
+                callback(changed)
+            except Exception:
+                traceback.print_exc()
+
+
+class GlobalHotReloadHandler(FileSystemEventHandler):
+    """Forward Python source changes in the watched tree to the reload hub."""
+    def __init__(self, hub: ReloadHub):
+        super().__init__()
+        self.hub = hub
+
+    def _forward(self, path: str):
+        if path.endswith('.py'):
+            self.hub.publish(path)
+
+    def on_modified(self, event):
+        if event.is_directory:
+            return
+        self._forward(event.src_path)
+
+    def on_created(self, event):
+        self.on_modified(event)
+
+    def on_deleted(self, event):
+        self.on_modified(event)
+
+    def on_moved(self, event):
+        # Atomic saves write a temp file and rename it over the target
+        if event.is_directory:
+            return
+        self._forward(event.src_path)
+        self._forward(event.dest_path)
+
+
+def start_observer(hub: ReloadHub, watch_path: str, recursive: bool = False) -> Observer:
+    """Start a watchdog observer publishing Python source changes under `watch_path` into `hub`."""
+    watch_dir = Path(watch_path)
+    hub.prime(watch_dir.rglob("*.py") if recursive else watch_dir.glob("*.py"))
+    observer = Observer()
+    observer.schedule(GlobalHotReloadHandler(hub), watch_path, recursive=recursive)
+    observer.start()
+    return observer
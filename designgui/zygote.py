@@ -0,0 +1,203 @@
+"""
+Pre-Warmed Zygote
+"""
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Overrides the per-user socket location (tests and several zygotes side by side)
+SOCKET_ENV = "DESIGNGUI_ZYGOTE_SOCKET"
+
+# Imported once in the zygote so every forked server starts with them in memory
+WARM_MODULES = ("fastapi", "uvicorn", "nicegui", "designgui.server")
+
+DEFAULT_START_TIMEOUT = 30.0
+_POLL_INTERVAL = 0.05
+
+
+def supported() -> bool:
+    """Forking needs POSIX; on Windows every server keeps starting a fresh interpreter."""
+    return hasattr(os, "fork") and hasattr(socket, "AF_UNIX")
+
+
+def socket_path() -> Path:
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base) / f"designgui-zygote-{os.getuid()}.sock"
+
+
+def log_path(path: Optional[Path] = None) -> Path:
+    return Path(path or socket_path()).with_suffix(".log")
+
+
+def _request(message: dict, path: Optional[Path] = None, timeout: float = 5.0) -> Optional[dict]:
+    """One JSON line to the zygote and one back, or None if no zygote answers."""
+    if not supported():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(path or socket_path()))
+            conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            reply = json.loads(conn.makefile("rb").readline())
+    except (OSError, ValueError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def ping(path: Optional[Path] = None) -> Optional[dict]:
+    """PID, uptime and spawn count of the running zygote, or None."""
+    return _request({"op": "ping"}, path)
+
+
+def spawn(cwd: Path, log: Path, argv: Sequence[str] = (), script: Optional[Path] = None,
+          path: Optional[Path] = None) -> Optional[int]:
+    """
+    Fork a detached server from the zygote and return its PID, or None if no zygote runs
+    (callers then start a fresh interpreter as before). Without `script` the child runs the
+    `designgui` CLI with `argv`; with it, the script as `__main__` (e.g. an exported main.py).
+    The child gets the caller's working directory and environment, and `log` as stdout/stderr.
+    """
+    reply = _request({"op": "spawn", "cwd": str(cwd), "log": str(log), "argv": list(argv),
+                      "script": str(script) if script else None, "env": dict(os.environ)}, path)
+    return reply.get("pid") if reply else None
+
+
+def stop(path: Optional[Path] = None) -> Optional[int]:
+    """Shut the zygote down (servers it forked keep running); returns its PID, or None."""
+    reply = _request({"op": "stop"}, path)
+    return reply.get("pid") if reply else None
+
+
+def start(path: Optional[Path] = None, timeout: float = DEFAULT_START_TIMEOUT):
+    """Launch a detached zygote unless one answers already; returns (ping reply, reused)."""
+    import subprocess
+    path = Path(path or socket_path())
+    running = ping(path)
+    if running is not None:
+        return running, True
+    with open(log_path(path), "ab") as log:
+        process = subprocess.Popen([sys.executable, "-m", "designgui.zygote", str(path)], stdin=subprocess.DEVNULL,
+                                   stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        running = ping(path)
+        if running is not None:
+            return running, False
+        time.sleep(_POLL_INTERVAL)
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+    raise RuntimeError(f"Zygote did not come up within {timeout:g}s; see {log_path(path)}.")
+
+
+def warm():
+    """Import the server stack and every UI library export, like a sandbox worker does."""
+    import importlib
+    for name in WARM_MODULES:
+        importlib.import_module(name)
+    from designgui import ui_lib
+    for name in ui_lib.__all__:
+        getattr(ui_lib, name)
+
+
+def serve(path: Optional[Path] = None):
+    """
+    Zygote main loop: pay the heavy imports once, then fork a server per spawn request.
+    Requests are served one at a time on a private Unix socket; the zygote stays
+    single-threaded so forking it is safe, and children are reaped by the kernel.
+    """
+    path = Path(path or socket_path())
+    if ping(path) is not None:
+        raise SystemExit(f"A zygote is already listening on {path}.")
+    started = time.monotonic()
+    warm()
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    path.unlink(missing_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    os.chmod(path, 0o600)  # a spawn request runs arbitrary code as this user
+    server.listen(16)
+    print(f"Zygote {os.getpid()} warm in {time.monotonic() - started:.2f}s, listening on {path}", flush=True)
+    spawned = 0
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    message = json.loads(conn.makefile("rb").readline())
+                except ValueError:
+                    continue
+                op = message.get("op") if isinstance(message, dict) else None
+                if op == "spawn":
+                    pid = os.fork()
+                    if pid == 0:
+                        server.close()
+                        conn.close()
+                        _run_child(message)
+                    spawned += 1
+                    reply = {"pid": pid}
+                elif op == "ping":
+                    reply = {"pid": os.getpid(), "uptime_s": round(time.monotonic() - started, 3), "spawned": spawned}
+                elif op == "stop":
+                    conn.sendall(json.dumps({"pid": os.getpid()}).encode("utf-8") + b"\n")
+                    break
+                else:
+                    reply = {"error": f"Unknown op {op!r}."}
+                conn.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+    finally:
+        server.close()
+        path.unlink(missing_ok=True)
+
+
+def _run_child(message: dict):
+    """Body of a forked server; never returns."""
+    code = 1
+    try:
+        os.setsid()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # the server waits on its own subprocesses
+        os.chdir(message["cwd"])
+        os.environ.clear()
+        os.environ.update(message.get("env") or {})
+        fd = os.open(message["log"], os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.dup2(fd, 1)
+        os.dup2(fd, 2)
+        os.close(fd)
+        null = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null, 0)
+        os.close(null)
+        script = message.get("script")
+        if script:
+            import runpy
+            # Like `python main.py`: the script's directory replaces the zygote's own sys.path[0]
+            sys.argv = [script, *message.get("argv", [])]
+            sys.path[0] = str(Path(script).parent)
+            runpy.run_path(script, run_name="__main__")
+        else:
+            from designgui.cli import app
+            # Like `python -m designgui.cli` run from `cwd`
+            sys.argv = ["designgui", *message.get("argv", [])]
+            sys.path[0] = message["cwd"]
+            app(prog_name="designgui")
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+if __name__ == "__main__":
+    serve(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,108 @@
+"""
+Batch Validation — `designgui check` Tests
+==========================================
+Proves that many candidate views are imported and rendered headlessly in
+parallel, that each gets its own JSON report, and that the batch takes about as
+long as its slowest view rather than the sum of all of them.
+
+Architecture under test (check.py, cli.py):
+    - discover_views() lists views/*.py (or the requested names)
+    - check_views() fans the batch out over a SandboxPool and gathers reports
+    - `designgui check` prints the JSON report and exits 1 if any view failed
+"""
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from designgui.check import check_views, discover_views
+from designgui.sandbox import SandboxPool
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="CPU and memory limits need the resource module")
+
+SLOW_VIEW = """\
+    import time
+    from designgui.ui_lib import Stack, Text
+
+    time.sleep(0.6)  # e.g. generating mock data
+
+    def render_view():
+        with Stack():
+            Text('{label}')
+"""
+
+
+def _scaffold(project_dir: Path, views: dict) -> Path:
+    views_dir = project_dir / ".designgui" / "product" / "views"
+    views_dir.mkdir(parents=True)
+    (views_dir.parent / "__init__.py").touch()
+    (views_dir / "__init__.py").touch()
+    (project_dir / ".designgui" / "config.json").write_text(json.dumps({
+        "paths": {"views": ".designgui/product/views"},
+        "sandbox": {"timeout_s": 3, "cpu_s": 2, "memory_mb": 256},
+    }), encoding="utf-8")
+    for name, code in views.items():
+        (views_dir / name).write_text(textwrap.dedent(code), encoding="utf-8")
+    return views_dir
+
+
+def test_batch_runs_in_parallel_with_per_view_reports(tmp_path):
+    views_dir = _scaffold(tmp_path, {f"candidate_{i}.py": SLOW_VIEW.format(label=i) for i in range(4)})
+    warmup_dir = _scaffold(tmp_path / "warmup", {f"w{i}.py": "def render_view():\n    pass\n" for i in range(4)})
+
+    pool = SandboxPool(workers=4, timeout=5)
+    pool.start()
+    try:
+        async def scenario():
+            # First jobs wait for the workers to finish importing NiceGUI; keep that out of the timing
+            await check_views(discover_views(warmup_dir), warmup_dir, pool)
+            return await check_views(discover_views(views_dir), views_dir, pool)
+
+        report = asyncio.run(scenario())
+    finally:
+        pool.close()
+
+    assert report["ok"]
+    assert [v["view"] for v in report["views"]] == [f"candidate_{i}.py" for i in range(4)]
+    for view in report["views"]:
+        assert view["element_count"] == 2
+        assert view["timings_ms"]["exec"] >= 600
+    # Four 0.6 s views on four workers: close to one view's time, far below the 2.4 s sum
+    assert report["elapsed_ms"] < 1800, report["elapsed_ms"]
+
+
+def test_discover_views_by_name(tmp_path):
+    views_dir = _scaffold(tmp_path, {"a.py": "", "b.py": ""})
+    assert discover_views(views_dir) == [views_dir / "a.py", views_dir / "b.py"]
+    assert discover_views(views_dir, ["b", "a.py"]) == [views_dir / "b.py", views_dir / "a.py"]
+
+
+def test_cli_check_reports_failures_and_exit_code(tmp_path):
+    _scaffold(tmp_path, {
+        "good.py": SLOW_VIEW.format(label="ok"),
+        "broken.py": "def render_view():\n    raise RuntimeError('no data')\n",
+        "spin.py": "while True:\n    pass\n",
+    })
+    result = subprocess.run(
+        [sys.executable, "-m", "designgui.cli", "check"],
+        cwd=str(tmp_path), capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 1, result.stderr
+    report = json.loads(result.stdout)
+    by_name = {v["view"]: v for v in report["views"]}
+    assert set(by_name) == {"good.py", "broken.py", "spin.py"}
+    assert by_name["good.py"]["ok"]
+    assert by_name["broken.py"]["stage"] == "render"
+    assert by_name["broken.py"]["error"] == "RuntimeError: no data"
+    assert by_name["spin.py"]["stage"] == "sandbox"
+
+    result = subprocess.run(
+        [sys.executable, "-m", "designgui.cli", "check", "good.py"],
+        cwd=str(tmp_path), capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stdout
+    assert [v["view"] for v in json.loads(result.stdout)["views"]] == ["good.py"]
@@ -0,0 +1,103 @@
+"""
+Daemon Lifecycle — start / status / stop Tests
+==============================================
+Proves that `designgui daemon start` returns only once the server answers its
+readiness probe, that concurrent or repeated starts reuse the one running
+daemon instead of spawning rivals, that `status` reports uptime and resource
+usage, and that `stop` terminates the process and clears the PID file.
+
+Architecture under test (daemon.py, cli.py, server.py):
+    - .designgui/daemon.json records pid/port, claimed with O_EXCL
+    - /api/health is the readiness probe and carries uptime + usage
+    - stale records (dead pid) are discarded
+
+Port: 8083 (isolated from the daemon tests on 8081 and export tests on 8082)
+"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from designgui.daemon import daemon_status, pid_alive, state_path
+
+DAEMON_PORT = 8083
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX process checks")
+
+
+def _scaffold(project_dir: Path) -> Path:
+    views_dir = project_dir / ".designgui" / "product" / "views"
+    views_dir.mkdir(parents=True)
+    (views_dir.parent / "__init__.py").touch()
+    (views_dir / "__init__.py").touch()
+    (project_dir / ".designgui" / "config.json").write_text(json.dumps({
+        "daemon_port": DAEMON_PORT, "paths": {"views": ".designgui/product/views"},
+    }), encoding="utf-8")
+    (views_dir / "home.py").write_text("from designgui.ui_lib import Text\n\ndef render_view():\n    Text('home')\n",
+                                       encoding="utf-8")
+    return project_dir
+
+
+def _cli(project_dir: Path, *args, **kwargs) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-m", "designgui.cli", "daemon", *args],
+                          cwd=str(project_dir), capture_output=True, text=True, timeout=60, **kwargs)
+
+
+@pytest.fixture()
+def project(tmp_path):
+    project_dir = _scaffold(tmp_path / "project")
+    yield project_dir
+    _cli(project_dir, "stop")
+
+
+def test_start_status_reuse_and_stop(project, tmp_path):
+    # Two agents starting the daemon at the same time end up sharing one process
+    starts = [subprocess.Popen([sys.executable, "-m", "designgui.cli", "daemon", "start"], cwd=str(project),
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) for _ in range(2)]
+    outputs = [p.communicate(timeout=60) for p in starts]
+    assert [p.returncode for p in starts] == [0, 0], outputs
+    assert sum("launched successfully" in out for out, _ in outputs) == 1, outputs
+
+    status = json.loads(_cli(project, "status", "--json").stdout)
+    assert status["running"] and status["ready"]
+    assert status["port"] == DAEMON_PORT
+    assert status["project"] == str(project.resolve())
+    assert status["uptime_s"] > 0 and status["cpu_seconds"] > 0
+    assert status["views"] == 1
+    pid = status["pid"]
+    assert f"Daemon running: pid {pid}, port {DAEMON_PORT}" in _cli(project, "status").stdout
+
+    # Readiness means the preview itself is up, not just the process
+    import httpx
+    assert httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5).status_code == 200
+
+    started = time.monotonic()
+    again = _cli(project, "start")
+    assert again.returncode == 0 and "already running" in again.stdout
+    assert time.monotonic() - started < 5
+    assert json.loads(_cli(project, "status", "--json").stdout)["pid"] == pid
+
+    # Another project cannot take over the port
+    other = _scaffold(tmp_path / "other")
+    conflict = _cli(other, "start")
+    assert conflict.returncode == 1
+    assert str(project.resolve()) in conflict.stderr
+
+    stopped = _cli(project, "stop")
+    assert f"pid {pid}" in stopped.stdout
+    assert not pid_alive(pid)
+    assert not state_path(project).exists()
+    assert _cli(project, "status").returncode == 1
+
+
+def test_stale_state_is_discarded(tmp_path):
+    project = _scaffold(tmp_path / "project")
+    gone = subprocess.Popen([sys.executable, "-c", "pass"])
+    gone.wait()
+    state_path(project).write_text(json.dumps({"pid": gone.pid, "port": DAEMON_PORT}), encoding="utf-8")
+
+    assert daemon_status(project) is None
+    assert not state_path(project).exists()
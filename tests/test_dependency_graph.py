@@ -0,0 +1,125 @@
+"""
+Selective Invalidation — Dependency Graph Tests
+===============================================
+Proves that the AST-built import graph maps a changed file in the product tree
+to exactly the views that transitively import it.
+
+Architecture under test (deps.py):
+    - DependencyGraph.scan() parses every .py under .designgui/product/
+    - `product.*` imports resolve against .designgui/, bare names against views/
+    - affected_views(changed) walks reverse edges to the top-level view files
+"""
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from designgui.deps import DependencyGraph
+
+
+def _write(path: Path, code: str = ""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(code), encoding="utf-8")
+
+
+@pytest.fixture()
+def product(tmp_path):
+    product_dir = tmp_path / ".designgui" / "product"
+    views_dir = product_dir / "views"
+    _write(product_dir / "__init__.py")
+    _write(views_dir / "__init__.py")
+    _write(product_dir / "models.py", """\
+        class User:
+            pass
+    """)
+    _write(product_dir / "shell.py", """\
+        from product.models import User
+    """)
+    _write(views_dir / "dashboard.py", """\
+        from product.shell import *
+
+        def render_view():
+            pass
+    """)
+    _write(views_dir / "users.py", """\
+        from product import models
+
+        def render_view():
+            pass
+    """)
+    _write(views_dir / "widgets.py", """\
+        def card():
+            pass
+    """)
+    _write(views_dir / "settings.py", """\
+        import widgets
+
+        def render_view():
+            widgets.card()
+    """)
+    _write(views_dir / "about.py", """\
+        def render_view():
+            pass
+    """)
+    graph = DependencyGraph(views_dir, product_dir)
+    graph.scan()
+    return graph, product_dir, views_dir
+
+
+def test_models_change_reaches_transitive_importers_only(product):
+    """models.py → shell.py → dashboard.py, and models.py → users.py. Nothing else re-renders."""
+    graph, product_dir, _ = product
+    assert graph.affected_views([product_dir / "models.py"]) == {"dashboard.py", "users.py"}
+
+
+def test_shell_change_reaches_only_shell_importers(product):
+    graph, product_dir, _ = product
+    assert graph.affected_views([product_dir / "shell.py"]) == {"dashboard.py"}
+
+
+def test_sibling_view_import_by_bare_name(product):
+    """settings.py does `import widgets` (views dir is on sys.path in the preview)."""
+    graph, _, views_dir = product
+    assert graph.affected_views([views_dir / "widgets.py"]) == {"widgets.py", "settings.py"}
+
+
+def test_independent_view_only_affects_itself(product):
+    graph, _, views_dir = product
+    assert graph.affected_views([views_dir / "about.py"]) == {"about.py"}
+
+
+def test_refresh_picks_up_new_import_edges(product):
+    """Adding an import to a view must make it depend on the imported file from the next save on."""
+    graph, product_dir, views_dir = product
+    _write(views_dir / "about.py", """\
+        from product.models import User
+
+        def render_view():
+            pass
+    """)
+    graph.refresh([views_dir / "about.py"])
+    assert "about.py" in graph.affected_views([product_dir / "models.py"])
+
+
+def test_refresh_on_created_file_resolves_dangling_imports(product):
+    """A view importing a not-yet-existing module gains the edge once the module is created."""
+    graph, product_dir, views_dir = product
+    _write(views_dir / "reports.py", """\
+        from product.data import ROWS
+
+        def render_view():
+            pass
+    """)
+    graph.refresh([views_dir / "reports.py"])
+    assert graph.imports_of(views_dir / "reports.py") == set()
+
+    _write(product_dir / "data.py", "ROWS = []\n")
+    graph.refresh([product_dir / "data.py"])
+    assert graph.affected_views([product_dir / "data.py"]) == {"reports.py"}
+
+
+def test_module_names_cover_both_import_roots(product):
+    graph, product_dir, views_dir = product
+    assert graph.module_names(product_dir / "models.py") == {"product.models"}
+    assert graph.module_names(views_dir / "widgets.py") == {"widgets", "product.views.widgets"}
+    assert graph.module_names(product_dir / "__init__.py") == {"product"}
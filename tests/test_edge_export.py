@@ -5,14 +5,19 @@ Proves that `designgui export` generates a lightweight, valid, self-contained
 Python application that can run entirely detached from the DesignGUI CLI,
 optimized for low-memory headless edge devices.
 
-Architecture under test (cli.py export()):
+Architecture under test (cli.py export(), export.py):
     - Copies .designgui/product/ → production_app/product/
+    - Re-exports write only files whose hash differs from the export manifest
     - Generates production_app/main.py with dynamic router
     - Router maps dashboard→'/', others→'/{name}'
     - Generated app uses ui.run(reload=False, show=False) for headless mode
+    - `--lazy` routes import their view on first request (`--prewarm`: in the background)
+    - `--artifact` bundles app, product and needed designgui modules as optimized pycs in one .pyz
+    - `--static` serves callback-free views as pre-rendered HTML with an ETag
 
-Port: 8082 (isolated from default 8080 and daemon tests on 8081)
+Ports: 8082/8083, 8087-8089 for lazy routes, 8091 for the artifact and 8092 for static pages (isolated from default 8080 and daemon tests on 8081)
 """
+import os
 import sys
 import ast
 import time
@@ -31,6 +36,9 @@ EXPORT_PORT = 8082
 EXPORT_PORT_ALT = 8083  # second port for route test — avoids TCP TIME_WAIT flakiness
 CUSTOM_PORT = 9090
 CUSTOM_HOST = "0.0.0.0"
+LAZY_PORTS = {"eager": 8087, "lazy": 8088, "prewarm": 8089}
+ARTIFACT_PORT = 8091
+STATIC_PORT = 8092
 RUNTIME_BOOT_TIMEOUT = 20  # seconds — NiceGUI first startup downloads frontend assets
 
 # ---------------------------------------------------------------------------
@@ -203,6 +211,20 @@ class TestExportStaticValidation:
         assert "reload=False" in source, "reload=False not found — will break headless deployment"
         assert "show=False" in source, "show=False not found — will try to open browser on headless device"
 
+    def test_export_ships_checked_hash_bytecode(self, export_project):
+        """Every exported view must ship a checked-hash pyc in __pycache__ so the
+        edge device imports it without compiling on first boot."""
+        import importlib.util
+        _, prod_dir = export_project
+        for view in ["dashboard.py", "home.py", "settings.py"]:
+            source_path = prod_dir / "product" / "views" / view
+            pyc = Path(importlib.util.cache_from_source(str(source_path)))
+            assert pyc.exists(), f"No precompiled bytecode for {view}"
+            data = pyc.read_bytes()
+            assert data[:4] == importlib.util.MAGIC_NUMBER
+            assert int.from_bytes(data[4:8], "little") == 0b11, "pyc must be hash-based and source-checked"
+            assert data[8:16] == importlib.util.source_hash(source_path.read_bytes())
+
     def test_export_custom_host_port(self, tmp_path):
         """Export with --host 0.0.0.0 --port 9090 — main.py must embed those values."""
         _scaffold_project(tmp_path, STANDARD_VIEWS)
@@ -214,6 +236,314 @@ class TestExportStaticValidation:
         assert f"port={CUSTOM_PORT}" in source, f"Custom port {CUSTOM_PORT} not found in main.py"
 
 
+# ---------------------------------------------------------------------------
+# Incremental Export Tests
+# ---------------------------------------------------------------------------
+
+def _export_changeset(project_dir: Path, *args) -> dict:
+    """Run `designgui export --json` and return the parsed changeset."""
+    result = subprocess.run(
+        [sys.executable, "-m", "designgui.cli", "export", "--port", str(EXPORT_PORT), "--json", *args],
+        cwd=str(project_dir), capture_output=True, text=True, timeout=30,
+    )
+    assert result.returncode == 0, f"Export failed: {result.stderr}"
+    return json.loads(result.stdout)
+
+
+class TestIncrementalExport:
+    """Re-exports touch only what changed since the manifest of the previous export."""
+
+    def test_reexport_without_changes_is_empty(self, export_project):
+        project_dir, prod_dir = export_project
+        main_mtime = (prod_dir / "main.py").stat().st_mtime_ns
+        changes = _export_changeset(project_dir)
+        assert changes["added"] == changes["modified"] == changes["removed"] == []
+        assert changes["unchanged"] > 0 and not changes["full"] and not changes["routes_changed"]
+        assert (prod_dir / "main.py").stat().st_mtime_ns == main_mtime
+
+    def test_modified_view_ships_only_itself_and_its_bytecode(self, export_project):
+        import importlib.util
+        project_dir, prod_dir = export_project
+        home = project_dir / ".designgui" / "product" / "views" / "home.py"
+        home.write_text(home.read_text(encoding="utf-8").replace("'Home'", "'Home v2'"), encoding="utf-8")
+        main_mtime = (prod_dir / "main.py").stat().st_mtime_ns
+
+        changes = _export_changeset(project_dir)
+        pyc = Path(importlib.util.cache_from_source(str(prod_dir / "product" / "views" / "home.py")))
+        assert sorted(changes["modified"]) == sorted(["product/views/home.py", pyc.relative_to(prod_dir).as_posix()])
+        assert changes["added"] == changes["removed"] == []
+        assert "Home v2" in (prod_dir / "product" / "views" / "home.py").read_text(encoding="utf-8")
+        assert pyc.read_bytes()[8:16] == importlib.util.source_hash(home.read_bytes())
+        assert (prod_dir / "main.py").stat().st_mtime_ns == main_mtime, "same routes must not rewrite main.py"
+
+    def test_removed_view_is_deleted_and_unrouted(self, export_project):
+        project_dir, prod_dir = export_project
+        (prod_dir / "notes.txt").write_text("operator notes", encoding="utf-8")
+        (project_dir / ".designgui" / "product" / "views" / "settings.py").unlink()
+
+        changes = _export_changeset(project_dir)
+        assert "product/views/settings.py" in changes["removed"]
+        assert any(path.endswith(".pyc") and "settings" in path for path in changes["removed"])
+        assert changes["modified"] == ["main.py"] and changes["routes_changed"]
+        assert not (prod_dir / "product" / "views" / "settings.py").exists()
+        assert "route_settings" not in (prod_dir / "main.py").read_text(encoding="utf-8")
+        assert (prod_dir / "notes.txt").exists(), "files export never wrote are left alone"
+
+    def test_clean_rebuilds_everything(self, export_project):
+        project_dir, prod_dir = export_project
+        changes = _export_changeset(project_dir, "--clean")
+        assert changes["full"] and changes["unchanged"] == 0
+        assert "main.py" in changes["added"]
+
+
+# ---------------------------------------------------------------------------
+# Lazy Route Import Tests
+# ---------------------------------------------------------------------------
+LAZY_VIEW_COUNT = 40
+
+# Records its import in imported/ and carries a sizeable module-level table, like a real data view
+HEAVY_VIEW = """\
+    from pathlib import Path
+    from designgui.ui_lib.primitives import Stack, Text
+
+    Path('imported').mkdir(exist_ok=True)
+    (Path('imported') / __name__.rsplit('.', 1)[-1]).touch()
+    TABLE = [f'row {i:06d} of a fixture the view renders' for i in range(20000)]
+
+    def render_view():
+        with Stack(base_classes=['p-8']):
+            Text(f'{__name__} has {len(TABLE)} rows')
+"""
+
+
+def _boot_measured(prod_dir: Path, port: int):
+    """Start main.py; return (process, ms to first HTTP 200, RSS in MB once it answers)."""
+    import httpx
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "main.py"], cwd=str(prod_dir),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + RUNTIME_BOOT_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://localhost:{port}/", timeout=2).status_code == 200:
+                elapsed = (time.perf_counter() - started) * 1000
+                pages = int(Path(f"/proc/{proc.pid}/statm").read_text().split()[1])
+                return proc, elapsed, pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    proc.terminate()
+    pytest.fail(f"Exported app did not answer on port {port}")
+
+
+@pytest.fixture()
+def heavy_project(tmp_path):
+    views = {f"view_{i:02d}.py": HEAVY_VIEW for i in range(LAZY_VIEW_COUNT)}
+    views["dashboard.py"] = STANDARD_VIEWS["dashboard.py"]
+    _scaffold_project(tmp_path, views)
+    return tmp_path
+
+
+def _export_mode(project_dir: Path, port: int, *flags) -> Path:
+    result = subprocess.run(
+        [sys.executable, "-m", "designgui.cli", "export", "--port", str(port), "--clean", *flags],
+        cwd=str(project_dir), capture_output=True, text=True, timeout=30,
+    )
+    assert result.returncode == 0, f"Export failed: {result.stderr}"
+    prod_dir = project_dir / "production_app"
+    shutil.rmtree(prod_dir / "imported", ignore_errors=True)
+    return prod_dir
+
+
+@pytest.mark.skipif(not Path("/proc/self/statm").exists(), reason="RSS is read from /proc")
+class TestLazyRouteImports:
+    """A `--lazy` export boots without importing views, so cold start and memory
+    no longer scale with the number of views in the product."""
+
+    def test_lazy_main_py_defers_imports(self, export_project):
+        project_dir, prod_dir = export_project
+        _export_mode(project_dir, EXPORT_PORT, "--lazy")
+        source = (prod_dir / "main.py").read_text(encoding="utf-8")
+        tree = ast.parse(source)
+        assert not any(isinstance(node, ast.ImportFrom) and (node.module or "").startswith("product")
+                       for node in ast.walk(tree)), "views must not be imported at module load"
+        assert {"route_dashboard", "route_home", "route_settings"} <= {
+            node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)}
+        assert "reload=False" in source and "show=False" in source and "_prewarm" not in source
+
+    def test_lazy_boot_is_faster_and_smaller(self, heavy_project):
+        """Startup-time and RSS comparison of the same 41-view product, eager vs lazy."""
+        import httpx
+        measured = {}
+        for mode, flags in (("eager", ()), ("lazy", ("--lazy",))):
+            port = LAZY_PORTS[mode]
+            prod_dir = _export_mode(heavy_project, port, *flags)
+            proc, elapsed, rss = _boot_measured(prod_dir, port)
+            try:
+                imported = {p.name for p in (prod_dir / "imported").glob("*")}
+                if mode == "lazy":
+                    assert imported == set(), "no heavy view may be imported before it is requested"
+                    assert "view_07 has 20000 rows" in httpx.get(f"http://localhost:{port}/view_07", timeout=5).text
+                    assert {p.name for p in (prod_dir / "imported").glob("*")} == {"view_07"}
+                else:
+                    assert len(imported) == LAZY_VIEW_COUNT
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+            measured[mode] = (elapsed, rss)
+        report = ", ".join(f"{mode}: {ms:.0f} ms to first 200, {rss:.1f} MB RSS" for mode, (ms, rss) in measured.items())
+        assert measured["lazy"][1] < measured["eager"][1] - 10, report
+        assert measured["lazy"][0] < measured["eager"][0] + 500, report
+
+    def test_prewarm_imports_remaining_views_after_startup(self, heavy_project):
+        port = LAZY_PORTS["prewarm"]
+        prod_dir = _export_mode(heavy_project, port, "--lazy", "--prewarm")
+        proc, _, _ = _boot_measured(prod_dir, port)
+        try:
+            deadline = time.monotonic() + RUNTIME_BOOT_TIMEOUT
+            while len(list((prod_dir / "imported").glob("*"))) < LAZY_VIEW_COUNT and time.monotonic() < deadline:
+                time.sleep(0.1)
+            assert len(list((prod_dir / "imported").glob("*"))) == LAZY_VIEW_COUNT
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+# ---------------------------------------------------------------------------
+# Single-File Artifact Tests
+# ---------------------------------------------------------------------------
+ARTIFACT_VIEWS = {
+    **STANDARD_VIEWS,
+    "where.py": """\
+        import designgui.ui_lib
+        from designgui.ui_lib import Text
+
+        def render_view():
+            \"\"\"Shows which copy of the UI library served the page.\"\"\"
+            Text(f'loaded from {designgui.ui_lib.__file__}')
+    """,
+}
+
+
+class TestArtifactExport:
+    """`--artifact` ships the whole app as one zipapp of optimized, sourceless bytecode."""
+
+    def test_artifact_contains_only_bytecode(self, tmp_path):
+        import importlib.util
+        import marshal
+        import zipfile
+        _scaffold_project(tmp_path, ARTIFACT_VIEWS)
+        changes = _export_changeset(tmp_path, "--artifact")
+        artifact = tmp_path / "production_app.pyz"
+        assert changes["artifact"]["path"] == str(artifact)
+        assert artifact.read_bytes().startswith(b"#!")
+
+        with zipfile.ZipFile(artifact) as archive:
+            names = set(archive.namelist())
+            assert not [n for n in names if n.endswith(".py")], "no source may be compiled on the device"
+            assert {"__main__.pyc", "product/views/where.pyc", "designgui/__init__.pyc",
+                    "designgui/ui_lib/__init__.pyc", "designgui/ui_lib/primitives.pyc"} <= names
+            assert not {"designgui/server.pyc", "designgui/cli.pyc"} & names, "only modules the product imports"
+            pyc = archive.read("product/views/where.pyc")
+        assert pyc[:4] == importlib.util.MAGIC_NUMBER
+        render = next(c for c in marshal.loads(pyc[16:]).co_consts if getattr(c, "co_name", "") == "render_view")
+        assert render.co_consts[0] != "Shows which copy of the UI library served the page.", "optimize=2 strips docstrings"
+
+    def test_artifact_is_reproducible(self, tmp_path):
+        _scaffold_project(tmp_path, STANDARD_VIEWS)
+        first = _export_changeset(tmp_path, "--artifact")["artifact"]["sha256"]
+        second = _export_changeset(tmp_path, "--artifact", "--clean")["artifact"]["sha256"]
+        assert first == second
+
+    def test_artifact_boots_standalone(self, tmp_path):
+        """Copied alone to another directory, the artifact serves every route from its own modules."""
+        import httpx
+        project_dir = tmp_path / "project"
+        _scaffold_project(project_dir, ARTIFACT_VIEWS)
+        subprocess.run([sys.executable, "-m", "designgui.cli", "export", "--port", str(ARTIFACT_PORT), "--artifact"],
+                       cwd=str(project_dir), check=True, capture_output=True, timeout=30)
+        device = tmp_path / "device"
+        device.mkdir()
+        shutil.copy2(project_dir / "production_app.pyz", device / "app.pyz")
+
+        proc = subprocess.Popen([sys.executable, "app.pyz"], cwd=str(device),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            if not _wait_for_server(ARTIFACT_PORT):
+                proc.terminate()
+                pytest.fail(f"Artifact did not boot: {proc.stderr.read().decode(errors='replace')[-1000:]}")
+            assert "Settings" in httpx.get(f"http://localhost:{ARTIFACT_PORT}/settings", timeout=5).text
+            where = httpx.get(f"http://localhost:{ARTIFACT_PORT}/where", timeout=5).text
+            assert "app.pyz/designgui/ui_lib/__init__.pyc" in where
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+# ---------------------------------------------------------------------------
+# Static Page Tests
+# ---------------------------------------------------------------------------
+INTERACTIVE_VIEW = """\
+    from designgui.ui_lib import Button, Stack
+
+    def render_view():
+        with Stack(base_classes=['p-8']):
+            Button('Save', on_click=lambda: None)
+"""
+
+
+class TestStaticPages:
+    """`--static` pre-renders views without callbacks; the rest stay NiceGUI pages."""
+
+    def test_callback_free_views_are_prerendered(self, tmp_path):
+        _scaffold_project(tmp_path, {**STANDARD_VIEWS, "editor.py": INTERACTIVE_VIEW})
+        changes = _export_changeset(tmp_path, "--static")
+        assert changes["static"] == ["dashboard", "home", "settings"]
+        assert list(changes["live"]) == ["editor"] and "on click" in changes["live"]["editor"][0]
+
+        prod_dir = tmp_path / "production_app"
+        page = (prod_dir / "static" / "dashboard.html").read_text(encoding="utf-8")
+        assert page.startswith("<!DOCTYPE html>") and "Dashboard" in page and "<style>" in page
+        source = (prod_dir / "main.py").read_text(encoding="utf-8")
+        ast.parse(source)
+        assert "from product.views.dashboard" not in source, "static views are never imported at runtime"
+        assert "from product.views.editor import render_view" in source
+
+    def test_view_gaining_a_callback_goes_live(self, tmp_path):
+        _scaffold_project(tmp_path, STANDARD_VIEWS)
+        _export_changeset(tmp_path, "--static")
+        (tmp_path / ".designgui" / "product" / "views" / "home.py").write_text(
+            textwrap.dedent(INTERACTIVE_VIEW), encoding="utf-8")
+        changes = _export_changeset(tmp_path, "--static")
+        assert "static/home.html" in changes["removed"] and "main.py" in changes["modified"]
+        assert changes["static"] == ["dashboard", "settings"]
+
+    def test_static_pages_are_served_with_etag(self, tmp_path):
+        import httpx
+        _scaffold_project(tmp_path, {**STANDARD_VIEWS, "editor.py": INTERACTIVE_VIEW})
+        subprocess.run([sys.executable, "-m", "designgui.cli", "export", "--port", str(STATIC_PORT), "--static"],
+                       cwd=str(tmp_path), check=True, capture_output=True, timeout=60)
+        prod_dir = tmp_path / "production_app"
+        proc = subprocess.Popen([sys.executable, "main.py"], cwd=str(prod_dir),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            assert _wait_for_server(STATIC_PORT), "exported app did not boot"
+            page = httpx.get(f"http://localhost:{STATIC_PORT}/home", timeout=5)
+            assert page.status_code == 200 and "Home" in page.text
+            assert "socket.io" not in page.text, "static pages load no NiceGUI runtime"
+            assert "must-revalidate" in page.headers["cache-control"]
+            etag = page.headers["etag"]
+            revalidated = httpx.get(f"http://localhost:{STATIC_PORT}/home", headers={"If-None-Match": etag}, timeout=5)
+            assert revalidated.status_code == 304 and revalidated.content == b""
+            assert httpx.get(f"http://localhost:{STATIC_PORT}/", timeout=5).headers["etag"] != etag
+
+            live = httpx.get(f"http://localhost:{STATIC_PORT}/editor", timeout=5)
+            assert live.status_code == 200 and "socket.io" in live.text and "etag" not in live.headers
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
 # ---------------------------------------------------------------------------
 # Runtime Validation Tests (The Pi Simulation)
 # ---------------------------------------------------------------------------
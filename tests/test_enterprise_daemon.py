@@ -3,17 +3,19 @@ Enterprise GPU / Autonomous Swarm — Daemon E2E Tests
 =====================================================
 Proves that `designgui start` can run reliably in the background while
 AI agents rapidly generate and overwrite .py view files, and that the
-hot-reload engine (watchdog + NiceGUI ui.timer debounce) doesn't crash.
+hot-reload engine (watchdog + push-based ReloadHub broadcast) doesn't crash.
 
 Architecture under test (server.py):
-    - HotReloadHandler.on_modified() → ui.timer(0.1s) → render_generated_view()
+    - GlobalHotReloadHandler.on_modified() → ReloadHub.publish() → render_generated_view()
     - render_generated_view() purges sys.modules, re-imports via importlib.util
     - All exceptions are caught and rendered in the preview pane (server never crashes)
+    - /api/reloads/{view}?hash=... long-polls until that file version has rendered (no fixed sleeps)
 
 Port: 8081 (isolated from default 8080 and export tests on 8082)
 """
 import sys
 import time
+import hashlib
 import subprocess
 import textwrap
 import json
@@ -26,7 +28,7 @@ import pytest
 # ---------------------------------------------------------------------------
 DAEMON_PORT = 8081
 SERVER_BOOT_TIMEOUT = 20  # seconds — NiceGUI first boot can be slow
-WATCHDOG_SETTLE_TIME = 3  # seconds — watchdog on_modified + ui.timer(0.1) + margin
+RELOAD_WAIT_TIMEOUT = 15  # seconds — upper bound for /api/reloads long-polls, not a sleep
 STRESS_WRITES = 5
 STRESS_INTERVAL = 0.4  # seconds between rapid saves
 
@@ -39,6 +41,18 @@ def _write_view(views_dir: Path, filename: str, content: str):
     (views_dir / filename).write_text(textwrap.dedent(content), encoding="utf-8")
 
 
+def _wait_for_reload(views_dir: Path, filename: str) -> dict:
+    """Long-poll until the server has rendered the file's current content; return its reload state."""
+    import httpx
+    digest = hashlib.sha256((views_dir / filename).read_bytes()).hexdigest()
+    r = httpx.get(f"http://localhost:{DAEMON_PORT}/api/reloads/{filename}",
+                  params={"hash": digest, "timeout": RELOAD_WAIT_TIMEOUT}, timeout=RELOAD_WAIT_TIMEOUT + 5)
+    assert r.status_code == 200, r.text
+    state = r.json()
+    assert not state["timed_out"], f"{filename} was not reloaded within {RELOAD_WAIT_TIMEOUT}s: {state}"
+    return state
+
+
 def _scaffold_project(project_dir: Path):
     """Manually scaffold a .designgui project (avoids interactive typer.prompt)."""
     designgui_dir = project_dir / ".designgui"
@@ -164,7 +178,9 @@ class TestHotReload:
                     Text('Hot Reloaded View', base_classes=['text-3xl', 'font-bold'])
         """)
 
-        time.sleep(WATCHDOG_SETTLE_TIME)
+        state = _wait_for_reload(views_dir, "dashboard.py")
+        assert state["status"] == "ok", state["outcome"]
+        assert state["outcome"]["element_count"] == 2
 
         r = httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5)
         assert r.status_code == 200
@@ -210,7 +226,8 @@ class TestHotReload:
 
         for i, view_code in enumerate(composite_views):
             _write_view(views_dir, "dashboard.py", view_code)
-            time.sleep(WATCHDOG_SETTLE_TIME)
+            state = _wait_for_reload(views_dir, "dashboard.py")
+            assert state["status"] == "ok", state["outcome"]
 
             r = httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5)
             assert r.status_code == 200, f"Server failed after composite write #{i+1}"
@@ -229,12 +246,33 @@ class TestHotReload:
                     Text('Analytics Dashboard', base_classes=['text-xl'])
         """)
 
-        time.sleep(WATCHDOG_SETTLE_TIME)
+        assert _wait_for_reload(views_dir, "analytics.py")["status"] == "ok"
 
         r = httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5)
         assert r.status_code == 200
         assert proc.poll() is None, "Server crashed after new file creation"
 
+    def test_unwatched_view_renders_only_when_asked(self, daemon_env):
+        """A save no client shows and nobody waits for is tracked, but not rendered until a waiter asks."""
+        import httpx
+        proc, views_dir = daemon_env
+
+        _write_view(views_dir, "zz_unseen.py", """\
+            from designgui.ui_lib.primitives import Text
+
+            def render_view():
+                Text('Nobody looks at me')
+        """)
+        deadline = time.monotonic() + RELOAD_WAIT_TIMEOUT
+        state = {}
+        while time.monotonic() < deadline and state.get("generation", 0) < 1:
+            state = httpx.get(f"http://localhost:{DAEMON_PORT}/api/reloads", timeout=5).json().get("zz_unseen.py", {})
+            time.sleep(0.1)
+        assert state["status"] == "stale" and state["outcome"] is None, state
+
+        state = _wait_for_reload(views_dir, "zz_unseen.py")
+        assert state["status"] == "ok" and state["outcome"]["element_count"] == 1, state
+
 
 class TestServerResilience:
     """Verify the server survives adversarial conditions."""
@@ -254,8 +292,9 @@ class TestServerResilience:
             """)
             time.sleep(STRESS_INTERVAL)
 
-        # Wait for all debounced reloads to settle
-        time.sleep(WATCHDOG_SETTLE_TIME)
+        # Only the last write has to render; earlier generations may be superseded
+        state = _wait_for_reload(views_dir, "dashboard.py")
+        assert state["status"] == "ok"
 
         r = httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5)
         assert r.status_code == 200, "Server failed after rapid save stress test"
@@ -273,7 +312,10 @@ class TestServerResilience:
             encoding="utf-8"
         )
 
-        time.sleep(WATCHDOG_SETTLE_TIME)
+        state = _wait_for_reload(views_dir, "dashboard.py")
+        assert state["status"] == "error"
+        assert state["outcome"]["stage"] == "exec"
+        assert "SyntaxError" in state["outcome"]["error"]
 
         r = httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5)
         assert r.status_code == 200, "Server should still return 200 even with broken view"
@@ -287,4 +329,141 @@ class TestServerResilience:
                 with Stack(base_classes=['p-4']):
                     Text('Recovered', base_classes=['text-lg'])
         """)
-        time.sleep(WATCHDOG_SETTLE_TIME)
+        assert _wait_for_reload(views_dir, "dashboard.py")["status"] == "ok"
+
+
+class TestMetricsEndpoint:
+    """Verify /metrics exposes the daemon's instrumentation after the reloads above."""
+
+    def test_metrics_endpoint_reports_reloads(self, daemon_env):
+        import httpx
+        proc, _ = daemon_env
+
+        r = httpx.get(f"http://localhost:{DAEMON_PORT}/metrics", timeout=5)
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+        samples = {}
+        for line in r.text.splitlines():
+            if line and not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                samples[name] = float(value)
+        assert samples["designgui_watcher_events_total"] > 0
+        assert samples["designgui_reloads_total"] > 0
+        assert samples["designgui_module_exec_seconds_count"] > 0
+        assert "designgui_connected_clients" in samples
+        assert "designgui_live_elements" in samples
+        assert proc.poll() is None
+
+    def test_memory_diagnostics_report(self, daemon_env):
+        """Element counts per client and view versions are reported even with tracing off."""
+        import httpx
+        proc, _ = daemon_env
+        httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5)
+
+        report = httpx.get(f"http://localhost:{DAEMON_PORT}/api/diagnostics/memory", timeout=10).json()
+        assert report["rss_mb"] > 0 and report["rss_history"]
+        assert report["top_growth"] is None, "tracemalloc stays off unless diagnostics are enabled"
+        assert any(c["path"] == "/" and c["elements"] > 0 for c in report["clients"])
+        assert any(path.endswith("dashboard.py") for path in report["view_versions"])
+        assert isinstance(report["lingering_versions"], list)
+        assert proc.poll() is None
+
+
+class TestLocalStylesheet:
+    """Verify the preview links a locally compiled Tailwind stylesheet instead of the CDN script."""
+
+    def test_page_links_cacheable_local_stylesheet(self, daemon_env):
+        import httpx
+        import re
+
+        page = httpx.get(f"http://localhost:{DAEMON_PORT}/", timeout=5).text
+        assert "cdn.tailwindcss.com" not in page
+        href = re.search(r'<link rel="stylesheet" href="([^"]+)" data-designgui-tailwind>', page).group(1)
+
+        r = httpx.get(f"http://localhost:{DAEMON_PORT}{href}", timeout=5)
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/css")
+        assert "immutable" in r.headers["cache-control"]
+        assert ".text-gray-800{" in r.text  # preview chrome
+        assert ".justify-between{" in r.text
+
+        r = httpx.get(f"http://localhost:{DAEMON_PORT}{href}", headers={"If-None-Match": r.headers["etag"]}, timeout=5)
+        assert r.status_code == 304
+
+
+class TestRenderApi:
+    """Verify agents can submit view source over HTTP and get the result in the same request."""
+
+    def test_submit_and_persist_view(self, daemon_env):
+        import httpx
+        proc, views_dir = daemon_env
+        source = textwrap.dedent("""\
+            from designgui.ui_lib.primitives import Stack, Text
+
+            def render_view():
+                with Stack(base_classes=['p-8']):
+                    Text('Submitted over HTTP', base_classes=['text-xl'])
+        """)
+
+        r = httpx.post(f"http://localhost:{DAEMON_PORT}/api/render",
+                       json={"source": source, "name": "submitted_view.py", "html": True}, timeout=10)
+        assert r.status_code == 200
+        report = r.json()
+        assert report["ok"], report
+        assert report["element_count"] == 2
+        assert "Submitted over HTTP" in report["html"]
+        assert not (views_dir / "submitted_view.py").exists(), "Only persist=true may write the file"
+
+        r = httpx.post(f"http://localhost:{DAEMON_PORT}/api/render",
+                       json={"source": source, "name": "submitted_view.py", "persist": True}, timeout=10)
+        assert r.json()["ok"]
+        assert (views_dir / "submitted_view.py").read_text(encoding="utf-8") == source
+        assert proc.poll() is None
+
+    def test_broken_submission_returns_report_not_500(self, daemon_env):
+        import httpx
+        proc, views_dir = daemon_env
+
+        r = httpx.post(f"http://localhost:{DAEMON_PORT}/api/render",
+                       json={"source": "def render_view(:\n    pass\n", "name": "bad.py", "persist": True}, timeout=10)
+        assert r.status_code == 200
+        report = r.json()
+        assert not report["ok"] and report["stage"] == "exec"
+        assert "SyntaxError" in report["error"]
+        assert not (views_dir / "bad.py").exists()
+
+        r = httpx.post(f"http://localhost:{DAEMON_PORT}/api/render", json={"name": "x.py"}, timeout=10)
+        assert r.status_code == 400
+        assert proc.poll() is None
+
+    def test_non_loopback_client_is_refused(self, daemon_env):
+        import httpx
+        proc, views_dir = daemon_env
+        # uvicorn trusts X-Forwarded-For from loopback, so this is how a reverse proxy presents a remote client
+        remote = {"X-Forwarded-For": "203.0.113.7"}
+
+        r = httpx.post(f"http://localhost:{DAEMON_PORT}/api/render", headers=remote,
+                       json={"source": "def render_view():\n    pass\n", "name": "remote.py", "persist": True}, timeout=10)
+        assert r.status_code == 403
+        assert not (views_dir / "remote.py").exists()
+        for method, path in (("GET", "/api/reloads"), ("GET", "/api/reloads/dashboard.py?timeout=0"),
+                             ("POST", "/api/check"), ("GET", "/api/diagnostics/memory")):
+            assert httpx.request(method, f"http://localhost:{DAEMON_PORT}{path}", headers=remote, timeout=10).status_code == 403, path
+        assert httpx.get(f"http://localhost:{DAEMON_PORT}/api/reloads", timeout=10).status_code == 200
+
+    def test_batch_check_endpoint(self, daemon_env):
+        import httpx
+        proc, views_dir = daemon_env
+
+        r = httpx.post(f"http://localhost:{DAEMON_PORT}/api/check", json={"views": ["dashboard.py", "missing.py"]}, timeout=60)
+        assert r.status_code == 200
+        report = r.json()
+        by_name = {v["view"]: v for v in report["views"]}
+        assert by_name["dashboard.py"]["ok"], by_name["dashboard.py"]
+        assert by_name["missing.py"]["stage"] == "read"
+        assert report["ok"] is False
+
+        r = httpx.post(f"http://localhost:{DAEMON_PORT}/api/check", json={"views": ["../etc/passwd"]}, timeout=10)
+        assert r.status_code == 400
+        assert proc.poll() is None
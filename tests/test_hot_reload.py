@@ -0,0 +1,179 @@
+"""
+Push-Based Hot Reload — Unit Tests
+==================================
+Proves that the ReloadHub hands watchdog events from the observer thread to the
+asyncio loop, coalesces bursts per file, drops no-op saves by content hash, and
+fans the resulting change set out to every subscribed client without polling.
+
+Architecture under test (watcher.py):
+    - GlobalHotReloadHandler.on_modified() → ReloadHub.publish(path) (observer thread)
+    - ReloadHub.publish() → loop.call_soon_threadsafe → per-file debounce → hash check
+    - One broadcast per settled batch → client callbacks receive frozenset of changed paths
+"""
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+from designgui.watcher import ReloadHub, start_observer
+
+DEBOUNCE_MS = 50
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _write(path: Path, content: str):
+    path.write_text(content, encoding="utf-8")
+
+
+def test_publish_from_foreign_thread_reaches_all_subscribers(tmp_path):
+    """publish() called off-loop must invoke every callback on the loop thread."""
+    view = tmp_path / "dashboard.py"
+    _write(view, "x = 1\n")
+
+    async def scenario():
+        hub = ReloadHub(debounce_ms=DEBOUNCE_MS)
+        loop = asyncio.get_running_loop()
+        hub.bind_loop(loop)
+        loop_thread = threading.get_ident()
+        calls = []
+        done = asyncio.Event()
+
+        def make_cb(i):
+            def cb(changed):
+                calls.append((i, threading.get_ident(), changed))
+                if len(calls) == 120:
+                    done.set()
+            return cb
+
+        for i in range(120):
+            hub.subscribe(make_cb(i))
+
+        threading.Thread(target=hub.publish, args=(view,)).start()
+        await asyncio.wait_for(done.wait(), timeout=2)
+
+        assert sorted(i for i, _, _ in calls) == list(range(120))
+        assert all(tid == loop_thread for _, tid, _ in calls), "Callbacks must run on the event loop thread"
+        assert all(changed == frozenset({view}) for _, _, changed in calls)
+        assert hub.generation == 1
+
+    _run(scenario())
+
+
+def test_failing_subscriber_does_not_starve_others(tmp_path):
+    """An exception in one client's reload must not prevent the next clients from reloading."""
+    view = tmp_path / "dashboard.py"
+    _write(view, "x = 1\n")
+
+    async def scenario():
+        hub = ReloadHub(debounce_ms=DEBOUNCE_MS)
+        hub.bind_loop(asyncio.get_running_loop())
+        reached = asyncio.Event()
+
+        def broken(changed):
+            raise RuntimeError("boom")
+
+        hub.subscribe(broken)
+        hub.subscribe(lambda changed: reached.set())
+        hub.publish(view)
+        await asyncio.wait_for(reached.wait(), timeout=2)
+
+    _run(scenario())
+
+
+def test_unsubscribe_and_unbound_publish(tmp_path):
+    """Unsubscribed callbacks are skipped; publishing before a loop is bound is a no-op."""
+    view = tmp_path / "dashboard.py"
+    _write(view, "x = 1\n")
+    hub = ReloadHub(debounce_ms=DEBOUNCE_MS)
+    hub.publish(view)  # no loop yet — must not raise
+    assert hub.generation == 0
+
+    async def scenario():
+        hub.bind_loop(asyncio.get_running_loop())
+        calls = []
+        cb = lambda changed: calls.append(changed)
+        hub.subscribe(cb)
+        hub.unsubscribe(cb)
+        hub.unsubscribe(cb)  # idempotent
+        hub.publish(view)
+        await asyncio.sleep(DEBOUNCE_MS / 1000 * 3)
+        assert calls == []
+        assert hub.subscriber_count == 0
+
+    _run(scenario())
+
+
+def test_twenty_rapid_saves_coalesce_into_one_broadcast(tmp_path):
+    """20 saves inside one debounce window through a real observer → exactly one reload."""
+    view = tmp_path / "dashboard.py"
+    _write(view, "def render_view():\n    pass\n")
+
+    async def scenario():
+        hub = ReloadHub(debounce_ms=300)
+        hub.bind_loop(asyncio.get_running_loop())
+        batches = []
+        hub.subscribe(batches.append)
+        observer = start_observer(hub, str(tmp_path))
+        try:
+            for i in range(20):
+                _write(view, f"def render_view():\n    return {i}\n")
+            await asyncio.sleep(1.5)
+        finally:
+            observer.stop()
+            observer.join()
+        assert batches == [frozenset({view})], f"Expected exactly one coalesced reload, got {batches}"
+
+    _run(scenario())
+
+
+def test_atomic_save_with_rename_is_one_change(tmp_path):
+    """Editor-style atomic save (write temp, rename over target) produces a single change for the target."""
+    view = tmp_path / "dashboard.py"
+    _write(view, "x = 1\n")
+
+    async def scenario():
+        hub = ReloadHub(debounce_ms=200)
+        hub.bind_loop(asyncio.get_running_loop())
+        batches = []
+        hub.subscribe(batches.append)
+        observer = start_observer(hub, str(tmp_path))
+        try:
+            tmp_file = tmp_path / ".dashboard.py.tmp"
+            _write(tmp_file, "x = 2\n")
+            os.replace(tmp_file, view)
+            _write(view, "x = 2\n")  # trailing modify event with identical content
+            await asyncio.sleep(1.0)
+        finally:
+            observer.stop()
+            observer.join()
+        assert len(batches) == 1
+        assert view in batches[0]
+
+    _run(scenario())
+
+
+def test_unchanged_content_is_dropped(tmp_path):
+    """Re-saving byte-identical content must not trigger a reload."""
+    view = tmp_path / "dashboard.py"
+    _write(view, "x = 1\n")
+
+    async def scenario():
+        hub = ReloadHub(debounce_ms=DEBOUNCE_MS)
+        hub.bind_loop(asyncio.get_running_loop())
+        hub.prime([view])
+        batches = []
+        hub.subscribe(batches.append)
+        _write(view, "x = 1\n")
+        hub.publish(view)
+        await asyncio.sleep(DEBOUNCE_MS / 1000 * 4)
+        assert batches == []
+
+        _write(view, "x = 2\n")
+        hub.publish(view)
+        await asyncio.sleep(DEBOUNCE_MS / 1000 * 4)
+        assert batches == [frozenset({view})]
+
+    _run(scenario())
@@ -0,0 +1,66 @@
+"""
+Import-Time Budget Tests
+========================
+Agents invoke the CLI many times per session, so its startup must stay cheap:
+metadata commands never import NiceGUI (or the server stack behind it), and
+`python -X importtime` for the CLI module stays under a fixed budget.
+ui_lib components load on first access, only the submodule that defines them.
+
+Architecture under test (cli.py, __init__.py, ui_lib/__init__.py):
+    - heavy imports live inside the commands that need them
+    - designgui.__version__ and ui_lib exports resolve through module __getattr__
+"""
+import subprocess
+import sys
+
+# Generous for slow CI machines; a regression that imports NiceGUI costs close to a second
+CLI_IMPORT_BUDGET_MS = 300
+
+HEAVY_MODULES = ("nicegui", "fastapi", "uvicorn", "watchdog", "designgui.server")
+
+
+def _importtime(code: str) -> dict:
+    """Cumulative import time in microseconds per module, as reported by `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_stays_within_budget_and_skips_heavy_modules():
+    times = _importtime("import designgui.cli")
+    assert not [m for m in times if m.split(".")[0] in HEAVY_MODULES or m in HEAVY_MODULES]
+    assert times["designgui.cli"] / 1000 < CLI_IMPORT_BUDGET_MS, times["designgui.cli"]
+
+
+def test_version_command_does_not_import_nicegui():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, runpy; sys.argv = ['designgui', '--version']\n"
+                               "try:\n    runpy.run_module('designgui.cli', run_name='__main__')\n"
+                               "except SystemExit:\n    pass\n"
+                               "print('nicegui' in sys.modules)"],
+        capture_output=True, text=True, timeout=60)
+    assert "DesignGUI Version:" in result.stdout
+    assert result.stdout.strip().endswith("False"), result.stdout
+
+
+def _loaded_modules(code: str) -> set:
+    result = subprocess.run([sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.split())
+
+
+def test_ui_lib_exports_load_lazily():
+    modules = _loaded_modules("import designgui.ui_lib as u\nassert 'Button' in u.__all__ and 'Button' in dir(u)")
+    assert "nicegui" not in modules
+
+    modules = _loaded_modules("from designgui.ui_lib import Text")
+    assert "designgui.ui_lib.primitives" in modules
+    assert "designgui.ui_lib.composites" not in modules
+    assert "designgui.ui_lib.display" not in modules
@@ -0,0 +1,115 @@
+"""
+Reload-Surviving Memoization Tests
+==================================
+Proves that a @memoize'd data loader inside a view keeps its result across hot
+reloads that only touch the rest of the view, recomputes once its own body
+changes, and that the shared store evicts by entry count and by size.
+
+Architecture under test (memo.py, loader.py):
+    - keys are (qualname, file, hash of the loader's source, arguments)
+    - the store lives in designgui.memo, which reloads never purge
+"""
+import textwrap
+from pathlib import Path
+
+from designgui.loader import ViewModuleCache
+from designgui.memo import DataCache, memoize
+
+
+def _write_view(path: Path, rows: int, heading: str):
+    path.write_text(textwrap.dedent(f"""\
+        from designgui.memo import memoize
+
+        @memoize
+        def load_rows(count):
+            LOADS.append(count)
+            return [{{"id": i}} for i in range({rows} + count)]
+
+        def render_view():
+            return {heading!r}, len(load_rows(0))
+    """), encoding="utf-8")
+
+
+def test_loader_result_survives_cosmetic_reloads(tmp_path, monkeypatch):
+    loads = []
+    monkeypatch.setattr("builtins.LOADS", loads, raising=False)
+    cache = ViewModuleCache()
+    view = tmp_path / "orders.py"
+
+    _write_view(view, rows=1000, heading="Orders")
+    assert cache.acquire(view, owner="a").render() == ("Orders", 1000)
+
+    # Only the rendering changed: the new module version reuses the loaded rows
+    _write_view(view, rows=1000, heading="All Orders")
+    assert cache.acquire(view, owner="a").render() == ("All Orders", 1000)
+    assert loads == [0]
+
+    # The loader's own body changed: its data is loaded again
+    _write_view(view, rows=5, heading="All Orders")
+    assert cache.acquire(view, owner="a").render() == ("All Orders", 5)
+    assert loads == [0, 0]
+
+
+def test_same_loader_text_in_two_views_is_not_shared(tmp_path):
+    cache = ViewModuleCache()
+    for name in ("orders", "invoices"):
+        (tmp_path / f"{name}.py").write_text(textwrap.dedent(f"""\
+            from designgui.memo import memoize
+
+            FIXTURE = {name + '.csv'!r}
+
+            @memoize
+            def load_fixture():
+                return FIXTURE
+
+            def render_view():
+                return load_fixture()
+        """), encoding="utf-8")
+
+    assert cache.acquire(tmp_path / "orders.py", owner="a").render() == "orders.csv"
+    assert cache.acquire(tmp_path / "invoices.py", owner="a").render() == "invoices.csv"
+
+
+def test_arguments_are_part_of_the_key():
+    calls = []
+    store = DataCache()
+
+    @memoize(cache=store)
+    def load(names, limit=10):
+        calls.append((tuple(names), limit))
+        return names[:limit]
+
+    assert load(["a", "b"], limit=1) == ["a"]
+    assert load(["a", "b"], limit=1) == ["a"]
+    assert load(["a", "b"]) == ["a", "b"]
+    assert calls == [(("a", "b"), 1), (("a", "b"), 10)]
+    assert store.stats()["hits"] == 1
+
+    load.clear()
+    load(["a", "b"], limit=1)
+    assert len(calls) == 3
+
+
+def test_copy_protects_the_cached_value():
+    @memoize(cache=DataCache(), copy=True)
+    def load():
+        return {"rows": [1, 2, 3]}
+
+    load()["rows"].clear()
+    assert load() == {"rows": [1, 2, 3]}
+
+
+def test_lru_eviction_by_entries_and_size():
+    store = DataCache(max_entries=2, max_bytes=10_000)
+    store.put("a", 1, size=10)
+    store.put("b", 2, size=10)
+    store.get("a")  # a is now the most recently used
+    store.put("c", 3, size=10)
+    assert store.get("b") == (False, None)
+    assert store.get("a") == (True, 1)
+
+    store.put("big", b"x", size=9_995)
+    assert len(store) == 1 and store.get("big")[0], "both older entries must make room"
+    store.put("huge", b"x", size=20_000)
+    assert store.get("huge") == (False, None), "values larger than the store are not cached"
+    assert store.stats()["bytes"] == 9_995
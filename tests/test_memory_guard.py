@@ -0,0 +1,97 @@
+"""
+Memory Guard — Diagnostics & Ceiling Tests
+==========================================
+Proves that the preview's memory guard trips its ceiling exactly once, refuses a
+ceiling it could never get under, and (in diagnostics mode) attributes heap
+growth to the file and line that allocated it.
+
+Architecture under test (diagnostics.py, server.py):
+    - MemoryGuard.sample() records RSS and a tracemalloc snapshot
+    - MemoryGuard.top_growth() diffs the latest snapshot against the baseline
+    - _restart_command() rebuilds the command line a recycle re-executes
+"""
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+from designgui.diagnostics import MemoryGuard
+
+
+@pytest.fixture()
+def traced():
+    was_tracing = tracemalloc.is_tracing()
+    yield
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def test_ceiling_trips_once():
+    guard = MemoryGuard(ceiling_mb=1e6)
+    guard.start()
+    assert guard.sample() is False
+    guard.ceiling_mb = 1
+    assert guard.sample() is True
+    assert guard.sample() is False, "a tripped guard must not request a second recycle"
+    assert guard.report()["tripped"]
+
+
+def test_ceiling_below_startup_rss_is_not_enforced():
+    guard = MemoryGuard(ceiling_mb=1)
+    guard.start()
+    assert guard.ceiling_mb is None
+    assert guard.sample() is False
+
+
+def test_top_growth_points_at_the_allocating_line(traced):
+    guard = MemoryGuard(tracing=True, top=5)
+    guard.start()
+    leak = [bytearray(1024) for _ in range(2000)]  # the leaking line
+    guard.sample()
+    growth = guard.top_growth()
+    assert growth[0]["site"].endswith(f"test_memory_guard.py:{_line_of('the leaking line')}")
+    assert growth[0]["size_diff_kb"] >= 2000
+    assert len(leak) == 2000
+
+
+def test_report_without_tracing_has_no_growth_sites():
+    guard = MemoryGuard()
+    guard.start()
+    guard.sample()
+    report = guard.report()
+    assert report["top_growth"] is None and report["traced_mb"] is None
+    assert len(report["rss_history"]) == 1
+
+
+def _line_of(marker: str) -> int:
+    with open(__file__, encoding="utf-8") as f:
+        return next(i for i, line in enumerate(f, 1) if marker in line and "_line_of" not in line)
+
+
+PRINT_RESTART_COMMAND = "from designgui.server import _restart_command; print(_restart_command())"
+
+
+def test_restart_command_repeats_how_the_process_was_started(tmp_path):
+    def restart_command(*args):
+        out = subprocess.run([sys.executable, *args, "start", "--port", "9"], cwd=str(tmp_path),
+                             capture_output=True, text=True, timeout=60, env={"PYTHONPATH": str(tmp_path)})
+        assert out.returncode == 0, out.stderr
+        return out.stdout.strip()
+
+    (tmp_path / "probe.py").write_text(PRINT_RESTART_COMMAND, encoding="utf-8")
+    assert restart_command("-m", "probe") == str([sys.executable, "-m", "probe", "start", "--port", "9"])
+    script = str(tmp_path / "probe.py")
+    assert restart_command(script) == str([sys.executable, script, "start", "--port", "9"])
+    # Nothing to repeat: the ceiling is reported instead of shutting the server down for good
+    assert restart_command("-c", PRINT_RESTART_COMMAND) == "None"
+
+
+def test_recycle_is_skipped_when_the_process_cannot_be_restarted(monkeypatch):
+    from designgui import server
+    monkeypatch.setattr(server, "_restart_argv", None)
+    monkeypatch.setattr(server, "_recycle_skipped", None)
+    monkeypatch.setattr(server.app, "shutdown", lambda: pytest.fail("the server must keep running"))
+    server._recycle("RSS exceeded the 1 MB memory ceiling")
+    assert not server._recycle_requested
+    assert "RSS exceeded" in server._recycle_skipped
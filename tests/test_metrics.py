@@ -0,0 +1,82 @@
+"""
+Daemon Instrumentation — Metrics Exposition Tests
+=================================================
+Proves that the built-in registry renders valid Prometheus text exposition and
+that the reload pipeline feeds it.
+
+Architecture under test (metrics.py, watcher.py):
+    - Counter / Gauge / Histogram render HELP, TYPE and samples per metric
+    - ReloadHub.publish() counts watcher events, each broadcast counts one reload
+    - ReloadHub.batch_started marks the first event behind a broadcast (save-to-render latency)
+"""
+import asyncio
+import time
+
+import pytest
+
+from designgui.metrics import Counter, Gauge, Histogram, Registry, RELOADS, WATCHER_EVENTS
+from designgui.watcher import ReloadHub
+
+
+def test_exposition_format():
+    registry = Registry()
+    errors = registry.register(Counter("errors_total", "Errors.", ["stage"]))
+    registry.register(Gauge("clients", "Clients.", lambda: 3))
+    latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+
+    errors.inc(stage="render")
+    errors.inc(2, stage='say "hi"')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(7)
+
+    assert registry.expose().splitlines() == [
+        "# HELP errors_total Errors.",
+        "# TYPE errors_total counter",
+        'errors_total{stage="render"} 1',
+        'errors_total{stage="say \\"hi\\""} 2',
+        "# HELP clients Clients.",
+        "# TYPE clients gauge",
+        "clients 3",
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 7.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_counter_rejects_wrong_labels():
+    counter = Counter("renders_total", "Renders.", ["trigger"])
+    with pytest.raises(ValueError):
+        counter.inc(stage="render")
+
+
+def test_hub_counts_events_and_marks_batch_start(tmp_path):
+    view = tmp_path / "dashboard.py"
+    view.write_text("x = 1\n", encoding="utf-8")
+
+    async def scenario():
+        hub = ReloadHub(debounce_ms=50)
+        hub.bind_loop(asyncio.get_running_loop())
+        hub.prime([view])
+        batches = []
+        hub.subscribe(batches.append)
+
+        events_before, reloads_before = WATCHER_EVENTS.value(), RELOADS.value()
+        first_event = time.monotonic()
+        view.write_text("x = 2\n", encoding="utf-8")
+        for _ in range(5):
+            hub.publish(view)
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+
+        assert len(batches) == 1
+        assert WATCHER_EVENTS.value() - events_before == 5
+        assert RELOADS.value() - reloads_before == 1
+        # The latency clock starts at the first event of the burst, not when the debounce settled
+        assert first_event <= hub.batch_started < first_event + 0.03
+
+    asyncio.run(scenario())
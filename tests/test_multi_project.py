@@ -0,0 +1,208 @@
+"""
+Multi-Project Preview — E2E Tests
+=================================
+Proves that one `designgui start` process can serve several project roots under
+URL prefixes, each with its own watcher, config and view index, and that projects
+can be mounted and unmounted while the server runs.
+
+Architecture under test (server.py, projects.py):
+    - run_server(mounts=...) mounts config.json "projects" under /p/<name>/
+    - POST/DELETE /api/projects mount and unmount at runtime
+    - /p/<name>/api/... answers for that project only; every project has its own
+      `product` package, which must never leak into another project's views
+
+Port: 8084 (isolated from the daemon e2e tests on 8081 and lifecycle tests on 8083)
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PORT = 8084
+SERVER_BOOT_TIMEOUT = 20
+RELOAD_WAIT_TIMEOUT = 15
+
+VIEW = """\
+from designgui.ui_lib.primitives import Stack, Text
+from product.models import TITLE
+
+def render_view():
+    with Stack(base_classes=['p-8']):
+        Text(TITLE)
+"""
+
+
+def _scaffold(project_dir: Path, title: str, font_family: str = "Inter, sans-serif") -> Path:
+    """A project whose `product.models` differs per project, so a leaked import is visible in the output."""
+    views_dir = project_dir / ".designgui" / "product" / "views"
+    views_dir.mkdir(parents=True)
+    (views_dir.parent / "__init__.py").touch()
+    (views_dir / "__init__.py").touch()
+    (views_dir.parent / "models.py").write_text(f"TITLE = {title!r}\n", encoding="utf-8")
+    (views_dir / "dashboard.py").write_text(VIEW, encoding="utf-8")
+    config = {"daemon_port": PORT, "locale": "en-US", "font_family": font_family,
+              "paths": {"views": ".designgui/product/views"}}
+    (project_dir / ".designgui" / "config.json").write_text(json.dumps(config, indent=2), encoding="utf-8")
+    return views_dir
+
+
+def _url(path: str) -> str:
+    return f"http://localhost:{PORT}{path}"
+
+
+def _render(prefix: str = "") -> dict:
+    import httpx
+    r = httpx.post(_url(f"{prefix}/api/render"), json={"source": VIEW, "name": "probe.py", "html": True}, timeout=10)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+@pytest.fixture(scope="module")
+def multi_env(tmp_path_factory):
+    import httpx
+    root = tmp_path_factory.mktemp("multi")
+    host, beta, gamma = root / "host", root / "beta", root / "gamma"
+    _scaffold(host, "Host Title")
+    _scaffold(beta, "Beta Title", font_family="Beta Sans, sans-serif")
+    _scaffold(gamma, "Gamma Title")
+    config_path = host / ".designgui" / "config.json"
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    config["projects"] = {"beta": str(beta)}
+    config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+
+    proc = subprocess.Popen([sys.executable, "-m", "designgui.cli", "start", "--port", str(PORT)], cwd=str(host),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            env={**os.environ, "PYTHONPATH": str(host)})
+    deadline = time.time() + SERVER_BOOT_TIMEOUT
+    while time.time() < deadline:
+        try:
+            if httpx.get(_url("/api/health"), timeout=2).status_code == 200:
+                break
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    else:
+        proc.kill()
+        pytest.skip(f"Server failed to boot on port {PORT}: {proc.stderr.read().decode(errors='replace')[:500]}")
+
+    yield proc, {"host": host, "beta": beta, "gamma": gamma}
+
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait(timeout=5)
+
+
+class TestMountedProjects:
+
+    def test_projects_from_config_are_served_under_prefix(self, multi_env):
+        import httpx
+        proc, roots = multi_env
+        listed = {p["name"]: p for p in httpx.get(_url("/api/projects"), timeout=5).json()["projects"]}
+        assert listed["default"]["url"] == "/" and listed["beta"]["url"] == "/p/beta"
+        assert listed["beta"]["views"] == 1 and listed["beta"]["watching"]
+
+        # Each page carries its own project's config.json font
+        page = httpx.get(_url("/p/beta"), timeout=5).text
+        assert "Beta Sans" in page and "Beta Title" in page
+        assert "Beta Sans" not in httpx.get(_url("/"), timeout=5).text
+        assert httpx.get(_url("/p/nope"), timeout=5).status_code == 404
+        assert httpx.get(_url("/api/health"), timeout=5).json()["projects"] == 2
+
+    def test_product_package_never_leaks_between_projects(self, multi_env):
+        # Alternate on purpose: every switch must re-resolve `product.models` in the right tree
+        for _ in range(2):
+            assert "Host Title" in _render()["html"]
+            assert "Beta Title" in _render("/p/beta")["html"]
+
+    def test_watchers_are_scoped_per_project(self, multi_env):
+        import httpx
+        proc, roots = multi_env
+        before = httpx.get(_url("/api/reloads"), timeout=5).json()["dashboard.py"]["generation"]
+
+        models = roots["beta"] / ".designgui" / "product" / "models.py"
+        models.write_text("TITLE = 'Beta Edited'\n", encoding="utf-8")
+        r = httpx.get(_url("/p/beta/api/reloads/dashboard.py"),
+                      params={"generation": 1, "timeout": RELOAD_WAIT_TIMEOUT},
+                      timeout=RELOAD_WAIT_TIMEOUT + 5)
+        state = r.json()
+        assert not state["timed_out"] and state["status"] == "ok", state
+        assert "Beta Edited" in _render("/p/beta")["html"]
+
+        # The host project's view saw none of it
+        assert httpx.get(_url("/api/reloads"), timeout=5).json()["dashboard.py"]["generation"] == before
+        assert proc.poll() is None
+
+    def test_mount_and_unmount_at_runtime(self, multi_env):
+        import httpx
+        proc, roots = multi_env
+        r = httpx.post(_url("/api/projects"), json={"name": "gamma", "root": str(roots["gamma"])}, timeout=10)
+        assert r.status_code == 201, r.text
+        assert r.json()["url"] == "/p/gamma"
+        assert "Gamma Title" in _render("/p/gamma")["html"]
+        assert httpx.get(_url("/p/gamma"), timeout=5).status_code == 200
+
+        # Saves in the newly mounted tree are picked up by its own watcher
+        view = roots["gamma"] / ".designgui" / "product" / "views" / "dashboard.py"
+        view.write_text(VIEW.replace("Text(TITLE)", "Text(TITLE + '!')"), encoding="utf-8")
+        r = httpx.get(_url("/p/gamma/api/reloads/dashboard.py"),
+                      params={"hash": hashlib.sha256(view.read_bytes()).hexdigest(), "timeout": RELOAD_WAIT_TIMEOUT},
+                      timeout=RELOAD_WAIT_TIMEOUT + 5)
+        assert r.json()["status"] == "ok", r.json()
+
+        assert httpx.post(_url("/api/projects"), json={"name": "gamma", "root": str(roots["gamma"])},
+                          timeout=5).status_code == 409
+        assert httpx.post(_url("/api/projects"), json={"name": "../x", "root": str(roots["gamma"])},
+                          timeout=5).status_code == 400
+        assert httpx.post(_url("/api/projects"), json={"name": "empty", "root": str(roots["host"] / "missing")},
+                          timeout=5).status_code == 400
+        # A views directory alone is not enough: the root must be a project with its own config.json
+        loose = roots["host"].parent / "loose"
+        (loose / ".designgui" / "product" / "views").mkdir(parents=True)
+        r = httpx.post(_url("/api/projects"), json={"name": "loose", "root": str(loose)}, timeout=5)
+        assert r.status_code == 400 and "config.json" in r.json()["error"]
+
+        r = httpx.delete(_url("/api/projects/gamma"), timeout=10)
+        assert r.status_code == 200 and not r.json()["watching"]
+        assert httpx.get(_url("/p/gamma/api/reloads"), timeout=5).status_code == 404
+        assert httpx.get(_url("/p/gamma"), timeout=5).status_code == 404
+        assert httpx.delete(_url("/api/projects/default"), timeout=5).status_code == 400
+        assert "Host Title" in _render()["html"]
+        assert proc.poll() is None
+
+    def test_project_routes_refuse_non_loopback_clients(self, multi_env):
+        import httpx
+        proc, roots = multi_env
+        remote = {"X-Forwarded-For": "203.0.113.7"}
+        assert httpx.get(_url("/api/projects"), headers=remote, timeout=5).status_code == 403
+        assert httpx.post(_url("/api/projects"), json={"name": "gamma", "root": str(roots["gamma"])},
+                          headers=remote, timeout=5).status_code == 403
+        assert httpx.delete(_url("/api/projects/beta"), headers=remote, timeout=5).status_code == 403
+        assert httpx.post(_url("/p/beta/api/render"), json={"source": VIEW}, headers=remote, timeout=5).status_code == 403
+        assert {p["name"] for p in httpx.get(_url("/api/projects"), timeout=5).json()["projects"]} == {"default", "beta"}
+
+
+def test_invalid_project_names_in_config_are_refused_at_startup(tmp_path):
+    host, beta = tmp_path / "host", tmp_path / "beta"
+    _scaffold(host, "Host Title")
+    _scaffold(beta, "Beta Title")
+    config_path = host / ".designgui" / "config.json"
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    config["projects"] = {"beta": str(beta), "../up": str(beta)}
+    config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+
+    result = subprocess.run([sys.executable, "-m", "designgui.cli", "start", "--port", str(PORT)], cwd=str(host),
+                            capture_output=True, text=True, timeout=30, env={**os.environ, "PYTHONPATH": str(host)})
+    assert result.returncode == 1
+    assert "'../up'" in result.stderr and "'beta'" not in result.stderr
+
+    from designgui.server import run_server
+    with pytest.raises(ValueError, match="'bad name'"):
+        run_server(port=PORT, mounts={"bad name": str(beta)})
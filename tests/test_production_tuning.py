@@ -0,0 +1,208 @@
+"""
+Production Tuning Tests
+=======================
+Proves that the tuning options of `designgui export` end up in a working entry point:
+responses are compressed by our middleware instead of NiceGUI's fixed gzip, the
+websocket heartbeat follows the configured policy, and multi-process mode pins each
+browser to one worker so its page and websocket reach the same process.
+
+Architecture under test (production.py, export.py render_main(), cli.py export()):
+    - CompressionMiddleware streams brotli/gzip for text responses, passes others through
+    - drop_nicegui_gzip() removes the GZipMiddleware that ui.run() installs
+    - serve_workers() runs workers on loopback ports behind a cookie-sticky proxy that
+      streams both directions at once (a cookie-less POST must not deadlock)
+
+Port: 8093 (isolated from the export tests on 8082-8092)
+"""
+import ast
+import asyncio
+import json
+import re
+import subprocess
+import sys
+import textwrap
+import time
+import zipfile
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import HTMLResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from designgui import production
+
+TUNED_PORT = 8093
+PAGE = "<p>" + "compress me " * 200 + "</p>"
+
+
+def _client(**options) -> TestClient:
+    async def stream(request):
+        async def chunks():
+            for _ in range(3):
+                yield PAGE
+        return StreamingResponse(chunks(), media_type="text/html")
+
+    app = Starlette(routes=[
+        Route("/page", lambda request: HTMLResponse(PAGE)),
+        Route("/tiny", lambda request: HTMLResponse("<p>hi</p>")),
+        Route("/png", lambda request: Response(b"\x89PNG" * 500, media_type="image/png")),
+        Route("/encoded", lambda request: Response(b"x" * 1000, media_type="text/plain",
+                                                   headers={"Content-Encoding": "identity"})),
+        Route("/stream", stream),
+    ])
+    app.add_middleware(production.CompressionMiddleware, **options)
+    return TestClient(app)
+
+
+def test_text_responses_are_compressed():
+    client = _client(encodings=("gzip",))
+    response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip" and "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(PAGE) // 5
+    assert response.text == PAGE
+
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert streamed.headers["content-encoding"] == "gzip" and streamed.text == PAGE * 3
+
+
+def test_other_responses_pass_through():
+    client = _client(encodings=("gzip",))
+    for path in ("/tiny", "/png", "/encoded"):
+        assert "gzip" not in client.get(path, headers={"Accept-Encoding": "gzip"}).headers.get("content-encoding", "")
+    assert "content-encoding" not in client.get("/page", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_brotli_falls_back_to_gzip_when_unavailable():
+    client = _client(encodings=("br", "gzip"))
+    response = client.get("/page", headers={"Accept-Encoding": "br, gzip"})
+    expected = "br" if production.brotli is not None else "gzip"
+    assert response.headers["content-encoding"] == expected and response.text == PAGE
+    if production.brotli is None:
+        assert "content-encoding" not in client.get("/page", headers={"Accept-Encoding": "br"}).headers
+
+
+def test_nicegui_gzip_is_dropped():
+    app = Starlette(routes=[Route("/page", lambda request: HTMLResponse(PAGE))])
+    app.add_middleware(GZipMiddleware)
+    production.drop_nicegui_gzip(app)
+    assert "content-encoding" not in TestClient(app).get("/page", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_sticky_proxy_forwards_cookieless_request_bodies():
+    """A first request with a body must reach the worker while the proxy waits for its response."""
+    import httpx
+
+    async def scenario():
+        async def worker(reader, writer):
+            head = await reader.readuntil(b"\r\n\r\n")
+            body = await reader.readexactly(int(re.search(rb"(?i)content-length: *(\d+)", head).group(1)))
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body))
+            await writer.drain()
+            writer.close()
+
+        backend = await asyncio.start_server(worker, "127.0.0.1", 0)
+        proxy = await asyncio.start_server(production._sticky_handler([backend.sockets[0].getsockname()[1]]),
+                                           "127.0.0.1", 0)
+        try:
+            async with httpx.AsyncClient() as client:
+                return await asyncio.wait_for(
+                    client.post(f"http://127.0.0.1:{proxy.sockets[0].getsockname()[1]}/form", content=PAGE), 5)
+        finally:
+            proxy.close()
+            backend.close()
+
+    response = asyncio.run(scenario())
+    assert response.text == PAGE and response.cookies[production.STICKY_COOKIE] == "0"
+
+
+# ---------------------------------------------------------------------------
+# Exported app
+# ---------------------------------------------------------------------------
+PID_VIEW = """\
+    import os
+    from designgui.ui_lib import Text
+
+    def render_view():
+        Text(f'worker pid {os.getpid()}')
+"""
+
+
+def _tuned_project(project_dir: Path) -> Path:
+    views_dir = project_dir / ".designgui" / "product" / "views"
+    views_dir.mkdir(parents=True)
+    (views_dir.parent / "__init__.py").touch()
+    (views_dir / "__init__.py").touch()
+    (views_dir / "dashboard.py").write_text(textwrap.dedent(PID_VIEW), encoding="utf-8")
+    config = {"paths": {"views": ".designgui/product/views"}, "export": {"workers": 2, "ping_interval": 6}}
+    (project_dir / ".designgui" / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    return project_dir
+
+
+def _export(project_dir: Path, *args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-m", "designgui.cli", "export", "--port", str(TUNED_PORT), *args],
+                          cwd=str(project_dir), capture_output=True, text=True, timeout=60)
+
+
+def test_tuning_flags_and_config_reach_main_py(tmp_path):
+    project = _tuned_project(tmp_path)
+    result = _export(project, "--compression", "brotli", "--reconnect-timeout", "12", "--cache-max-age", "86400",
+                     "--workers", "3", "--artifact")
+    assert result.returncode == 0, result.stderr
+    source = (project / "production_app" / "main.py").read_text(encoding="utf-8")
+    ast.parse(source)
+    assert "encodings=('br', 'gzip')" in source and "production.drop_nicegui_gzip(app)" in source
+    assert "ping_interval=6" in source, "config.json settings apply when no flag overrides them"
+    assert "workers=3" in source, "flags override config.json"
+    assert "reconnect_timeout=12.0" in source and "max-age=86400, immutable" in source
+    with zipfile.ZipFile(project / "production_app.pyz") as archive:
+        assert "designgui/production.pyc" in archive.namelist()
+
+    assert _export(project, "--compression", "zstd").returncode == 1
+
+
+def test_tuning_needing_a_newer_nicegui_is_refused():
+    from designgui.export import unsupported_tuning
+    tuning = {"message_history": 50, "cache_max_age": 3600, "reconnect_timeout": 5}
+    assert unsupported_tuning(tuning, "2.8.1") == {"message_history": "2.9", "cache_max_age": "2.20"}
+    assert unsupported_tuning(tuning, "2.19.0") == {"cache_max_age": "2.20"}
+    assert unsupported_tuning(tuning, "2.24.2") == {}
+
+
+def test_workers_are_sticky_and_tuned(tmp_path):
+    import httpx
+    import websockets.sync.client
+    project = _tuned_project(tmp_path)
+    assert _export(project, "--compression", "gzip").returncode == 0
+    proc = subprocess.Popen([sys.executable, "main.py"], cwd=str(project / "production_app"),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://localhost:{TUNED_PORT}"
+    try:
+        deadline = time.monotonic() + 30
+        first = None
+        while first is None and time.monotonic() < deadline:
+            try:
+                first = httpx.get(f"{base}/", headers={"Accept-Encoding": "gzip"}, timeout=5)
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        assert first is not None and first.status_code == 200, "proxy did not answer"
+        assert first.headers["content-encoding"] == "gzip"
+
+        pids = {}
+        for _ in range(2):
+            response = httpx.get(f"{base}/", timeout=5)
+            worker = response.cookies[production.STICKY_COOKIE]
+            pids[worker] = re.search(r"worker pid (\d+)", response.text).group(1)
+        assert len(set(pids.values())) == 2, "new browsers are spread over the workers"
+        for worker, pid in pids.items():
+            pinned = httpx.get(f"{base}/", cookies={production.STICKY_COOKIE: worker}, timeout=5)
+            assert f"worker pid {pid}" in pinned.text and production.STICKY_COOKIE not in pinned.cookies
+
+        url = f"ws://localhost:{TUNED_PORT}/_nicegui_ws/socket.io/?EIO=4&transport=websocket"
+        with websockets.sync.client.connect(url, additional_headers={"Cookie": f"{production.STICKY_COOKIE}=1"}) as ws:
+            handshake = json.loads(ws.recv(timeout=5)[1:])
+        assert handshake["pingInterval"] == 6000
+    finally:
+        proc.terminate()
+        proc.wait(timeout=15)
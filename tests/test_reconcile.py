@@ -0,0 +1,138 @@
+"""
+Keyed Reconciliation — Preview Pane Diff Tests
+==============================================
+Proves that re-rendering a view into the preview pane only sends the elements
+that actually changed, keeps browser-side ids (and therefore scroll position and
+DOM state) stable, and still wires events to the handlers of the latest render.
+
+Architecture under test (reconcile.py):
+    - reconcile(container, render) renders into a detached staging element
+    - matched new elements take over the old element ids and listener ids
+    - only elements whose serialized state differs end up in Outbox.updates
+"""
+import pytest
+from nicegui import Client
+from nicegui.outbox import deleted
+from nicegui.page import page
+
+from designgui.reconcile import reconcile
+from designgui.ui_lib import Box, Button, Stack, Text
+
+
+@pytest.fixture()
+def client():
+    client = Client(page('/'), request=None)
+    yield client
+    client.delete()
+
+
+def _dashboard(highlight: str, rows: int = 400):
+    def render():
+        with Stack(['p-8']):
+            Text(f'Revenue {highlight}', ['text-2xl'])
+            for i in range(rows):
+                with Box(['flex', 'gap-2']):
+                    Text(f'Row {i}', ['text-sm'])
+                    Text(f'{i * 3} units', ['text-gray-500'])
+                    Text('ok', ['text-green-600'])
+                    Box(['h-px'])
+    return render
+
+
+def _mount(client, render):
+    with client:
+        pane = Box()
+    reconcile(pane, render)
+    client.outbox.updates.clear()  # pretend the browser received the first render
+    return pane
+
+
+def test_one_word_edit_in_2000_element_dashboard_sends_one_update(client):
+    pane = _mount(client, _dashboard('Q1'))
+    element_count = sum(1 for _ in pane.descendants())
+    assert element_count > 2000
+
+    ids_before = [el.id for el in pane.descendants()]
+    with client:
+        stats = reconcile(pane, _dashboard('Q2'))
+
+    assert (stats.updated, stats.inserted, stats.removed) == (1, 0, 0), stats
+    assert stats.unchanged == element_count - 1
+    assert len(client.outbox.updates) == 1, "Only the edited Text element may be sent"
+    (changed,) = client.outbox.updates.values()
+    assert 'Revenue Q2' in changed._props['innerHTML']
+    assert [el.id for el in pane.descendants()] == ids_before, "Browser-side ids must stay stable"
+    assert all(client.elements[el.id] is el for el in pane.descendants())
+
+
+def test_unchanged_rerender_sends_nothing(client):
+    pane = _mount(client, _dashboard('Q1', rows=20))
+    with client:
+        stats = reconcile(pane, _dashboard('Q1', rows=20))
+    assert stats.sent == 0
+    assert len(client.outbox.updates) == 0
+
+
+def test_appended_and_removed_children(client):
+    pane = _mount(client, _dashboard('Q1', rows=3))
+    with client:
+        stats = reconcile(pane, _dashboard('Q1', rows=5))
+    assert stats.inserted == 2 * 5  # two row boxes, each with four children
+    assert stats.removed == 0
+
+    client.outbox.updates.clear()
+    with client:
+        stats = reconcile(pane, _dashboard('Q1', rows=1))
+    assert stats.removed == 4 * 5
+    assert sum(1 for el in client.outbox.updates.values() if el is deleted) == 4 * 5
+
+
+def test_keyed_children_survive_reorder(client):
+    def render(order):
+        def _render():
+            with Stack():
+                for name in order:
+                    Text(name).props(f'key={name}')
+        return _render
+
+    pane = _mount(client, render(['a', 'b', 'c']))
+    ids = {el._props['key']: el.id for el in pane.descendants() if 'key' in el._props}
+    with client:
+        stats = reconcile(pane, render(['c', 'a', 'b']))
+    assert stats.inserted == 0 and stats.removed == 0
+    assert {el._props['key']: el.id for el in pane.descendants() if 'key' in el._props} == ids
+
+
+def test_events_reach_handlers_of_latest_render(client):
+    clicks = []
+
+    def render(label):
+        def _render():
+            Button('Go', on_click=lambda: clicks.append(label))
+        return _render
+
+    pane = _mount(client, render('v1'))
+    (old_button,) = pane.descendants()
+    (old_listener_id,) = old_button._event_listeners.keys()
+
+    with client:
+        stats = reconcile(pane, render('v2'))
+    assert stats.sent == 0, "Same markup and listener signature — nothing needs resending"
+
+    # The browser still emits the old listener id for the old element id
+    client.handle_event({'id': old_button.id, 'listener_id': old_listener_id, 'args': []})
+    assert clicks == ['v2']
+
+
+def test_render_error_leaves_mounted_tree_untouched(client):
+    pane = _mount(client, _dashboard('Q1', rows=2))
+    before = [el.id for el in pane.descendants()]
+
+    def broken():
+        Text('partial')
+        raise RuntimeError('boom')
+
+    with client, pytest.raises(RuntimeError):
+        reconcile(pane, broken)
+    assert [el.id for el in pane.descendants()] == before
+    assert len(client.outbox.updates) == 0
@@ -0,0 +1,112 @@
+"""
+Reload Generations — Long-Poll Tracker Tests
+============================================
+Proves that waiters are released exactly when the awaited view version has
+finished rendering, and that superseded renders never report for a newer save.
+
+Architecture under test (reloads.py):
+    - ReloadTracker.begin(view, hash) bumps the view's generation (status stale)
+    - ReloadTracker.claim(view, generation) lets exactly one renderer take a stale generation
+    - ReloadTracker.finish(view, generation, outcome) ignores stale generations
+    - ReloadTracker.wait(view, generation=|digest=) long-polls without sleeping
+"""
+import asyncio
+
+from designgui.reloads import ReloadTracker
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_wait_for_generation_returns_once_finished():
+    async def scenario():
+        tracker = ReloadTracker()
+        generation = tracker.begin("dashboard.py", "h1")
+        waiter = asyncio.ensure_future(tracker.wait("dashboard.py", generation=generation, timeout=2))
+        await asyncio.sleep(0.05)
+        assert not waiter.done(), "A pending render must not release the waiter"
+        tracker.finish("dashboard.py", generation, {"ok": True, "element_count": 3})
+        state = await waiter
+        assert (state.generation, state.status, state.outcome["element_count"]) == (1, "ok", 3)
+    _run(scenario())
+
+
+def test_wait_for_hash_skips_superseded_versions():
+    async def scenario():
+        tracker = ReloadTracker()
+        waiter = asyncio.ensure_future(tracker.wait("dashboard.py", digest="h2", timeout=2))
+        first = tracker.begin("dashboard.py", "h1")
+        second = tracker.begin("dashboard.py", "h2")
+        assert tracker.finish("dashboard.py", first, {"ok": True}) is False, "Stale outcome must be dropped"
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        tracker.finish("dashboard.py", second, {"ok": False, "stage": "exec"})
+        state = await waiter
+        assert (state.digest, state.status, state.generation) == ("h2", "error", 2)
+    _run(scenario())
+
+
+def test_wait_times_out_with_none():
+    async def scenario():
+        tracker = ReloadTracker()
+        assert await tracker.wait("dashboard.py", generation=1, timeout=0.1) is None
+    _run(scenario())
+
+
+def test_idle_hash_triggers_a_render_once():
+    """Rewriting identical content produces no broadcast; asking for that hash must still get an answer."""
+    async def scenario():
+        tracker = ReloadTracker()
+        tracker.seed("dashboard.py", "h1")
+        kicked = []
+
+        def on_idle(name):
+            kicked.append(name)
+            generation = tracker.begin(name, "h1")
+            asyncio.get_running_loop().call_later(0.05, tracker.finish, name, generation, {"ok": True})
+
+        state = await tracker.wait("dashboard.py", digest="h1", timeout=2, on_idle=on_idle)
+        assert kicked == ["dashboard.py"]
+        assert state.status == "ok"
+    _run(scenario())
+
+
+def test_stale_generation_is_rendered_once_for_a_waiter():
+    """A save nobody is looking at is not rendered until a waiter asks; a claimed one is not rendered twice."""
+    async def scenario():
+        tracker = ReloadTracker()
+        generation = tracker.begin("dashboard.py", "h1")
+        assert tracker.get("dashboard.py").status == "stale"
+        kicked = []
+
+        def on_idle(name):
+            kicked.append(name)
+            assert tracker.claim(name, generation)
+            asyncio.get_running_loop().call_later(0.05, tracker.finish, name, generation, {"ok": True})
+
+        state = await tracker.wait("dashboard.py", generation=generation, timeout=2, on_idle=on_idle)
+        assert kicked == ["dashboard.py"] and state.status == "ok"
+        assert not tracker.claim("dashboard.py", generation), "A finished generation cannot be claimed again"
+
+        claimed = tracker.begin("dashboard.py", "h2")
+        assert tracker.claim("dashboard.py", claimed)
+        waiter = asyncio.ensure_future(tracker.wait("dashboard.py", digest="h2", timeout=2, on_idle=on_idle))
+        await asyncio.sleep(0.05)
+        assert kicked == ["dashboard.py"], "A generation a client is rendering must not be validated again"
+        tracker.finish("dashboard.py", claimed, {"ok": True})
+        assert (await waiter).digest == "h2"
+    _run(scenario())
+
+
+def test_tracker_outlives_the_loop_it_was_created_or_waited_in():
+    tracker = ReloadTracker()
+    assert _run(tracker.wait("dashboard.py", generation=1, timeout=0.05)) is None
+
+    async def scenario():
+        waiter = asyncio.ensure_future(tracker.wait("dashboard.py", generation=1, timeout=2))
+        await asyncio.sleep(0.05)
+        tracker.finish("dashboard.py", tracker.begin("dashboard.py", "h1"), {"ok": True})
+        return await waiter
+    assert _run(scenario()).status == "ok"
+
@@ -0,0 +1,101 @@
+"""
+Agent Render API — In-Memory Submission Tests
+=============================================
+Proves that submitted view source is executed and rendered headlessly without
+touching the views directory, and that failures come back as structured reports
+with readable tracebacks instead of exceptions.
+
+Architecture under test (api.py, headless.py):
+    - execute_submission(source) compiles under a `<submitted name>` pseudo filename
+    - render_headless() renders into a detached client and counts the elements built
+    - element_html() serializes the rendered tree when html is requested
+    - live_elements() names what needs the NiceGUI runtime (listeners, components, bindings)
+"""
+import textwrap
+
+from designgui.api import execute_submission, valid_view_name
+
+
+def _submit(code: str, **kwargs) -> dict:
+    return execute_submission(textwrap.dedent(code), **kwargs)
+
+
+def test_successful_submission_reports_elements_and_timings():
+    report = _submit("""\
+        from designgui.ui_lib import Stack, Text, Button
+
+        def render_view():
+            with Stack(['p-4']):
+                Text('Quarterly <revenue>', ['text-xl'])
+                Button('Refresh', on_click=lambda: None)
+    """, name="report.py", with_html=True)
+
+    assert report["ok"], report
+    assert report["stage"] is None and report["has_render_view"]
+    assert report["element_count"] == 3
+    assert set(report["timings_ms"]) == {"exec", "render", "total"}
+    assert all(v >= 0 for v in report["timings_ms"].values())
+    assert 'class="flex flex-col p-4"' in report["html"]
+    assert "Quarterly &lt;revenue&gt;" in report["html"]
+
+
+def test_live_elements_are_reported():
+    static = _submit("""\
+        from designgui.ui_lib import Card, Table, Text
+
+        def render_view():
+            with Card():
+                Text('Read-only')
+    """)
+    assert static["ok"] and static["live"] == []
+
+    live = _submit("""\
+        from nicegui import ui
+        from designgui.ui_lib import Button, Text
+
+        class State:
+            count = 1
+
+        def render_view():
+            Button('Refresh', on_click=lambda: None)
+            ui.timer(5, lambda: None)
+            ui.label().bind_text_from(State, 'count')
+    """)
+    assert live["ok"], live
+    assert [reason.split(": ")[1] for reason in live["live"]] == ["on click", "component timer", "binding"]
+
+
+def test_exec_error_reports_submitted_line():
+    report = _submit("""\
+        ROWS = load_rows()
+
+        def render_view():
+            pass
+    """, name="broken.py")
+    assert not report["ok"]
+    assert report["stage"] == "exec"
+    assert report["error"] == "NameError: name 'load_rows' is not defined"
+    assert 'File "<submitted broken.py>", line 1' in report["traceback"]
+    assert "ROWS = load_rows()" in report["traceback"], "linecache must serve the submitted source"
+
+
+def test_render_error_is_separated_from_exec_error():
+    report = _submit("""\
+        def render_view():
+            raise KeyError('revenue')
+    """)
+    assert not report["ok"]
+    assert report["stage"] == "render"
+    assert report["timings_ms"]["exec"] is not None
+
+
+def test_missing_render_function():
+    report = _submit("X = 1\n")
+    assert not report["ok"]
+    assert "render_view" in report["error"]
+
+
+def test_view_names_are_bare_identifiers():
+    assert valid_view_name("sales_report.py")
+    for bad in ("../evil.py", "sub/dir.py", "my-view.py", "view.txt", "1st.py"):
+        assert not valid_view_name(bad), bad
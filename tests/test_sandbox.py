@@ -0,0 +1,175 @@
+"""
+Sandboxed Execution — Worker Pool Tests
+=======================================
+Proves that a runaway view (infinite loop, blocking sleep, huge allocation) is
+stopped inside a worker process, reported as a failed SandboxResult, and that the
+pool recycles the worker while the caller's event loop keeps running.
+
+Architecture under test (sandbox.py, memo.py):
+    - SandboxPool.run() hands (path, source) to an idle spawn-context worker
+    - workers apply RLIMIT_CPU / RLIMIT_AS; the parent enforces a wall-clock timeout
+    - overrunning workers are killed and replaced in the background
+    - with idle_timeout, a pool without runs stops its workers until the next run
+    - @memoize results of a dry run travel back, so the preview's own run reuses them
+"""
+import asyncio
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from designgui.sandbox import SandboxPool
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="CPU and memory limits need the resource module")
+
+GOOD_VIEW = """\
+    from designgui.ui_lib import Stack, Text
+
+    ROWS = [f"Row {i}" for i in range(100)]
+
+    def render_view():
+        with Stack():
+            for row in ROWS:
+                Text(row)
+"""
+
+
+def _write(path: Path, code: str) -> Path:
+    path.write_text(textwrap.dedent(code), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SandboxPool(workers=2, timeout=3.0, cpu_seconds=1, memory_mb=256)
+    pool.start()
+    yield pool
+    pool.close()
+
+
+def _run(pool, path: Path):
+    async def scenario():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        beat = asyncio.ensure_future(heartbeat())
+        started = time.perf_counter()
+        result = await pool.run(path, path.read_bytes())
+        elapsed = time.perf_counter() - started
+        beat.cancel()
+        # The loop must have kept ticking for (almost) the whole time the worker was busy
+        assert ticks >= int(elapsed / 0.05) // 2, f"event loop stalled: {ticks} ticks in {elapsed:.2f}s"
+        return result
+
+    return asyncio.run(scenario())
+
+
+def test_well_behaved_view_passes(pool, tmp_path):
+    result = _run(pool, _write(tmp_path / "good.py", GOOD_VIEW))
+    assert result.ok, result.traceback
+
+
+def test_view_errors_are_reported_with_worker_traceback(pool, tmp_path):
+    result = _run(pool, _write(tmp_path / "broken.py", """\
+        def render_view():
+            raise ValueError("no mock data")
+    """))
+    assert not result.ok
+    assert result.error == "ValueError: no mock data"
+    assert 'broken.py", line 2' in result.traceback
+
+
+def test_infinite_loop_hits_cpu_limit_and_worker_is_recycled(pool, tmp_path):
+    restarts = pool.restarts
+    result = _run(pool, _write(tmp_path / "spin.py", """\
+        while True:
+            pass
+    """))
+    assert not result.ok
+    assert "CPU time limit" in result.error
+    assert pool.restarts == restarts + 1
+
+    # The replacement worker (or the other one) serves the next run
+    assert _run(pool, _write(tmp_path / "after_spin.py", GOOD_VIEW)).ok
+
+
+def test_blocking_sleep_hits_wall_clock_timeout(pool, tmp_path):
+    result = _run(pool, _write(tmp_path / "sleepy.py", """\
+        import time
+
+        def render_view():
+            time.sleep(60)
+    """))
+    assert not result.ok
+    assert "timeout" in result.error
+    assert result.elapsed < pool.timeout + 1
+
+
+def test_huge_allocation_hits_memory_limit(pool, tmp_path):
+    result = _run(pool, _write(tmp_path / "hog.py", """\
+        MOCK_ROWS = bytearray(2 * 1024 ** 3)
+
+        def render_view():
+            pass
+    """))
+    assert not result.ok
+    assert "256 MB memory limit" in result.error
+
+
+def test_dry_run_hands_memoized_data_to_the_preview(pool, tmp_path):
+    from designgui.headless import render_headless
+    from designgui.loader import ViewModuleCache
+    from designgui.memo import store
+    view = _write(tmp_path / "loaded.py", """\
+        from pathlib import Path
+        from designgui.memo import memoize
+        from designgui.ui_lib import Stack, Text
+
+        @memoize
+        def load_rows():
+            # Count the loads in a file, since worker and preview are different processes
+            with open(Path(__file__).with_suffix(".loads"), "a") as loads:
+                loads.write("x")
+            return [f"Row {i}" for i in range(50)]
+
+        def render_view():
+            with Stack():
+                for row in load_rows():
+                    Text(row)
+    """)
+    result = _run(pool, view)
+    assert result.ok, result.traceback
+    assert store.load(result.memo) == 1
+
+    # The preview's own run of the same version finds the data the worker loaded
+    loaded = ViewModuleCache().acquire(view, owner="preview")
+    assert loaded.error is None
+    assert render_headless(loaded.render).element_count > 50
+    assert (tmp_path / "loaded.loads").read_text() == "x"
+
+
+def test_idle_workers_are_stopped_and_respawned(tmp_path):
+    view = _write(tmp_path / "idle.py", GOOD_VIEW)
+    idle_pool = SandboxPool(workers=1, timeout=10.0, idle_timeout=0.2)
+
+    async def scenario():
+        assert (await idle_pool.run(view, view.read_bytes())).ok
+        workers = list(idle_pool._workers)
+        await asyncio.sleep(1.0)
+        assert idle_pool._workers == []
+        assert not any(worker.process.is_alive() for worker in workers)
+        # The next run brings the pool back up
+        assert (await idle_pool.run(view, view.read_bytes())).ok
+        assert len(idle_pool._workers) == 1
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        idle_pool.close()
@@ -0,0 +1,81 @@
+"""
+Headless Snapshots — `designgui snapshot` Tests
+===============================================
+Proves that a view renders to static HTML in-process: Tailwind classes and
+innerHTML content survive, the markup is identical across renders (so it can be
+diffed in CI), and the CLI writes one file per view without booting a server.
+
+Architecture under test (headless.py, cli.py):
+    - render_html() builds a render function into a detached client and serializes it
+    - html_document() wraps markup into a standalone page
+    - `designgui snapshot` renders files from the views directory
+"""
+import json
+import subprocess
+import sys
+import textwrap
+
+from designgui.headless import html_document, render_html
+from designgui.ui_lib import Stack, Text
+
+
+def _render():
+    with Stack().classes("gap-4"):
+        Text("Revenue <Q3>")
+    from nicegui import ui
+    ui.html("<b>bold</b>")
+
+
+def test_render_html_keeps_classes_and_inner_html():
+    markup = render_html(_render)
+    assert "gap-4" in markup
+    assert "Revenue &lt;Q3&gt;" in markup
+    assert "<b>bold</b>" in markup
+
+
+def test_render_html_is_stable_across_renders():
+    assert render_html(_render) == render_html(_render)
+
+
+def test_html_document_wraps_markup():
+    page = html_document("<p>x</p>", title="a & b")
+    assert page.startswith("<!DOCTYPE html>")
+    assert "<title>a &amp; b</title>" in page
+    assert "<body>\n<p>x</p>\n</body>" in page
+
+
+def test_html_document_inlines_css_for_used_classes():
+    page = html_document(render_html(_render))
+    assert ".gap-4{gap:1rem}" in page
+    assert "cdn.tailwindcss.com" not in page
+
+
+def test_cli_snapshot_writes_one_file_per_view(tmp_path):
+    views_dir = tmp_path / ".designgui" / "product" / "views"
+    views_dir.mkdir(parents=True)
+    (tmp_path / ".designgui" / "config.json").write_text(
+        json.dumps({"paths": {"views": ".designgui/product/views"}}), encoding="utf-8")
+    for name in ("first", "second"):
+        (views_dir / f"{name}.py").write_text(textwrap.dedent(f"""\
+            from designgui.ui_lib import Stack, Text
+
+            def render_view():
+                with Stack():
+                    Text('{name} view')
+        """), encoding="utf-8")
+    (views_dir / "broken.py").write_text("def render_view():\n    raise RuntimeError('no data')\n", encoding="utf-8")
+
+    result = subprocess.run([sys.executable, "-m", "designgui.cli", "snapshot", "first"],
+                            cwd=str(tmp_path), capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "first view" in result.stdout
+
+    out_dir = tmp_path / "snaps"
+    result = subprocess.run([sys.executable, "-m", "designgui.cli", "snapshot", "first", "second", "broken",
+                             "--page", "--out", str(out_dir)],
+                            cwd=str(tmp_path), capture_output=True, text=True, timeout=60)
+    assert result.returncode == 1
+    assert "RuntimeError: no data" in result.stderr
+    assert sorted(p.name for p in out_dir.iterdir()) == ["first.html", "second.html"]
+    page = (out_dir / "second.html").read_text(encoding="utf-8")
+    assert page.startswith("<!DOCTYPE html>") and "second view" in page
@@ -0,0 +1,151 @@
+"""
+Local Tailwind Stylesheet Tests
+===============================
+Proves that the preview's Tailwind utilities compile in-process: variants,
+arbitrary values and negative utilities produce the right selectors, the cascade
+order matches Tailwind's (so `p-4 px-2` still wins on the x axis), and the sheet
+only rebuilds — and changes its cache-busting digest — when a new rule appears.
+
+Architecture under test (tailwind.py):
+    - compile_class() turns one class name into a CSS rule (or None)
+    - extract_candidates() finds class-like tokens in source text
+    - StyleSheet accumulates rules and exposes css + digest
+    - every class the UI library uses (lists, .classes(), variants, class="..." markup) compiles
+"""
+import ast
+import re
+from pathlib import Path
+
+import designgui.ui_lib
+from designgui.tailwind import StyleSheet, compile_class, extract_candidates
+
+# Marker classes Tailwind itself emits no CSS for, and the Material Icons font class
+NO_RULE_CLASSES = {"group", "peer", "material-icons"}
+
+
+def test_utilities_compile_to_tailwind_declarations():
+    assert compile_class("p-4").css == ".p-4{padding:1rem}"
+    assert compile_class("w-1/2").css == ".w-1\\/2{width:50%}"
+    assert compile_class("-mt-6").css == ".-mt-6{margin-top:-1.5rem}"
+    assert compile_class("text-sm").css == ".text-sm{font-size:0.875rem;line-height:1.25rem}"
+    assert compile_class("text-gray-500").css == ".text-gray-500{color:#6b7280}"
+    assert compile_class("bg-blue-500/50").css == ".bg-blue-500\\/50{background-color:rgb(59 130 246 / 0.5)}"
+    assert compile_class("w-[300px]").css == ".w-\\[300px\\]{width:300px}"
+    assert compile_class("border-t-2").css == ".border-t-2{border-top-width:2px}"
+    assert compile_class("!hidden").css == ".\\!hidden{display:none !important}"
+
+
+def test_variants_build_selectors_and_media_queries():
+    assert compile_class("hover:bg-gray-100").css == ".hover\\:bg-gray-100:hover{background-color:#f3f4f6}"
+    assert compile_class("md:flex").screen == "md"
+    peer = compile_class("peer-checked:after:translate-x-full").css
+    assert peer.startswith(".peer:checked ~ .peer-checked\\:after\\:translate-x-full::after{content:var(--tw-content);")
+    assert compile_class("group-hover:opacity-50").css.startswith(".group:hover .group-hover\\:opacity-50{")
+    assert compile_class("dark:bg-gray-900").css.startswith("body.body--dark .dark\\:bg-gray-900{")
+    assert compile_class("group-open:block").css == ".group[open] .group-open\\:block{display:block}"
+    assert compile_class("open:block").css == ".open\\:block[open]{display:block}"
+
+
+def test_container_gets_a_max_width_per_screen():
+    css = compile_class("container").css
+    assert css.startswith(".container{width:100%}\n")
+    assert "@media (min-width:768px){.container{max-width:768px}}" in css
+    assert css.count("@media") == 5
+
+
+def test_non_tailwind_tokens_are_ignored():
+    for name in ("self.classes", "nicegui-column", "q-btn", "unknown:p-4", "text-nope-500", "render_view"):
+        assert compile_class(name) is None, name
+
+
+def test_arbitrary_values_cannot_escape_their_declaration():
+    for name in ("bg-[red;}body{display:none]", "w-[10px}]", "w-[calc(100%-2rem]", "content-['x]",
+                 "content-['</style>']", "w-[1px])]"):
+        assert compile_class(name) is None, name
+    sheet = StyleSheet(preflight=False)
+    sheet.scan("# w-[10px}] in a comment\nText('p-4 bg-[red;}body{display:none]')")
+    assert sheet.classes == ["p-4"] and "body{" not in sheet.css
+    assert compile_class("w-[calc(100%-2rem)]").css == ".w-\\[calc\\(100\\%-2rem\\)\\]{width:calc(100%-2rem)}"
+
+
+def test_stylesheet_orders_like_tailwind():
+    sheet = StyleSheet(preflight=False)
+    sheet.add(["md:p-8", "hover:px-6", "px-2", "p-4", "hidden", "flex"])
+    css = sheet.css
+    assert css.index(".flex{") < css.index(".hidden{")
+    assert css.index(".p-4{") < css.index(".px-2{") < css.index(".hover\\:px-6:hover{")
+    assert css.index("@media (min-width:768px){") < css.index(".md\\:p-8{")
+
+
+def test_stylesheet_digest_changes_only_when_rules_are_added():
+    sheet = StyleSheet()
+    assert sheet.add(["p-4", "not-a-class"])
+    digest = sheet.digest
+    assert not sheet.add(["p-4", "not-a-class", "still_not"])
+    assert sheet.digest == digest
+    assert sheet.add(["m-2"])
+    assert sheet.digest != digest
+    assert sheet.classes == ["m-2", "p-4"]
+
+
+def test_extract_candidates_from_python_source():
+    source = "Text('x').classes('p-4 hover:bg-gray-100 w-1/2')\nel.classes(\"after:content-[\\'\\']\")\n"
+    candidates = set(extract_candidates(source))
+    assert {"p-4", "hover:bg-gray-100", "w-1/2", "after:content-['']"} <= candidates
+    sheet = StyleSheet()
+    sheet.scan(source)
+    assert set(sheet.classes) == {"p-4", "hover:bg-gray-100", "w-1/2", "after:content-['']"}
+
+
+def _class_literals(source: str):
+    """Class strings as the UI library writes them: class lists, .classes() arguments (also `remove=`),
+    `variants` tables, `size=` values and `class="..."` attributes inside markup."""
+    def strings(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            for item in node.elts:
+                yield from strings(item)
+        elif isinstance(node, ast.Dict):
+            for value in node.values:
+                yield from strings(value)
+
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "classes":
+                for arg in [*node.args, *(keyword.value for keyword in node.keywords)]:
+                    yield from strings(arg)
+            for keyword in node.keywords:
+                if keyword.arg in ("base_classes", "size"):
+                    yield from strings(keyword.value)
+            if isinstance(node.func, ast.Name) and node.func.id[:1].isupper() and node.args \
+                    and isinstance(node.args[0], ast.List):
+                yield from strings(node.args[0])  # e.g. Stack(['w-full', 'space-y-6'])
+        elif isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id in ("classes", "variants")
+                                                  for t in node.targets):
+            yield from strings(node.value)
+        elif isinstance(node, ast.arguments):
+            for arg, default in zip(node.args[::-1], node.defaults[::-1]):
+                if arg.arg == "size":
+                    yield from strings(default)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield from re.findall(r'class="([^"{}]*)"', node.value)
+
+
+def test_every_ui_lib_class_compiles():
+    missing, seen = [], set()
+    for path in sorted(Path(designgui.ui_lib.__file__).parent.glob("*.py")):
+        for literal in _class_literals(path.read_text(encoding="utf-8")):
+            for name in literal.split():
+                seen.add(name)
+                if name not in NO_RULE_CLASSES and compile_class(name) is None:
+                    missing.append(f"{path.name}: {name}")
+    assert {"group-open:block", "container", "bg-black/50", "ring-black/5"} <= seen, "extraction missed known classes"
+    assert not missing, missing
+
+
+def test_static_accordion_markup_gets_its_open_state_css():
+    from designgui.headless import html_document
+    page = html_document('<details class="group"><div class="hidden group-open:block">Answer</div></details>')
+    assert ".group[open] .group-open\\:block{display:block}" in page
+
@@ -0,0 +1,132 @@
+"""
+Shared View Execution — Module Cache Tests
+==========================================
+Proves that each version of a view file executes once per process no matter how
+many clients render it, and that superseded versions are evicted once the last
+client referencing them moves on.
+
+Architecture under test (loader.py):
+    - ViewModuleCache.acquire(path, owner) keyed by (path, sha256 of source)
+    - Versions live in sys.modules as dynamic_view_<stem>_v<n> until evicted
+"""
+import gc
+import sys
+import textwrap
+from pathlib import Path
+
+from designgui.loader import ViewModuleCache
+
+
+def _write_view(path: Path, label: str):
+    path.write_text(textwrap.dedent(f"""\
+        EXECUTIONS.append({label!r})
+
+        def render_view():
+            return {label!r}
+    """), encoding="utf-8")
+
+
+def _cache_with_counter(monkeypatch):
+    executions = []
+    monkeypatch.setattr("builtins.EXECUTIONS", executions, raising=False)
+    return ViewModuleCache(), executions
+
+
+def test_many_clients_share_one_execution(tmp_path, monkeypatch):
+    cache, executions = _cache_with_counter(monkeypatch)
+    view = tmp_path / "dashboard.py"
+    _write_view(view, "v1")
+
+    loaded = [cache.acquire(view, owner=f"client-{i}") for i in range(50)]
+
+    assert executions == ["v1"], "The view module must execute exactly once for 50 clients"
+    assert all(item is loaded[0] for item in loaded)
+    assert loaded[0].render() == "v1"
+
+
+def test_new_version_executes_once_and_old_version_is_evicted(tmp_path, monkeypatch):
+    cache, executions = _cache_with_counter(monkeypatch)
+    view = tmp_path / "dashboard.py"
+    _write_view(view, "v1")
+    old = cache.acquire(view, owner="a")
+    cache.acquire(view, owner="b")
+
+    _write_view(view, "v2")
+    new = cache.acquire(view, owner="a")
+    assert new is not old and new.render() == "v2"
+    # Client b still renders v1, so it must stay in memory
+    assert old.module_name in sys.modules
+    assert len(cache.live_versions()) == 2
+
+    cache.acquire(view, owner="b")
+    assert executions == ["v1", "v2"]
+    assert old.module_name not in sys.modules, "v1 must be evicted once no client references it"
+    assert list(cache.live_versions().values()) == [2]
+
+    cache.release("a")
+    cache.release("b")
+    # The current version stays cached for the next client even with no owners
+    assert new.module_name in sys.modules
+    cache.acquire(view, owner="c")
+    assert executions == ["v1", "v2"]
+
+
+def test_evicted_versions_held_by_callbacks_are_reported_as_lingering(tmp_path, monkeypatch):
+    cache, executions = _cache_with_counter(monkeypatch)
+    view = tmp_path / "dashboard.py"
+    _write_view(view, "v1")
+    # An old on_click closure keeps the namespace of its version alive, not the module object
+    handler = cache.acquire(view, owner="a").render
+    _write_view(view, "v2")
+    cache.acquire(view, owner="a")
+    gc.collect()
+    assert len(cache.lingering_versions()) == 1
+
+    del handler
+    gc.collect()
+    assert cache.lingering_versions() == []
+
+
+def test_invalidate_forces_one_reexecution_of_unchanged_source(tmp_path, monkeypatch):
+    cache, executions = _cache_with_counter(monkeypatch)
+    view = tmp_path / "dashboard.py"
+    _write_view(view, "v1")
+    cache.acquire(view, owner="a")
+
+    cache.invalidate(view)
+    cache.acquire(view, owner="a")
+    cache.acquire(view, owner="b")
+    assert executions == ["v1", "v1"]
+
+
+def test_import_errors_are_cached_per_version(tmp_path, monkeypatch):
+    cache, executions = _cache_with_counter(monkeypatch)
+    view = tmp_path / "broken.py"
+    view.write_text("EXECUTIONS.append('x')\ndef render_view(:\n    pass\n", encoding="utf-8")
+
+    first = cache.acquire(view, owner="a")
+    second = cache.acquire(view, owner="b")
+    assert first is second
+    assert isinstance(first.error, SyntaxError)
+    assert "SyntaxError" in first.traceback
+    assert first.render is None
+
+
+def test_bytecode_cache_survives_restart(tmp_path, monkeypatch):
+    """A fresh cache instance (daemon restart) must reuse the persisted compile instead of recompiling."""
+    from designgui.loader import BytecodeCache
+
+    _, executions = _cache_with_counter(monkeypatch)
+    view = tmp_path / "dashboard.py"
+    _write_view(view, "v1")
+    cache_dir = tmp_path / ".designgui" / "cache" / "bytecode"
+
+    first = BytecodeCache(cache_dir)
+    ViewModuleCache(bytecode_cache=first).acquire(view, owner="a")
+    assert (first.misses, first.hits) == (1, 0)
+
+    second = BytecodeCache(cache_dir)
+    loaded = ViewModuleCache(bytecode_cache=second).acquire(view, owner="a")
+    assert (second.misses, second.hits) == (0, 1)
+    assert loaded.render() == "v1"
+    assert loaded.module.render_view.__code__.co_filename == str(view)
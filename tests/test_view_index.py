@@ -0,0 +1,72 @@
+"""
+View Index — Incremental Listing Tests
+======================================
+Proves that the process-wide view index follows watcher change sets without
+rescanning the directory, and only bumps its version when views are added or
+removed (so clients skip dropdown updates on ordinary saves).
+
+Architecture under test (index.py):
+    - ViewIndex.scan() lists views/*.py once at startup
+    - ViewIndex.refresh(changed) re-stats only changed paths directly in views/
+    - version moves only when the set of names changes
+"""
+from pathlib import Path
+
+import pytest
+
+from designgui.index import ViewIndex
+
+
+@pytest.fixture()
+def views_dir(tmp_path):
+    views = tmp_path / "views"
+    views.mkdir()
+    (views / "__init__.py").touch()
+    (views / "dashboard.py").write_text("def render_view():\n    pass\n", encoding="utf-8")
+    (views / "widgets.py").write_text("def card():\n    pass\n", encoding="utf-8")
+    return views
+
+
+def test_scan_lists_views_with_render_flag(views_dir):
+    index = ViewIndex(views_dir)
+    index.scan()
+    assert index.names() == ["dashboard.py", "widgets.py"]
+    assert index.get("dashboard.py").has_render_view
+    assert not index.get("widgets.py").has_render_view
+
+
+def test_edit_updates_entry_without_bumping_version(views_dir):
+    index = ViewIndex(views_dir)
+    index.scan()
+    version, digest = index.version, index.get("dashboard.py").digest
+
+    (views_dir / "dashboard.py").write_text("def render_view():\n    return 1\n", encoding="utf-8")
+    assert index.refresh([views_dir / "dashboard.py"]) is False
+    assert index.version == version
+    assert index.get("dashboard.py").digest != digest
+
+
+def test_create_and_delete_bump_version(views_dir):
+    index = ViewIndex(views_dir)
+    index.scan()
+    version = index.version
+
+    (views_dir / "reports.py").write_text("def render_view():\n    pass\n", encoding="utf-8")
+    assert index.refresh([views_dir / "reports.py"]) is True
+    assert index.names() == ["dashboard.py", "reports.py", "widgets.py"]
+
+    (views_dir / "widgets.py").unlink()
+    assert index.refresh([views_dir / "widgets.py"]) is True
+    assert index.names() == ["dashboard.py", "reports.py"]
+    assert index.version == version + 2
+
+
+def test_refresh_ignores_paths_outside_views_dir(views_dir, monkeypatch):
+    index = ViewIndex(views_dir)
+    index.scan()
+    # The index must never glob on refresh; only the changed paths are looked at
+    monkeypatch.setattr(Path, "glob", lambda *a, **k: pytest.fail("refresh must not rescan the directory"))
+    models = views_dir.parent / "models.py"
+    models.write_text("X = 1\n", encoding="utf-8")
+    assert index.refresh([models, views_dir / "__init__.py"]) is False
+    assert index.names() == ["dashboard.py", "widgets.py"]
@@ -0,0 +1,112 @@
+"""
+Pre-Warmed Zygote Tests
+=======================
+Proves that servers forked from the zygote behave like freshly started ones:
+`designgui daemon start` forks the preview from it when one runs (and falls back
+to a new interpreter when none does), and an exported app's main.py boots from it.
+
+Architecture under test (zygote.py, daemon.py, cli.py):
+    - the zygote imports NiceGUI and the UI library once and forks per request
+    - forked children get the caller's cwd, environment and a log file as stdio
+
+Ports: 8085 (daemon) and 8086 (exported app), isolated from the other e2e tests
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from designgui import zygote
+from designgui.daemon import pid_alive, read_state
+
+DAEMON_PORT = 8085
+EXPORT_PORT = 8086
+
+pytestmark = pytest.mark.skipif(not zygote.supported(), reason="the zygote needs fork()")
+
+
+def _scaffold(project_dir: Path) -> Path:
+    views_dir = project_dir / ".designgui" / "product" / "views"
+    views_dir.mkdir(parents=True)
+    (views_dir.parent / "__init__.py").touch()
+    (views_dir / "__init__.py").touch()
+    (project_dir / ".designgui" / "config.json").write_text(json.dumps({
+        "daemon_port": DAEMON_PORT, "paths": {"views": ".designgui/product/views"},
+    }), encoding="utf-8")
+    (views_dir / "dashboard.py").write_text("from designgui.ui_lib import Text\n\ndef render_view():\n    Text('forked')\n",
+                                            encoding="utf-8")
+    return project_dir
+
+
+def _cli(project_dir: Path, *args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-m", "designgui.cli", *args], cwd=str(project_dir),
+                          capture_output=True, text=True, timeout=60)
+
+
+def _wait_for_200(port: int, timeout: float = 20.0) -> bool:
+    import httpx
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://localhost:{port}/", timeout=2).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    return False
+
+
+@pytest.fixture()
+def warm_zygote(tmp_path, monkeypatch):
+    socket = tmp_path / "zygote.sock"
+    monkeypatch.setenv(zygote.SOCKET_ENV, str(socket))
+    info, reused = zygote.start(socket)
+    assert not reused
+    yield info
+    zygote.stop(socket)
+
+
+def test_spawn_without_zygote_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setenv(zygote.SOCKET_ENV, str(tmp_path / "missing.sock"))
+    assert zygote.ping() is None
+    assert zygote.spawn(tmp_path, tmp_path / "log", ["--version"]) is None
+
+
+def test_daemon_forks_from_zygote(tmp_path, warm_zygote):
+    project = _scaffold(tmp_path / "project")
+    try:
+        started = _cli(project, "daemon", "start")
+        assert started.returncode == 0, started.stderr
+        state = read_state(project)
+        assert state["zygote"] is True
+        assert state["pid"] != warm_zygote["pid"]
+        assert zygote.ping()["spawned"] == 1
+        assert _wait_for_200(DAEMON_PORT)
+        status = json.loads(_cli(project, "daemon", "status", "--json").stdout)
+        assert status["ready"] and status["views"] == 1 and status["project"] == str(project.resolve())
+    finally:
+        _cli(project, "daemon", "stop")
+    deadline = time.monotonic() + 5
+    while pid_alive(state["pid"]) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not pid_alive(state["pid"]), "forked children are reaped, never left as zombies"
+
+
+def test_exported_app_boots_from_zygote(tmp_path, warm_zygote):
+    project = _scaffold(tmp_path / "project")
+    assert _cli(project, "export", "--port", str(EXPORT_PORT)).returncode == 0
+    prod_dir = project / "production_app"
+    log = tmp_path / "export.log"
+    pid = zygote.spawn(prod_dir, log, script=prod_dir / "main.py")
+    assert pid is not None
+    try:
+        assert _wait_for_200(EXPORT_PORT), log.read_text(errors="replace")
+        import httpx
+        assert "forked" in httpx.get(f"http://localhost:{EXPORT_PORT}/", timeout=5).text
+    finally:
+        os.kill(pid, signal.SIGTERM)